@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Animated cursor check
+Plays animations of growing frame counts at the same frame rate on the
+cursor overlay and records the CPU time, scheduler wakeups and repaints per
+second of playback; all three should stay flat as the frame count grows.
+Then encodes animations with repeated frames as .ani and parses them back:
+the RIFF chunks must hold each unique frame once, the rates and sequence
+must match, and every frame's cursor must carry its scaled hotspot and its
+pixels. Exits non-zero if playback cost grows more than --max-growth times
+between the smallest and the largest animation, or a round trip fails.
+"""
+
+import io
+import os
+import sys
+import math
+import time
+import struct
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from custom_cursor_app.animation import JIFFY_MS, AnimatedCursor, build_atlas, encode_ani
+from custom_cursor_app.curfile import parse_cur, render_size
+
+
+def make_frames(count, size=64, unique=None):
+    """count frames of a spinning bar; only unique distinct images when given"""
+    unique = unique or count
+    images = []
+    for i in range(unique):
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        angle = 2 * math.pi * i / unique
+        center = size / 2
+        tip = (center + 0.45 * size * math.cos(angle), center + 0.45 * size * math.sin(angle))
+        draw.line((center, center) + tip, fill=(255, 40 * i % 256, 0, 255), width=max(1, size // 10))
+        draw.ellipse((2, 2, 8, 8), fill=(0, 0, 255, 128))
+        images.append(img)
+    return [images[i % unique] for i in range(count)]
+
+
+def playback_cost(app, frames, frame_ms, seconds):
+    """(CPU ms, wakeups, repaints) per second of playback on the overlay"""
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    from custom_cursor_app.bridge import pil_to_qpixmap
+    from custom_cursor_app.overlay import CursorOverlay
+
+    atlas, rects, sequence = build_atlas(frames)
+    overlay = CursorOverlay()
+    overlay.set_cursor_animation(pil_to_qpixmap(atlas), rects, sequence, [frame_ms] * len(frames))
+    # Only the animation is measured, not pointer tracking
+    overlay.tracker.stop()
+    repaints = [0]
+    overlay.animation.frameChanged.connect(lambda step: repaints.__setitem__(0, repaints[0] + 1))
+    for _ in range(20):
+        app.processEvents()
+
+    wakeups = overlay.animation.wakeups
+    changes = repaints[0]
+    # A real event loop, so the process only wakes up for the animation
+    loop = QEventLoop()
+    QTimer.singleShot(round(seconds * 1000), loop.quit)
+    cpu = time.process_time()
+    loop.exec()
+    cpu = time.process_time() - cpu
+    result = (cpu * 1000 / seconds, (overlay.animation.wakeups - wakeups) / seconds,
+              (repaints[0] - changes) / seconds)
+    overlay.hide_overlay()
+    overlay.deleteLater()
+    app.processEvents()
+    return result
+
+
+def _chunks(data):
+    # Yield (tag, payload) of the RIFF chunks in data
+    offset = 0
+    while offset + 8 <= len(data):
+        tag, size = data[offset:offset + 4], struct.unpack_from('<I', data, offset + 4)[0]
+        yield tag, data[offset + 8:offset + 8 + size]
+        offset += 8 + size + size % 2
+
+
+def check_ani(frames, durations, hotspot, sizes):
+    """Encode frames as .ani, parse it back and return a list of problems"""
+    problems = []
+    animation = AnimatedCursor(frames, durations)
+    data = encode_ani(animation, hotspot, sizes)
+    if data[:4] != b'RIFF' or data[8:12] != b'ACON' or struct.unpack_from('<I', data, 4)[0] != len(data) - 8:
+        return ["bad RIFF header"]
+    chunks = dict(_chunks(data[12:]))
+    _, atlas_rects, sequence = build_atlas(frames)
+
+    header = struct.unpack('<9I', chunks[b'anih'])
+    if header[1:3] != (len(atlas_rects), len(frames)):
+        problems.append(f"anih lists {header[1]} icons and {header[2]} steps")
+    rates = list(struct.unpack(f'<{len(frames)}I', chunks[b'rate']))
+    if rates != [max(1, round(d / JIFFY_MS)) for d in durations]:
+        problems.append("rates do not match the durations")
+    if list(struct.unpack(f'<{len(frames)}I', chunks[b'seq '])) != sequence:
+        problems.append("sequence does not match the atlas")
+
+    fram = chunks[b'LIST']
+    icons = [payload for tag, payload in _chunks(fram[4:]) if tag == b'icon']
+    if fram[:4] != b'fram' or len(icons) != len(atlas_rects):
+        return problems + [f"{len(icons)} icons for {len(atlas_rects)} unique frames"]
+    for step, frame in enumerate(frames):
+        entries = parse_cur(icons[sequence[step]])
+        if [entry.width for entry in entries] != sizes:
+            problems.append(f"frame {step} has sizes {[entry.width for entry in entries]}")
+            continue
+        for entry in entries:
+            _, expected = render_size(frame, entry.width, hotspot)
+            if (entry.hotspot_x, entry.hotspot_y) != expected:
+                problems.append(f"frame {step} at {entry.width} px has hotspot "
+                                f"{(entry.hotspot_x, entry.hotspot_y)}, expected {expected}")
+            if entry.width == frame.width:
+                pixels = entry.data if entry.kind == 'dib' else Image.open(io.BytesIO(entry.data)).tobytes()
+                if pixels != frame.tobytes():
+                    problems.append(f"frame {step} pixels changed in the {entry.kind} entry")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check playback cost against frame count and .ani round trips")
+    parser.add_argument("--counts", default="4,16,64,256", help="Comma-separated frame counts to play")
+    parser.add_argument("--frame-ms", type=int, default=40, help="Duration of every frame")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Playback measured per animation")
+    parser.add_argument("--max-growth", type=float, default=1.5,
+                        help="Largest allowed CPU, wakeup or repaint growth from the smallest to the largest count")
+    args = parser.parse_args()
+    counts = [int(c) for c in args.counts.split(',')]
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    print(f"{'frames':>8}{'cpu ms/s':>12}{'wakeups/s':>12}{'repaints/s':>12}")
+    costs = []
+    for count in counts:
+        costs.append(playback_cost(app, make_frames(count), args.frame_ms, args.seconds))
+        print(f"{count:>8}{costs[-1][0]:>12.2f}{costs[-1][1]:>12.1f}{costs[-1][2]:>12.1f}")
+    # A millisecond of CPU per second is below timer noise
+    growth = [max(last, 1.0) / max(first, 1.0) for first, last in zip(costs[0], costs[-1])]
+    flat = all(g <= args.max_growth for g in growth)
+    print(f"growth {counts[0]} -> {counts[-1]} frames: cpu {growth[0]:.2f}x, wakeups {growth[1]:.2f}x, "
+          f"repaints {growth[2]:.2f}x")
+
+    cases = [
+        ("8 frames, 3 unique", make_frames(8, 32, unique=3), [100, 50, 33, 200, 100, 16, 1000, 70], (5, 9), [16, 32]),
+        ("large, PNG entries", make_frames(4, 256), [100] * 4, (40, 200), [32, 128, 256]),
+    ]
+    failures = 0 if flat else 1
+    print(f"\n{'.ani round trip':<24}{'result':>8}")
+    for name, frames, durations, hotspot, sizes in cases:
+        problems = check_ani(frames, durations, hotspot, sizes)
+        failures += bool(problems)
+        print(f"{name:<24}{'ok' if not problems else 'FAIL':>8}")
+        for problem in problems:
+            print(f"    {problem}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Pixel bridge check
+Runs pil_to_nsimage against a stub Cocoa module that reads the bitmap
+planes the way NSBitmapImageRep does, for meshed and planar data and for
+images that are not RGBA yet. The planes must be writable buffers of the
+declared size that the returned handle keeps alive, and must read back as
+the source pixels. pil_to_qimage is checked pixel by pixel on the same
+images. Then times both handoffs against the PNG round trip they replaced.
+Exits non-zero if any check fails.
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from custom_cursor_app.bridge import NS_ALPHA_NONPREMULTIPLIED, pil_to_nsimage, pil_to_qimage
+
+
+class StubBitmapImageRep:
+    """Records the planes it is given and reads them back as NSBitmapImageRep would"""
+    @classmethod
+    def alloc(cls):
+        return cls()
+
+    def initWithBitmapDataPlanes_pixelsWide_pixelsHigh_bitsPerSample_samplesPerPixel_hasAlpha_isPlanar_colorSpaceName_bitmapFormat_bytesPerRow_bitsPerPixel_(
+            self, planes, width, height, bits_per_sample, samples, alpha, planar, color_space, bitmap_format,
+            bytes_per_row, bits_per_pixel):
+        used = planes[:samples] if planar else planes[:1]
+        for plane in used:
+            # PyObjC hands (unsigned char **) planes over as writable buffers
+            view = memoryview(plane)
+            if view.readonly:
+                raise TypeError("bitmap planes must be writable buffers")
+            if view.nbytes < bytes_per_row * height:
+                raise ValueError(f"plane holds {view.nbytes} bytes, expected {bytes_per_row * height}")
+        if any(plane is not None for plane in planes[len(used):]):
+            raise ValueError("unused planes must be None")
+        if (bits_per_sample, samples, alpha, color_space, bitmap_format) != (8, 4, True, "NSDeviceRGBColorSpace",
+                                                                             NS_ALPHA_NONPREMULTIPLIED):
+            raise ValueError("unexpected sample layout")
+        if bits_per_pixel != (8 if planar else 32):
+            raise ValueError(f"unexpected bitsPerPixel {bits_per_pixel}")
+        self.planes, self.size, self.planar, self.bytes_per_row = used, (width, height), planar, bytes_per_row
+        return self
+
+    def image(self):
+        """The pixels as the rep would draw them"""
+        width, height = self.size
+        if self.planar:
+            return Image.merge('RGBA', [Image.frombuffer('L', self.size, bytes(plane), 'raw', 'L', self.bytes_per_row, 1)
+                                        for plane in self.planes])
+        return Image.frombuffer('RGBA', (width, height), bytes(self.planes[0]), 'raw', 'RGBA', self.bytes_per_row, 1)
+
+
+class StubImage:
+    @classmethod
+    def alloc(cls):
+        return cls()
+
+    def initWithSize_(self, size):
+        self.size = size
+        self.reps = []
+        return self
+
+    def addRepresentation_(self, rep):
+        self.reps.append(rep)
+
+
+COCOA = SimpleNamespace(NSBitmapImageRep=StubBitmapImageRep, NSImage=StubImage,
+                        NSDeviceRGBColorSpace="NSDeviceRGBColorSpace")
+
+
+def make_images():
+    arrow = Image.new('RGBA', (37, 29), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(arrow)
+    draw.polygon([(0, 0), (0, 26), (8, 19), (14, 28), (24, 12)], fill=(250, 30, 60, 255), outline=(255, 255, 255, 200))
+    draw.point((36, 28), fill=(10, 200, 30, 7))
+    return [("RGBA 37x29", arrow), ("LA 16x16", Image.linear_gradient('L').resize((16, 16)).convert('LA')),
+            ("P 32x32", arrow.resize((32, 32)).convert('P'))]
+
+
+def check_nsimage(img, planar):
+    try:
+        handle = pil_to_nsimage(img, planar=planar, cocoa=COCOA)
+    except (TypeError, ValueError) as e:
+        print(f"    {e}")
+        return False
+    rep = handle.image.reps[0]
+    expected = img.convert('RGBA')
+    pixels = handle.pixels if planar else (handle.pixels,)
+    return (handle.image.size == img.size
+            and all(a is b for a, b in zip(pixels, rep.planes))
+            and rep.image().tobytes() == expected.tobytes())
+
+
+def check_qimage(img):
+    image = pil_to_qimage(img)
+    expected = img.convert('RGBA')
+    for y in range(img.height):
+        for x in range(img.width):
+            color = image.pixelColor(x, y)
+            if (color.red(), color.green(), color.blue(), color.alpha()) != expected.getpixel((x, y)):
+                return False
+    return True
+
+
+def per_call_us(fn, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the raw-pixel handoff to Qt and a stubbed Cocoa")
+    parser.add_argument("--runs", type=int, default=300, help="Conversions per timing")
+    parser.add_argument("--size", type=int, default=64, help="Image size for the timings")
+    args = parser.parse_args()
+
+    from PyQt6.QtGui import QImage
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    failures = 0
+    print(f"{'image':<14}{'meshed':>8}{'planar':>8}{'qimage':>8}")
+    for name, img in make_images():
+        results = [check_nsimage(img, False), check_nsimage(img, True), check_qimage(img)]
+        failures += results.count(False)
+        print(f"{name:<14}" + "".join(f"{'ok' if r else 'FAIL':>8}" for r in results))
+
+    img = make_images()[0][1].resize((args.size, args.size))
+
+    def png_round_trip():
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG')
+        QImage.fromData(buffer.getvalue(), "PNG")
+
+    print(f"\n{f'{args.size} px handoff':<24}{'us':>10}")
+    for name, fn in (("PNG round trip", png_round_trip), ("pil_to_qimage", lambda: pil_to_qimage(img)),
+                     ("pil_to_nsimage meshed", lambda: pil_to_nsimage(img, cocoa=COCOA)),
+                     ("pil_to_nsimage planar", lambda: pil_to_nsimage(img, planar=True, cocoa=COCOA))):
+        print(f"{name:<24}{per_call_us(fn, args.runs):>10.1f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
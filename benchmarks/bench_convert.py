@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Batch conversion check
+Runs the convert command on inputs whose outputs would clash: anim.gif and
+anim.png in one directory (both would write anim.png), and a directory
+converted into itself (a.png would overwrite its own source). Both must be
+rejected before any worker starts, without touching the inputs, while the
+other inputs are still converted and listed once in the manifest. An
+animation converted without .ani must still get its first frame as .cur,
+and a still image asked only for .ani must fail rather than be recorded with
+no outputs. A sprite sheet matched by --sprite must become an .ani with one
+frame per cell. Then times a clean batch. Exits non-zero if any check fails.
+"""
+
+import io
+import struct
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from custom_cursor_app import cli
+
+
+def make_image(path, size=64, frames=1):
+    images = []
+    for i in range(frames):
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        ImageDraw.Draw(img).polygon([(2, 2), (2, size - 8), (size // 2, size // 2)], fill=(40 * i % 256, 0, 0, 255))
+        images.append(img)
+    if frames > 1:
+        images[0].save(path, save_all=True, append_images=images[1:], duration=100, loop=0, disposal=2)
+    else:
+        images[0].save(path)
+
+
+def digests(paths):
+    result = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            result[path] = f.read()
+    return result
+
+
+def run(argv):
+    """Run the CLI, returning (exit code, stderr)"""
+    err = io.StringIO()
+    with contextlib.redirect_stderr(err), contextlib.redirect_stdout(io.StringIO()):
+        code = cli.main(argv)
+    return code, err.getvalue()
+
+
+def check_same_stem(directory):
+    src = os.path.join(directory, "stems")
+    out = os.path.join(directory, "stems-out")
+    os.makedirs(src)
+    make_image(os.path.join(src, "anim.gif"), frames=3)
+    make_image(os.path.join(src, "anim.png"))
+    make_image(os.path.join(src, "arrow.png"))
+    code, err = run(["convert", src, "-o", out, "--formats", "cur,ani,png", "-j", "2"])
+
+    with open(os.path.join(out, cli.MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        entries = json.load(f)['entries']
+    outputs = [name for entry in entries.values() for name in entry['outputs']]
+    return (code == 1 and "anim.gif" in err and "anim.png" in err
+            and sorted(entries) == ["arrow.png"]
+            and len(outputs) == len(set(outputs))
+            and not any(name.startswith("anim.") for name in os.listdir(out)))
+
+
+def check_in_place(directory):
+    src = os.path.join(directory, "in-place")
+    os.makedirs(src)
+    make_image(os.path.join(src, "a.png"))
+    make_image(os.path.join(src, "b.gif"), frames=3)
+    before = digests([os.path.join(src, "a.png")])
+    code, err = run(["convert", src, "-o", src, "--formats", "cur,ani,png", "-j", "2"])
+    return (code == 1 and "overwrite" in err
+            and digests(before) == before
+            and os.path.exists(os.path.join(src, "b.ani"))
+            and not os.path.exists(os.path.join(src, "a.cur")))
+
+
+def check_formats_without_ani(directory):
+    src = os.path.join(directory, "no-ani")
+    out = os.path.join(directory, "no-ani-out")
+    os.makedirs(src)
+    make_image(os.path.join(src, "anim.gif"), frames=3)
+    make_image(os.path.join(src, "still.png"))
+    code, _ = run(["convert", src, "-o", out, "--formats", "cur", "-j", "1"])
+    with open(os.path.join(out, cli.MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        entries = json.load(f)['entries']
+    first_frame = False
+    if os.path.exists(os.path.join(out, "anim.cur")):
+        with Image.open(os.path.join(out, "anim.cur")) as cur:
+            first_frame = cur.size == (64, 64)
+
+    only_ani, err = run(["convert", os.path.join(src, "still.png"), "-o", out + "-ani", "--formats", "ani"])
+    with open(os.path.join(out + "-ani", cli.MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        ani_entries = json.load(f)['entries']
+    return (code == 0 and first_frame
+            and entries["anim.gif"]["outputs"] == ["anim.cur"]
+            and entries["still.png"]["outputs"] == ["still.cur"]
+            and only_ani == 1 and "still.png" in err and ani_entries == {})
+
+
+def check_sprite_sheet(directory):
+    src = os.path.join(directory, "sprites")
+    out = os.path.join(directory, "sprites-out")
+    os.makedirs(src)
+    sheet = Image.new('RGBA', (96, 64), (0, 0, 0, 0))
+    for i in range(6):
+        ImageDraw.Draw(sheet).rectangle([i % 3 * 32 + 2, i // 3 * 32 + 2, i % 3 * 32 + 4 + i * 4, i // 3 * 32 + 20],
+                                        fill=(255, 0, 0, 255))
+    sheet.save(os.path.join(src, "walk.png"))
+    make_image(os.path.join(src, "arrow.png"))
+    code, _ = run(["convert", src, "-o", out, "--sprite", "walk*=32x32", "--formats", "ani,png", "-j", "1"])
+    with open(os.path.join(out, cli.MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        entries = json.load(f)['entries']
+    steps = None
+    if os.path.exists(os.path.join(out, "walk.ani")):
+        with open(os.path.join(out, "walk.ani"), 'rb') as f:
+            data = f.read()
+        # anih: header size, unique frames, steps
+        _, _, steps = struct.unpack_from('<3I', data, data.index(b'anih') + 8)
+    with Image.open(os.path.join(out, "walk.png")) as png:
+        png_size = png.size
+    return (code == 0 and steps == 6
+            and entries["walk.png"]["outputs"] == ["walk.ani", "walk.png"]
+            and (entries["walk.png"]["width"], entries["walk.png"]["height"]) == (32, 32)
+            and png_size[0] <= 32
+            and entries["arrow.png"]["outputs"] == ["arrow.png"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that clashing convert outputs are rejected")
+    parser.add_argument("--images", type=int, default=40, help="Images in the timed batch")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        checks = [("same name, other extension", check_same_stem), ("output over its input", check_in_place),
+                  ("animation without .ani", check_formats_without_ani),
+                  ("sprite sheet", check_sprite_sheet)]
+        failures = 0
+        print(f"{'check':<30}{'result':>8}")
+        for name, check in checks:
+            passed = check(directory)
+            failures += not passed
+            print(f"{name:<30}{'ok' if passed else 'FAIL':>8}")
+
+        src = os.path.join(directory, "batch")
+        os.makedirs(src)
+        for i in range(args.images):
+            make_image(os.path.join(src, f"cursor{i}.png"), size=256)
+        start = time.perf_counter()
+        code, _ = run(["convert", src, "-o", os.path.join(directory, "batch-out"), "--formats", "cur,png"])
+        elapsed = time.perf_counter() - start
+        failures += code != 0
+        print(f"\n{args.images} images converted in {elapsed:.2f}s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
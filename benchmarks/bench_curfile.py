@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+.cur round-trip check
+Saves cursors with write_cur, as the Windows backend does (square, wide,
+tall and small sources, each with its own hotspot), and reads them back
+with the pure-Python parse_cur. Every size must come back as a DIB below
+PNG_MIN_SIZE and as PNG from there on, with the hotspot scaled for that
+size and the pixels of the canvas that was encoded. Truncated and foreign
+files must be rejected. Then times encoding and parsing. Exits non-zero if
+any check fails.
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from custom_cursor_app.curfile import PNG_MIN_SIZE, parse_cur, render_size, select_sizes, write_cur
+
+
+def make_cursor(width, height):
+    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.polygon([(0, 0), (0, height - 1), (width // 3, height * 2 // 3), (width - 1, height // 2)],
+                 fill=(30, 140, 250, 255), outline=(255, 255, 255, 180))
+    draw.ellipse((width // 2, 0, width - 1, height // 3), fill=(250, 60, 20, 96))
+    return img
+
+
+def check_file(data, img, hotspot):
+    """Return a list of problems with a parsed .cur against its source"""
+    problems = []
+    entries = parse_cur(data)
+    sizes = select_sizes(img.width, img.height)
+    if [entry.width for entry in entries] != sizes:
+        return [f"sizes {[entry.width for entry in entries]}, expected {sizes}"]
+    for entry in entries:
+        canvas, expected = render_size(img, entry.width, hotspot)
+        kind = 'png' if entry.width >= PNG_MIN_SIZE else 'dib'
+        if entry.kind != kind or entry.height != entry.width:
+            problems.append(f"{entry.width} px stored as {entry.kind} {entry.width}x{entry.height}")
+            continue
+        if (entry.hotspot_x, entry.hotspot_y) != expected:
+            problems.append(f"{entry.width} px hotspot {(entry.hotspot_x, entry.hotspot_y)}, expected {expected}")
+        pixels = entry.data if kind == 'dib' else Image.open(io.BytesIO(entry.data)).convert('RGBA').tobytes()
+        if pixels != canvas.tobytes():
+            problems.append(f"{entry.width} px pixels differ from the encoded canvas")
+    return problems
+
+
+def check_rejected(data):
+    """Truncated files and non-cursor data must raise ValueError"""
+    for bad in (data[:len(data) // 2], b'\x89PNG\r\n\x1a\n' + data[8:], b'\0\0\3\0' + data[4:]):
+        try:
+            parse_cur(bad)
+        except ValueError:
+            continue
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip .cur files through write_cur and parse_cur")
+    parser.add_argument("--runs", type=int, default=20, help="Encodes and parses per timing")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    cases = [("256x256", make_cursor(256, 256), (40, 200)), ("300x120", make_cursor(300, 120), (299, 7)),
+             ("90x200", make_cursor(90, 200), (45, 0)), ("20x20", make_cursor(20, 20), (19, 19))]
+    failures = 0
+    print(f"{'source':<10}{'hotspot':>12}{'entries':>40}{'result':>8}")
+    for name, img, hotspot in cases:
+        path = os.path.join(directory, f"{name}.cur")
+        write_cur(path, img, hotspot)
+        with open(path, 'rb') as f:
+            data = f.read()
+        problems = check_file(data, img, hotspot)
+        if not check_rejected(data):
+            problems.append("a damaged file was accepted")
+        failures += bool(problems)
+        kinds = " ".join(f"{entry.width}{'p' if entry.kind == 'png' else 'd'}" for entry in parse_cur(data))
+        print(f"{name:<10}{str(hotspot):>12}{kinds:>40}{'ok' if not problems else 'FAIL':>8}")
+        for problem in problems:
+            print(f"    {problem}")
+
+    img, hotspot = cases[0][1], cases[0][2]
+    path = os.path.join(directory, "timed.cur")
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        write_cur(path, img, hotspot)
+    encode = (time.perf_counter() - start) / args.runs * 1000
+    with open(path, 'rb') as f:
+        data = f.read()
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        parse_cur(data)
+    parse = (time.perf_counter() - start) / args.runs * 1000
+    print(f"\n256 px source: save {encode:.2f} ms, parse {parse:.2f} ms ({len(data)} bytes)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
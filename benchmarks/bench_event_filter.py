@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Event filter microbenchmark
+Pumps synthetic QEvents through the application-wide filters and compares the
+previous AppEventFilter/CustomCursorApp.eventFilter pair with the frozenset
+dispatch filter, both installed and uninstalled.
+"""
+
+import os
+import sys
+import time
+import platform
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import QEvent, QObject, QPointF, QTimerEvent, Qt
+from PyQt6.QtGui import QHoverEvent, QMouseEvent
+from PyQt6.QtWidgets import QApplication
+
+from custom_cursor_app.events import CursorEventFilter
+from custom_cursor_app.maintenance import CursorMaintenance, FakeCursorBackend
+
+# Mostly uninteresting traffic with some pointer and activation events mixed in
+EVENT_MIX = [
+    QEvent.Type.Timer, QEvent.Type.UpdateRequest, QEvent.Type.LayoutRequest, QEvent.Type.User,
+    QEvent.Type.Timer, QEvent.Type.UpdateRequest, QEvent.Type.MouseMove, QEvent.Type.HoverMove,
+    QEvent.Type.Timer, QEvent.Type.WindowActivate,
+]
+
+
+class LegacyWindow:
+    """Stand-in for CustomCursorApp's attributes read by the old filters"""
+    ns_cursor = None
+    custom_cursor = None
+
+
+class LegacyAppEventFilter(QObject):
+    """run_app's AppEventFilter before the dispatch layer"""
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+
+    def eventFilter(self, watched, event):
+        window = self.window
+        if event.type() in [QEvent.Type.ApplicationActivate, QEvent.Type.WindowActivate]:
+            try:
+                if platform.system() == 'Darwin' and hasattr(window, 'ns_cursor') and window.ns_cursor is not None:
+                    pass
+            except Exception as e:
+                print(f"Error in activation event: {e}")
+        if hasattr(window, 'custom_cursor') and window.custom_cursor is not None:
+            if event.type() in [QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress,
+                              QEvent.Type.MouseButtonRelease, QEvent.Type.HoverMove]:
+                pass
+        return False
+
+
+class LegacyWindowFilter(QObject):
+    """CustomCursorApp.eventFilter before the dispatch layer"""
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+
+    def eventFilter(self, obj, event):
+        if hasattr(self.window, 'ns_cursor') and self.window.ns_cursor is not None:
+            if event.type() in [QEvent.Type.ApplicationActivate, QEvent.Type.WindowActivate]:
+                pass
+        return super().eventFilter(obj, event)
+
+
+def make_event(kind):
+    """Build a synthetic event of the right class for its type"""
+    if kind == QEvent.Type.MouseMove:
+        return QMouseEvent(kind, QPointF(5, 5), QPointF(5, 5), Qt.MouseButton.NoButton,
+                           Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+    if kind == QEvent.Type.HoverMove:
+        return QHoverEvent(kind, QPointF(5, 5), QPointF(5, 5), QPointF(4, 4))
+    if kind == QEvent.Type.Timer:
+        return QTimerEvent(0)
+    return QEvent(kind)
+
+
+def pump(app, target, events):
+    start = time.perf_counter()
+    for event in events:
+        app.sendEvent(target, event)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pump synthetic events through the event filters")
+    parser.add_argument("--events", type=int, default=1_000_000, help="Number of events to pump")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    target = QObject()
+    events = [make_event(EVENT_MIX[i % len(EVENT_MIX)]) for i in range(args.events)]
+
+    baseline = pump(app, target, events)
+
+    window = LegacyWindow()
+    legacy = [LegacyAppEventFilter(window), LegacyWindowFilter(window)]
+    for legacy_filter in legacy:
+        app.installEventFilter(legacy_filter)
+    legacy_time = pump(app, target, events)
+    for legacy_filter in legacy:
+        app.removeEventFilter(legacy_filter)
+
+    maintenance = CursorMaintenance()
+    dispatch = CursorEventFilter(maintenance)
+    idle_time = pump(app, target, events)
+
+    maintenance.start(FakeCursorBackend())
+    active_time = pump(app, target, events)
+    maintenance.stop()
+
+    def per_event(seconds):
+        return (seconds - baseline) / args.events * 1e9
+
+    print(f"events pumped:                 {args.events}")
+    print(f"no filter (baseline):          {baseline / args.events * 1e9:8.0f} ns/event")
+    print(f"legacy filters:                {per_event(legacy_time):8.0f} ns/event over baseline")
+    print(f"dispatch filter, active:       {per_event(active_time):8.0f} ns/event over baseline")
+    print(f"dispatch filter, no cursor:    {per_event(idle_time):8.0f} ns/event over baseline "
+          f"(installed: {dispatch.installed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Cursor gallery scroll benchmark
+Scrolls a CursorGalleryView over a generated pack of cursor images and reports
+per-frame paint time. The pack model decodes thumbnails on a background pool;
+--sync compares against decoding them inline in data(). Also checks that an
+image that fails to decode is tried once per mtime, not on every repaint, and
+exits non-zero if it is not.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from custom_cursor_app.gallery import CursorGalleryView, CursorPackModel
+from custom_cursor_app.library import THUMB_SIZE, make_thumbnail
+
+
+class SyncPackModel(CursorPackModel):
+    """Decodes each thumbnail inline on the GUI thread"""
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DecorationRole and index.isValid():
+            path = self.paths[index.row()]
+            pixmap = self.cache.get(path)
+            if pixmap is None:
+                with Image.open(path) as img:
+                    pixels = make_thumbnail(img.convert('RGBA'))
+                image = QImage(pixels, THUMB_SIZE, THUMB_SIZE, THUMB_SIZE * 4, QImage.Format.Format_RGBA8888)
+                pixmap = QPixmap.fromImage(image)
+                self.cache.put(path, pixmap)
+            return pixmap
+        return super().data(index, role)
+
+
+def make_pack(directory, count, size):
+    """Write count distinct cursor PNGs into directory (reused between runs)"""
+    os.makedirs(directory, exist_ok=True)
+    existing = sum(1 for name in os.listdir(directory) if name.endswith('.png'))
+    for i in range(existing, count):
+        color = ((i * 37) % 256, (i * 91) % 256, (i * 53) % 256, 255)
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        img.paste(color, (i % (size // 2), 0, size, size - i % (size // 2)))
+        img.save(os.path.join(directory, f"cursor_{i:05d}.png"))
+
+
+def scroll(app, model, directory, count, frames, step):
+    model.set_paths(sorted(os.path.join(directory, f"cursor_{i:05d}.png") for i in range(count)))
+    view = CursorGalleryView()
+    view.setModel(model)
+    view.resize(640, 480)
+    view.show()
+
+    # Let the batched layout finish so the whole pack is scrollable
+    bar = view.verticalScrollBar()
+    rows = -(-count // max(1, view.viewport().width() // view.gridSize().width()))
+    deadline = time.perf_counter() + 10.0
+    while bar.maximum() < rows * view.gridSize().height() - view.viewport().height() \
+            and time.perf_counter() < deadline:
+        app.processEvents()
+
+    times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        bar.setValue(min(bar.maximum(), frame * step))
+        view.viewport().repaint()
+        # Deliver thumbnails that finished decoding since the last frame
+        app.processEvents()
+        times.append((time.perf_counter() - start) * 1000.0)
+        if bar.value() >= bar.maximum():
+            break
+    view.close()
+    return times
+
+
+def check_broken(app, directory):
+    """A broken image is decoded once, and again only after the file changes"""
+    path = os.path.join(directory, "broken.png")
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n not really')
+    model = CursorPackModel()
+    model.set_paths([path])
+    index = model.index(0)
+
+    def repaint(times):
+        for _ in range(times):
+            model.data(index, Qt.ItemDataRole.DecorationRole)
+            model.loader.pool.waitForDone()
+            app.processEvents()
+
+    repaint(20)
+    once = model.loader.decoded == 1 and model.data(index, Qt.ItemDataRole.DecorationRole) is model._broken
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    repaint(20)
+    retried = model.loader.decoded == 2
+    model.close()
+    os.remove(path)
+    return once and retried
+
+
+def report(label, times, budget_ms, model):
+    times = sorted(times)
+    mean = sum(times) / len(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    over = sum(1 for t in times if t > budget_ms)
+    print(f"{label:<12}{len(times):>8}{mean:>10.2f}{p95:>10.2f}{times[-1]:>10.2f}{over:>8}{len(model.cache):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure gallery frame times while scrolling a large cursor pack")
+    parser.add_argument("--count", type=int, default=10000, help="Cursor images in the pack")
+    parser.add_argument("--size", type=int, default=64, help="Cursor image size in pixels")
+    parser.add_argument("--frames", type=int, default=2000, help="Maximum frames to scroll")
+    parser.add_argument("--step", type=int, default=40, help="Pixels scrolled per frame")
+    parser.add_argument("--refresh", type=float, default=60.0, help="Display refresh rate for the frame budget")
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "cursor_gallery_bench"),
+                        help="Directory for the generated pack")
+    parser.add_argument("--sync", action="store_true", help="Also measure inline (GUI-thread) decoding")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    make_pack(args.dir, args.count, args.size)
+    budget_ms = 1000.0 / args.refresh
+
+    print(f"frame budget {budget_ms:.2f} ms, {args.count} cursors")
+    print(f"{'model':<12}{'frames':>8}{'mean':>10}{'p95':>10}{'max':>10}{'over':>8}{'cached':>8}")
+    model = CursorPackModel()
+    report("pool", scroll(app, model, args.dir, args.count, args.frames, args.step), budget_ms, model)
+    print(f"decoded {model.loader.decoded} of {args.count} thumbnails")
+    model.close()
+    if args.sync:
+        model = SyncPackModel()
+        report("sync", scroll(app, model, args.dir, args.count, args.frames, args.step), budget_ms, model)
+
+    broken = check_broken(app, tempfile.mkdtemp())
+    print(f"broken image decoded once per mtime: {'ok' if broken else 'FAIL'}")
+    return 0 if broken else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
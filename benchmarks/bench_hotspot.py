@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Hotspot detection and trimming check
+Runs the cursor analysis on synthetic arrows (at several sizes, positions
+and mirrored), a hand, a crosshair, an I-beam and images with a stored
+hotspot, and checks every proposed hotspot against the expected one. Then
+times overlay moves and paints with a padded cursor and with the same cursor
+trimmed to its alpha box; the compositor's share of the cost scales with the
+window area, which is reported alongside. Exits non-zero if a hotspot is off
+by more than --tolerance pixels.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw, PngImagePlugin
+
+from custom_cursor_app.analysis import analyze
+from custom_cursor_app.pixels import trim
+
+ARROW = [(0, 0), (0, 116), (32, 84), (56, 126), (72, 118), (50, 76), (92, 76)]
+
+
+def arrow(size, offset=(24, 24), mirror=False):
+    """Arrow with its tip at offset on a size x size canvas (scaled from a 256 px design)"""
+    s = size / 256
+    ox, oy = offset
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(img).polygon([(ox + x * s, oy + y * s) for x, y in ARROW],
+                                fill=(0, 0, 0, 255), outline=(255, 255, 255, 255))
+    if mirror:
+        return img.transpose(Image.Transpose.FLIP_LEFT_RIGHT), (size - 1 - ox, oy)
+    return img, offset
+
+
+def hand():
+    img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((10, 28, 54, 62), fill=(255, 255, 255, 255), outline=(0, 0, 0, 255))
+    draw.rounded_rectangle((24, 4, 34, 40), 5, fill=(255, 255, 255, 255), outline=(0, 0, 0, 255))
+    return img, (29, 4)
+
+
+def crosshair():
+    img = Image.new('RGBA', (33, 33), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.line((16, 2, 16, 30), fill=(0, 0, 0, 255))
+    draw.line((2, 16, 30, 16), fill=(0, 0, 0, 255))
+    return img, (16, 16)
+
+
+def ibeam():
+    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((15, 2, 16, 29), fill=(0, 0, 0, 255))
+    draw.rectangle((11, 2, 20, 3), fill=(0, 0, 0, 255))
+    draw.rectangle((11, 28, 20, 29), fill=(0, 0, 0, 255))
+    return img, (15, 15)
+
+
+def with_metadata(directory, name, text, expected):
+    img, _ = arrow(64)
+    info = PngImagePlugin.PngInfo()
+    for key, value in text.items():
+        info.add_text(key, value)
+    path = os.path.join(directory, name)
+    img.save(path, pnginfo=info)
+    return Image.open(path).convert('RGBA'), expected, path
+
+
+def per_frame_us(fn, frames):
+    start = time.perf_counter()
+    for i in range(frames):
+        fn(i)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def overlay_cost(app, img, frames):
+    """Microseconds per pointer move plus paint of an overlay showing img"""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QImage
+
+    from custom_cursor_app.bridge import pil_to_qpixmap
+    from custom_cursor_app.overlay import CursorOverlay
+
+    overlay = CursorOverlay()
+    overlay.pause()
+    overlay.set_cursor_image(pil_to_qpixmap(img))
+    target = QImage(overlay.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    target.fill(Qt.GlobalColor.transparent)
+
+    def step(i):
+        overlay.move_to_pointer(200 + i % 50, 200)
+        overlay.render(target)
+    cost = per_frame_us(step, frames)
+    overlay.hide_overlay()
+    overlay.deleteLater()
+    app.processEvents()
+    return cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check proposed hotspots and the overlay cost of trimming")
+    parser.add_argument("--tolerance", type=int, default=2, help="Largest allowed hotspot error in pixels")
+    parser.add_argument("--frames", type=int, default=2000, help="Overlay moves per measurement")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    cases = [(f"arrow {size}", *arrow(size, (size // 10, size // 10)), None) for size in (16, 32, 64, 256, 1024)]
+    cases += [
+        ("arrow offset", *arrow(256, (90, 40)), None),
+        ("arrow mirrored", *arrow(256, mirror=True), None),
+        ("hand", *hand(), None),
+        ("crosshair", *crosshair(), None),
+        ("i-beam", *ibeam(), None),
+        ("tEXt hotspot", *with_metadata(directory, "a.png", {"hotspot": "5,7"}, (5, 7))),
+        ("tEXt xhot/yhot", *with_metadata(directory, "b.png", {"xhot": "3", "yhot": "9"}, (3, 9))),
+    ]
+
+    print(f"{'image':<18}{'expected':>12}{'proposed':>12}{'from':>10}{'ms':>8}")
+    failures = 0
+    for name, img, expected, path in cases:
+        start = time.perf_counter()
+        result = analyze(img, path)
+        elapsed = (time.perf_counter() - start) * 1000
+        error = max(abs(result.hotspot[0] - expected[0]), abs(result.hotspot[1] - expected[1]))
+        failed = error > args.tolerance
+        failures += failed
+        print(f"{name:<18}{str(expected):>12}{str(result.hotspot):>12}{result.source:>10}{elapsed:>8.2f}"
+              f"{'   FAIL' if failed else ''}")
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    padded, hotspot = arrow(256)
+    trimmed, _ = trim(padded, hotspot)
+    print(f"\n{'overlay':<16}{'size':>12}{'area':>10}{'us/move':>10}")
+    for name, img in (("padded", padded), ("trimmed", trimmed)):
+        area = img.width * img.height / (padded.width * padded.height)
+        print(f"{name:<16}{f'{img.width}x{img.height}':>12}{area:>10.0%}{overlay_cost(app, img, args.frames):>10.1f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
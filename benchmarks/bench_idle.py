@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Idle power check
+Drives the cursor lifecycle through its states with a fake pointer and
+counts the ticks of every cursor timer (tracker polls, maintenance checks,
+animation steps, the lifecycle's own idle checks and input probes) in each.
+Exits non-zero if anything ticks before a cursor is applied, while the user
+is idle, or while the screen is locked.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QColor, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from custom_cursor_app.lifecycle import ACTIVE, PAUSED, CursorLifecycle
+from custom_cursor_app.maintenance import CursorMaintenance, FakeCursorBackend
+from custom_cursor_app.overlay import CursorOverlay
+
+
+class FakePointer:
+    """Pointer position source that a timer can keep moving"""
+    def __init__(self):
+        self.position = (100, 100)
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.step)
+
+    def __call__(self):
+        return self.position
+
+    def step(self):
+        self.position = (self.position[0] + 1, 100)
+
+
+class FakeMonitor:
+    """Native input monitor stand-in; fire() simulates pointer motion"""
+    def __init__(self, callback):
+        self.callback = callback
+        self.removed = False
+
+    def remove(self):
+        self.removed = True
+
+
+def run_for(app, seconds, until=None):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        if until is not None and until():
+            return True
+        time.sleep(0.002)
+    return until is None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that cursor timers stop while idle or locked")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Length of each measured phase")
+    parser.add_argument("--idle-ms", type=int, default=300, help="Idle timeout used for the check")
+    parser.add_argument("--polling", action="store_true", help="Simulate a platform without a native monitor")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    pointer = FakePointer()
+    monitors = []
+
+    def monitor_factory(callback):
+        if args.polling:
+            return None
+        monitors.append(FakeMonitor(callback))
+        return monitors[-1]
+
+    lifecycle = CursorLifecycle(idle_timeout=args.idle_ms, idle_check=50, wake_probe=250, source=pointer,
+                                monitor_factory=monitor_factory, session_factory=lambda callback, window: None)
+    maintenance = CursorMaintenance()
+    overlay = CursorOverlay()
+    overlay.tracker._source = pointer
+    lifecycle.add(maintenance)
+    lifecycle.add(overlay)
+
+    def ticks():
+        animation = overlay.animation.wakeups if overlay.animation is not None else 0
+        return (overlay.tracker.wakeups + maintenance.checks + animation
+                + lifecycle.checks + lifecycle.probes)
+
+    def phase(name, seconds, expect_zero):
+        before = ticks()
+        run_for(app, seconds)
+        count = ticks() - before
+        ok = count == 0 or not expect_zero
+        print(f"{name:<34}{lifecycle.state:>10}{count:>10}{'' if ok else '   FAIL':>8}")
+        return ok
+
+    print(f"{'phase':<34}{'state':>10}{'ticks':>10}")
+    results = [phase("no cursor applied", args.seconds, True)]
+
+    # Apply an animated overlay cursor and a maintained cursor
+    atlas = QPixmap(64, 32)
+    atlas.fill(QColor(255, 0, 0, 200))
+    overlay.set_cursor_animation(atlas, [(0, 0, 32, 32), (32, 0, 32, 32)], [0, 1], [50, 50])
+    maintenance.start(FakeCursorBackend())
+    lifecycle.set_active(True)
+    pointer.timer.start(16)
+    results.append(phase("applied, pointer moving", args.seconds, False))
+
+    pointer.timer.stop()
+    went_idle = run_for(app, args.idle_ms / 1000.0 * 4, until=lambda: lifecycle.state == PAUSED)
+    results.append(went_idle)
+    if not went_idle:
+        print("FAIL: the lifecycle did not pause after the idle timeout")
+    results.append(phase("applied, user idle", args.seconds, not args.polling))
+
+    # Input arrives: the native monitor (or the fallback probe) wakes everything up
+    pointer.step()
+    if monitors and not monitors[-1].removed:
+        monitors[-1].callback()
+    woke = run_for(app, 2.0, until=lambda: lifecycle.state == ACTIVE)
+    results.append(woke)
+    if not woke:
+        print("FAIL: the lifecycle did not resume on input")
+    pointer.timer.start(16)
+    results.append(phase("resumed on input", args.seconds / 2, False))
+
+    pointer.timer.stop()
+    lifecycle.set_locked(True)
+    results.append(phase("screen locked", args.seconds, True))
+    lifecycle.set_locked(False)
+    results.append(phase("unlocked", args.seconds / 2, False))
+
+    overlay.hide_overlay()
+    maintenance.stop()
+    lifecycle.set_active(False)
+    results.append(phase("cursor reset", args.seconds, True))
+
+    if args.polling:
+        print(f"\nwithout a native monitor, {lifecycle.probes} input probes ran while idle")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Image pipeline cache check
+Loads images through ImagePipeline in a temporary directory: two files
+with the same bytes must share one decode (a hit), a file rewritten with
+other bytes must be decoded again (a miss), and once the memory budget is
+reached the least recently used entries must be evicted while the newest
+one is always kept. Then times a cold decode against a cached load. Exits
+non-zero if any check fails.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from custom_cursor_app.imaging import ImagePipeline
+
+
+def make_image(path, size=64, color=(40, 140, 240, 255)):
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(img).polygon([(2, 2), (2, size - 8), (size // 2, size // 2)], fill=color)
+    img.save(path)
+    return path
+
+
+def check_same_bytes(directory):
+    pipeline = ImagePipeline()
+    first = make_image(os.path.join(directory, "first.png"))
+    copy = os.path.join(directory, "copy.png")
+    shutil.copyfile(first, copy)
+    img = pipeline.load(first)
+    hits = pipeline.hits
+    return pipeline.load(copy) is img and pipeline.load(first) is img and pipeline.hits == hits + 2
+
+
+def check_changed_bytes(directory):
+    pipeline = ImagePipeline()
+    path = make_image(os.path.join(directory, "changed.png"))
+    img = pipeline.load(path)
+    digest = pipeline.content_hash(path)
+    st = os.stat(path)
+    make_image(path, color=(240, 40, 40, 255))
+    # Same size or not, a new mtime means the file is hashed again
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    misses = pipeline.misses
+    reloaded = pipeline.load(path)
+    return (reloaded is not img and pipeline.content_hash(path) != digest
+            and pipeline.misses == misses + 1 and reloaded.getpixel((4, 20))[0] == 240)
+
+
+def check_eviction(directory):
+    entry = 64 * 64 * 4
+    pipeline = ImagePipeline(budget=2 * entry)
+    paths = [make_image(os.path.join(directory, f"evict{i}.png"), color=(i * 60, 0, 0, 255)) for i in range(3)]
+    images = [pipeline.load(path) for path in paths]
+    within = pipeline.memory <= pipeline.budget and len(pipeline._images) == 2
+    # The oldest was evicted, the two newest are still cached
+    misses = pipeline.misses
+    kept = pipeline.load(paths[2]) is images[2] and pipeline.load(paths[1]) is images[1]
+    evicted = pipeline.load(paths[0]) is not images[0] and pipeline.misses == misses + 1
+
+    # One entry larger than the whole budget is still kept until the next one
+    small = ImagePipeline(budget=entry // 2)
+    big = small.load(paths[0])
+    return within and kept and evicted and small.load(paths[0]) is big and small.memory == entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the image pipeline's content cache")
+    parser.add_argument("--size", type=int, default=512, help="Size of the timed image in pixels")
+    parser.add_argument("--runs", type=int, default=50, help="Timed loads")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        checks = [("same bytes hit", check_same_bytes), ("changed bytes miss", check_changed_bytes),
+                  ("eviction at the budget", check_eviction)]
+        failures = 0
+        print(f"{'check':<30}{'result':>8}")
+        for name, check in checks:
+            passed = check(directory)
+            failures += not passed
+            print(f"{name:<30}{'ok' if passed else 'FAIL':>8}")
+
+        path = make_image(os.path.join(directory, "timed.png"), args.size)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            ImagePipeline().load(path)
+        cold = (time.perf_counter() - start) / args.runs
+        pipeline = ImagePipeline()
+        pipeline.load(path)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            pipeline.load(path)
+        cached = (time.perf_counter() - start) / args.runs
+        print(f"\n{args.size} px: cold decode {cold * 1000:.2f} ms, cached load {cached * 1000:.3f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Background job responsiveness check
+Loads a large PNG through the same job the app uses for "Upload PNG" and
+measures the longest gap between ticks of a 10 ms GUI timer, first with the
+job on the GUI thread and then on the JobRunner pool. Exits non-zero if the
+event loop stalls for longer than --max-gap-ms while the pool does the work;
+the default is half of the 100 ms a click may wait before the UI feels stuck.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+from custom_cursor_app.app import prepare_image_job
+from custom_cursor_app.imaging import image_pipeline
+from custom_cursor_app.jobs import JobRunner
+
+
+class TickMonitor:
+    """Records the longest gap between ticks of a short GUI timer"""
+    def __init__(self, interval_ms=10):
+        self.ticks = 0
+        self.max_gap_ms = 0.0
+        self._last = None
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._tick)
+        self.timer.start(interval_ms)
+
+    def stop(self):
+        """Stop the timer, counting the gap since the last tick"""
+        self.timer.stop()
+        self._tick()
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.max_gap_ms = max(self.max_gap_ms, (now - self._last) * 1000.0)
+        self._last = now
+        self.ticks += 1
+
+
+class _InlineJob:
+    key = "load"
+
+    def report(self, percent):
+        pass
+
+
+def make_image(path, size):
+    if not os.path.exists(path):
+        noise = Image.effect_noise((size, size), 64)
+        Image.merge('RGBA', (noise, noise.rotate(90), noise.transpose(Image.FLIP_LEFT_RIGHT), noise)).save(
+            path, compress_level=1)
+
+
+def run_inline(app, path):
+    monitor = TickMonitor()
+    start = time.perf_counter()
+    done = []
+
+    def work():
+        prepare_image_job(_InlineJob(), path)
+        done.append(time.perf_counter() - start)
+        monitor.stop()
+        app.quit()
+
+    QTimer.singleShot(50, work)
+    app.exec()
+    return done[0], monitor
+
+
+def run_pool(app, path):
+    runner = JobRunner()
+    monitor = TickMonitor()
+    start = time.perf_counter()
+    done = []
+    runner.finished.connect(lambda key, result: (done.append(time.perf_counter() - start), monitor.stop(), app.quit()))
+    runner.failed.connect(lambda key, error: (print(f"job failed: {error}"), app.quit()))
+    QTimer.singleShot(50, lambda: runner.submit("load", prepare_image_job, path))
+    app.exec()
+    runner.shutdown()
+    return (done[0] if done else float('nan')), monitor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the event loop keeps running while a large PNG loads")
+    parser.add_argument("--size", type=int, default=8192, help="Width and height of the test PNG")
+    parser.add_argument("--max-gap-ms", type=float, default=50.0, help="Longest acceptable event-loop stall")
+    parser.add_argument("--path", default=None, help="PNG to use (generated if missing)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    path = args.path or os.path.join(tempfile.gettempdir(), f"cursor_job_bench_{args.size}.png")
+    make_image(path, args.size)
+
+    print(f"{'mode':<10}{'load (s)':>10}{'ticks':>8}{'max gap (ms)':>14}")
+    for label, run in (("inline", run_inline), ("pool", run_pool)):
+        image_pipeline.clear()
+        elapsed, monitor = run(app, path)
+        print(f"{label:<10}{elapsed:>10.2f}{monitor.ticks:>8}{monitor.max_gap_ms:>14.1f}")
+
+    if monitor.max_gap_ms > args.max_gap_ms:
+        print(f"FAIL: event loop stalled for {monitor.max_gap_ms:.1f} ms (limit {args.max_gap_ms:.0f} ms)")
+        return 1
+    print("OK: event loop kept dispatching during the background load")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
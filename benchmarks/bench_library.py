@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cursor library index check
+Adds cursors to a library in a temporary directory and reopens it: every
+record (hash, size, hotspot, extension, name) and thumbnail must survive
+the round trip through index.bin. An index with another magic or record
+size (written by an older or newer version) must be ignored rather than
+misread, and a truncated one must keep only its complete entries. find()
+from a worker must never miss an indexed cursor while the GUI thread
+reloads the index. Then times reopening a large index. Exits non-zero if
+any check fails.
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from custom_cursor_app import library
+from custom_cursor_app.library import ENTRY_SIZE, CursorLibrary
+
+
+def make_images(directory, count):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        img = Image.new('RGBA', (32 + i % 5 * 16, 32), (0, 0, 0, 0))
+        ImageDraw.Draw(img).polygon([(1, 1), (1, 30), (12 + i % 20, 16)], fill=(i % 256, 90, 200, 255))
+        path = os.path.join(directory, f"cursor{i}.png")
+        img.save(path)
+        paths.append(path)
+    return paths
+
+
+def check_round_trip(directory):
+    root = os.path.join(directory, "round-trip")
+    paths = make_images(os.path.join(directory, "round-trip-src"), 3)
+    lib = CursorLibrary(root)
+    added = [lib.add(path, (i, 2 * i), name=f"cursor é{i}") for i, path in enumerate(paths)]
+    # Content already in the library is not indexed twice
+    again = lib.add(paths[0], (9, 9))
+    thumbnails = [lib.thumbnail(entry.index) for entry in added]
+    lib.close()
+
+    reopened = CursorLibrary(root)
+    result = (list(reopened) == added and again == added[0]
+              and [reopened.thumbnail(entry.index) for entry in reopened] == thumbnails
+              and all(os.path.exists(reopened.asset_path(entry)) for entry in reopened)
+              and reopened.find(added[1].digest) == added[1])
+    reopened.close()
+    return result
+
+
+def check_stale_index(directory):
+    root = os.path.join(directory, "stale")
+    paths = make_images(os.path.join(directory, "stale-src"), 3)
+    lib = CursorLibrary(root)
+    for path in paths:
+        lib.add(path)
+    lib.close()
+    with open(lib.index_path, 'rb') as f:
+        data = f.read()
+
+    results = []
+    header = library._HEADER
+    for stale in (header.pack(b'CCLIB\x00\x00\x00', ENTRY_SIZE, 3) + data[header.size:],
+                  header.pack(library.MAGIC, ENTRY_SIZE - 4, 3) + data[header.size:]):
+        with open(lib.index_path, 'wb') as f:
+            f.write(stale)
+        reopened = CursorLibrary(root)
+        results.append(len(reopened) == 0)
+        reopened.close()
+
+    # A write cut short leaves the count ahead of the records
+    with open(lib.index_path, 'wb') as f:
+        f.write(data[:header.size + 2 * ENTRY_SIZE + 100])
+    truncated = CursorLibrary(root)
+    results.append(len(truncated) == 2)
+    truncated.close()
+    return all(results)
+
+
+def check_find_during_reload(directory):
+    root = os.path.join(directory, "reload")
+    lib = CursorLibrary(root)
+    for path in make_images(os.path.join(directory, "reload-src"), 20):
+        lib.add(path)
+    digests = [entry.digest for entry in lib]
+    misses = []
+    done = threading.Event()
+
+    def worker():
+        while not done.is_set():
+            misses.extend(digest for digest in digests if lib.find(digest) is None)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    for _ in range(300):
+        lib.load()
+    done.set()
+    thread.join()
+    lib.close()
+    return not misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the cursor library index round trip")
+    parser.add_argument("--entries", type=int, default=1000, help="Entries in the timed index")
+    args = parser.parse_args()
+    # The stale-index warnings are expected
+    logging.getLogger(library.__name__).setLevel(logging.ERROR)
+
+    directory = tempfile.mkdtemp()
+    try:
+        checks = [("index round trip", check_round_trip), ("stale or truncated index", check_stale_index),
+                  ("find during reload", check_find_during_reload)]
+        failures = 0
+        print(f"{'check':<30}{'result':>8}")
+        for name, check in checks:
+            passed = check(directory)
+            failures += not passed
+            print(f"{name:<30}{'ok' if passed else 'FAIL':>8}")
+
+        # Repeat one record under new hashes; only the index is read back
+        root = os.path.join(directory, "timed")
+        lib = CursorLibrary(root)
+        lib.add(make_images(os.path.join(directory, "timed-src"), 1)[0])
+        lib.close()
+        with open(lib.index_path, 'rb') as f:
+            data = f.read()
+        record = data[library._HEADER.size:]
+        with open(lib.index_path, 'wb') as f:
+            f.write(library._HEADER.pack(library.MAGIC, ENTRY_SIZE, args.entries))
+            for i in range(args.entries):
+                f.write(i.to_bytes(20, 'little') + record[20:])
+        start = time.perf_counter()
+        timed = CursorLibrary(root)
+        elapsed = time.perf_counter() - start
+        failures += len(timed) != args.entries
+        timed.close()
+        print(f"\n{args.entries} entries reopened in {elapsed * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
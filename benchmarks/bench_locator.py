@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Bundle locator check
+Lays out a fake frozen bundle in a temporary directory and drives
+main.load_from_locator through it: a locator in the PyInstaller directory
+(sys._MEIPASS) must import the entry point it names; with no locator
+anywhere, or with only a stale one (missing module or entry, unreadable
+JSON), it must return None so main falls back to searching the bundle; and
+a stale locator must not stop a good one in a later directory (the macOS
+Resources folder) from being used. Then times the lookup. Exits non-zero if
+any check fails.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import main as entry
+
+
+@contextlib.contextmanager
+def frozen_bundle(root):
+    """Pretend to run from a bundle at root: root/MEI is _MEIPASS, root/MacOS the executable's directory"""
+    saved = sys.executable, list(sys.path)
+    sys._MEIPASS = os.path.join(root, "MEI")
+    sys.executable = os.path.join(root, "MacOS", "Custom Cursors")
+    for name in ("MEI", "MacOS", "Resources"):
+        os.makedirs(os.path.join(root, name), exist_ok=True)
+    try:
+        yield
+    finally:
+        del sys._MEIPASS
+        sys.executable, sys.path[:] = saved
+
+
+class WarningLog(logging.Handler):
+    """Collects warnings instead of printing them"""
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+# Installed on the root logger by main, which also keeps logging.warning from
+# setting up a console handler of its own
+WARNINGS = WarningLog()
+
+
+def write_module(directory, module, body="def run_app():\n    return 'started'\n"):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, module + ".py"), 'w', encoding='utf-8') as f:
+        f.write(body)
+
+
+def write_locator(directory, content):
+    with open(os.path.join(directory, entry.LOCATOR_NAME), 'w', encoding='utf-8') as f:
+        f.write(content if isinstance(content, str) else json.dumps(content))
+
+
+def check_frozen(directory):
+    root = os.path.join(directory, "frozen")
+    with frozen_bundle(root):
+        write_module(os.path.join(root, "MEI", "lib"), "locator_app_frozen")
+        write_locator(os.path.join(root, "MEI"), {"path": "lib", "module": "locator_app_frozen"})
+        run_app = entry.load_from_locator()
+    return run_app is not None and run_app() == 'started'
+
+
+def check_missing(directory):
+    with frozen_bundle(os.path.join(directory, "missing")):
+        return entry.load_from_locator() is None
+
+
+def check_stale(directory):
+    WARNINGS.messages.clear()
+    results = []
+    for i, locator in enumerate(({"path": "lib", "module": "locator_app_gone"},
+                                 {"path": "lib", "module": "locator_app_stale", "entry": "no_such_entry"},
+                                 "{not json")):
+        root = os.path.join(directory, f"stale{i}")
+        with frozen_bundle(root):
+            write_module(os.path.join(root, "MEI", "lib"), "locator_app_stale")
+            write_locator(os.path.join(root, "MEI"), locator)
+            results.append(entry.load_from_locator() is None)
+    # Each stale locator is reported, so a broken build is visible in the log
+    return all(results) and len(WARNINGS.messages) == len(results)
+
+
+def check_fallback(directory):
+    root = os.path.join(directory, "fallback")
+    WARNINGS.messages.clear()
+    with frozen_bundle(root):
+        write_locator(os.path.join(root, "MEI"), {"path": "lib", "module": "locator_app_missing"})
+        write_module(os.path.join(root, "Resources", "lib"), "locator_app_resources")
+        write_locator(os.path.join(root, "Resources"), {"path": "lib", "module": "locator_app_resources"})
+        run_app = entry.load_from_locator()
+    return run_app is not None and run_app.__module__ == "locator_app_resources" and len(WARNINGS.messages) == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the frozen-bundle locator lookup and its fallbacks")
+    parser.add_argument("--runs", type=int, default=200, help="Lookups to time")
+    args = parser.parse_args()
+    logging.getLogger().addHandler(WARNINGS)
+
+    directory = tempfile.mkdtemp()
+    try:
+        checks = [("locator in _MEIPASS", check_frozen), ("no locator", check_missing),
+                  ("stale locator", check_stale), ("stale, then a good one", check_fallback)]
+        failures = 0
+        print(f"{'check':<30}{'result':>8}")
+        for name, check in checks:
+            passed = check(directory)
+            failures += not passed
+            print(f"{name:<30}{'ok' if passed else 'FAIL':>8}")
+
+        root = os.path.join(directory, "timed")
+        with frozen_bundle(root):
+            write_module(os.path.join(root, "MEI", "lib"), "locator_app_timed")
+            write_locator(os.path.join(root, "MEI"), {"path": "lib", "module": "locator_app_timed"})
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                entry.load_from_locator()
+            elapsed = time.perf_counter() - start
+        print(f"\nlocator lookup {elapsed / args.runs * 1000:.3f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
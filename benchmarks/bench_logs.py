@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Logging check
+Drives the app's logging setup into a temporary directory: a burst from one
+call site must be cut to RATE_BURST records and the next record after the
+quiet period must carry the count it replaced; records buffered at startup
+and records logged afterwards must both reach the file through the queue
+once main.finish_logging has run; and the file must rotate at MAX_BYTES,
+keeping BACKUP_COUNT backups. Then times a record on the calling thread.
+Exits non-zero if any check fails.
+"""
+
+import os
+import sys
+import glob
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import main as entry
+from custom_cursor_app import logs
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def read_log(directory):
+    with open(os.path.join(directory, logs.LOG_FILE), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def check_rate_limit(directory):
+    clock = FakeClock()
+    limiter = logs.RateLimitFilter(burst=5, interval=10.0, clock=clock)
+    record = logging.LogRecord("storm", logging.ERROR, __file__, 1, "tick", (), None)
+    passed = sum(limiter.filter(record) for _ in range(8))
+    # Another call site has its own budget
+    other = logging.LogRecord("storm", logging.ERROR, __file__, 2, "tock", (), None)
+    other_passed = limiter.filter(other)
+
+    clock.now = 10.0
+    after = logging.LogRecord("storm", logging.ERROR, __file__, 1, "tick", (), None)
+    resumed = limiter.filter(after)
+    text = logs.TextFormatter(logs.TEXT_FORMAT).format(after)
+    return (passed == 5 and other_passed and resumed and getattr(after, 'suppressed', 0) == 3
+            and text.endswith("[3 similar messages suppressed]"))
+
+
+def check_finish_logging(directory):
+    log_dir = os.path.join(directory, "startup")
+    os.environ[logs.DIR_ENV] = log_dir
+    try:
+        buffer = entry.setup_logging()
+        logging.info("buffered before the app package")
+        logging.debug("buffered below the level")
+        entry.finish_logging(buffer, "INFO")
+        logging.info("logged through the queue")
+        listener = logs._listener
+        logs.shutdown_logging()
+    finally:
+        del os.environ[logs.DIR_ENV]
+    text = read_log(log_dir)
+    return (listener is not None
+            and "buffered before the app package" in text and "logged through the queue" in text
+            and "buffered below the level" not in text
+            and text.index("buffered before") < text.index("through the queue"))
+
+
+def check_rotation(directory):
+    log_dir = os.path.join(directory, "rotation")
+    saved = logs.MAX_BYTES
+    logs.MAX_BYTES = 4096
+    try:
+        logs.configure_logging("INFO", log_dir)
+        # One logger per record, so the rate limit never applies
+        for i in range(400):
+            logging.getLogger(f"rotation.{i}").info("x" * 80)
+        logs.shutdown_logging()
+    finally:
+        logs.MAX_BYTES = saved
+    files = sorted(glob.glob(os.path.join(log_dir, logs.LOG_FILE + "*")))
+    expected = [os.path.join(log_dir, logs.LOG_FILE)] + [
+        os.path.join(log_dir, f"{logs.LOG_FILE}.{i}") for i in range(1, logs.BACKUP_COUNT + 1)]
+    return files == sorted(expected) and all(os.path.getsize(path) <= 4096 for path in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check rate limiting, queued delivery and rotation of the log")
+    parser.add_argument("--records", type=int, default=20000, help="Records to time on the calling thread")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        checks = [("rate limit and summary", check_rate_limit), ("records after finish_logging", check_finish_logging),
+                  ("rotation at MAX_BYTES", check_rotation)]
+        failures = 0
+        print(f"{'check':<30}{'result':>8}")
+        for name, check in checks:
+            passed = check(directory)
+            failures += not passed
+            print(f"{name:<30}{'ok' if passed else 'FAIL':>8}")
+
+        logs.configure_logging("INFO", os.path.join(directory, "timed"))
+        loggers = [logging.getLogger(f"timed.{i}") for i in range(args.records)]
+        start = time.perf_counter()
+        for logger in loggers:
+            logger.info("pointer moved to %d, %d", 10, 20)
+        elapsed = time.perf_counter() - start
+        logs.shutdown_logging()
+        print(f"\n{args.records} records: {elapsed / args.records * 1e6:.1f} us each on the calling thread")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Cursor maintenance benchmark
+Runs the maintenance scheduler against a fake cursor stack that another
+"application" replaces now and then, and compares its checks and reapplies
+with the old 20 ms global_cursor_timer. Then drives NSCursorBackend with a
+stub NSCursor whose currentCursor() is never ours (as when another window is
+key): it must not reapply on every check, only once after invalidate().
+"""
+
+import os
+import sys
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+from custom_cursor_app.maintenance import CursorMaintenance, FakeCursorBackend, NSCursorBackend
+
+
+class StubNSCursor:
+    """NSCursor class stand-in counting the cursors set through it"""
+    sets = 0
+
+    @classmethod
+    def currentCursor(cls):
+        return "another window's cursor"
+
+    @classmethod
+    def hide(cls):
+        pass
+
+    @classmethod
+    def unhide(cls):
+        pass
+
+    def set(self):
+        StubNSCursor.sets += 1
+
+
+def check_ns_cursor_flag():
+    backend = NSCursorBackend(StubNSCursor(), ns_cursor_class=StubNSCursor)
+    maintenance = CursorMaintenance()
+    maintenance.start(backend)
+    for _ in range(5):
+        maintenance.check()
+    quiet = StubNSCursor.sets == 0
+    maintenance.invalidate()
+    maintenance.check()
+    maintenance.stop()
+    return quiet and StubNSCursor.sets == 1 and backend.is_applied()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count cursor maintenance checks and reapplies")
+    parser.add_argument("--seconds", type=float, default=5.0, help="How long to run the scheduler")
+    parser.add_argument("--replace-every", type=float, default=1.5,
+                        help="Seconds between simulated cursor replacements")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    backend = FakeCursorBackend()
+    maintenance = CursorMaintenance()
+    maintenance.start(backend)
+
+    intruder = QTimer()
+    intruder.timeout.connect(backend.replace)
+    intruder.start(int(args.replace_every * 1000))
+    QTimer.singleShot(int(args.seconds * 1000), app.quit)
+    app.exec()
+
+    replacements = int(args.seconds / args.replace_every)
+    old_ticks = int(args.seconds * 1000 / 20)
+    print(f"replacements:        {replacements}")
+    print(f"checks:              {maintenance.checks} (old 20 ms timer: {old_ticks} forced reapplies)")
+    print(f"reapplies:           {maintenance.reapplies}")
+    print(f"reapplies/minute:    {maintenance.reapplies_per_minute()}")
+    print(f"cursor restored:     {backend.is_applied()}")
+    ns_cursor_ok = check_ns_cursor_flag()
+    print(f"NSCursor flag:       {'ok' if ns_cursor_ok else 'FAIL'}")
+    return 0 if backend.reapplies == replacements and ns_cursor_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Frame pacing benchmark
+Drives the overlay's frame pacer with a simulated mouse on the Qt offscreen
+platform, once reporting faster than the display refreshes and once slower,
+and reports moves per second and how long each submitted position waited for
+its move. Exits non-zero if the fast mouse gets more than one move per frame
+or waits longer than a frame on average, or the slow mouse waits at all.
+"""
+
+import os
+import sys
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtWidgets import QApplication
+
+from custom_cursor_app.pacing import FramePacer
+
+
+def drive(app, mouse_hz, seconds):
+    """Feed the pacer at mouse_hz for seconds and return its stats"""
+    pacer = FramePacer()
+    step = [0]
+
+    def feed():
+        step[0] += 1
+        pacer.submit(step[0] % 200, step[0] % 150)
+
+    mouse = QTimer()
+    mouse.setTimerType(Qt.TimerType.PreciseTimer)
+    mouse.timeout.connect(feed)
+    mouse.start(max(1, round(1000 / mouse_hz)))
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    mouse.stop()
+    pacer.stop()
+    return pacer.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure frame-paced overlay moves")
+    parser.add_argument("--seconds", type=float, default=2.0, help="How long to drive the pacer per mouse")
+    parser.add_argument("--mouse-hz", type=int, default=1000, help="Simulated fast mouse report rate")
+    parser.add_argument("--slow-hz", type=int, default=25, help="Simulated mouse slower than the display")
+    parser.add_argument("--max-slow-ms", type=float, default=1.0,
+                        help="Longest mean wait allowed when every report has a frame to itself")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    print(f"{'mouse':<12}{'submits':>9}{'moves/s':>10}{'mean ms':>10}{'max ms':>10}")
+    failures = []
+    for label, hz in ((f"{args.mouse_hz} Hz", args.mouse_hz), (f"{args.slow_hz} Hz", args.slow_hz)):
+        stats = drive(app, hz, args.seconds)
+        print(f"{label:<12}{stats['submits']:>9}{stats['moves_per_second']:>10.1f}"
+              f"{stats['mean_latency_ms']:>10.2f}{stats['max_latency_ms']:>10.2f}")
+        frame_ms = 1000.0 / stats['refresh_rate']
+        if hz == args.mouse_hz:
+            if stats['moves_per_second'] > stats['refresh_rate'] * 1.05:
+                failures.append("more than one move per frame")
+            if stats['mean_latency_ms'] > frame_ms:
+                failures.append(f"fast mouse waited {stats['mean_latency_ms']:.1f} ms on average, over a frame")
+        elif stats['mean_latency_ms'] > args.max_slow_ms:
+            failures.append(f"slow mouse waited {stats['mean_latency_ms']:.1f} ms on average with frames to spare")
+
+    print(f"refresh rate {stats['refresh_rate']:.1f} Hz")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Overlay paint benchmark
+Measures CursorOverlay.paintEvent cost per frame with the pre-rendered pixmap
+cache against the previous per-repaint QPainter setup.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from custom_cursor_app.overlay import CursorOverlay
+
+
+def legacy_paint(target, pixmap):
+    """The paintEvent body before the pixmap cache"""
+    painter = QPainter(target)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    painter.drawPixmap(0, 0, pixmap)
+    painter.end()
+
+
+def cached_paint(target, pixmap):
+    """The paintEvent body with the pre-rendered pixmap"""
+    painter = QPainter(target)
+    painter.drawPixmap(0, 0, pixmap)
+    painter.end()
+
+
+def make_target(size, dpr):
+    target = QImage(round(size * dpr), round(size * dpr), QImage.Format.Format_ARGB32_Premultiplied)
+    target.setDevicePixelRatio(dpr)
+    target.fill(Qt.GlobalColor.transparent)
+    return target
+
+
+def per_frame_us(fn, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure overlay paint cost per frame")
+    parser.add_argument("--frames", type=int, default=5000, help="Frames to paint per case")
+    parser.add_argument("--size", type=int, default=64, help="Cursor size in logical pixels")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    source = QPixmap(args.size, args.size)
+    source.fill(QColor(50, 153, 255, 200))
+
+    overlay = CursorOverlay()
+    overlay.pause()
+    overlay.set_cursor_image(source)
+
+    print(f"{'dpr':<6}{'before (us/frame)':>20}{'after (us/frame)':>20}")
+    for dpr in (1.0, 2.0):
+        target = make_target(args.size, dpr)
+        before = per_frame_us(lambda: legacy_paint(target, source), args.frames)
+        cached = overlay.pixmap_cache.get(source, overlay._image_key, dpr, overlay.scale)
+        after = per_frame_us(lambda: cached_paint(target, cached), args.frames)
+        print(f"{dpr:<6}{before:>20.2f}{after:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
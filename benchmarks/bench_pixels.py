@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Pixel operation benchmark
+Times every operation in pixels.py on cursor-sized and large RGBA images,
+and compares halo cleanup and premultiplication with the same work done per
+pixel in Python. Also reports how much area trimming removes from a padded
+cursor, which is the area the overlay window no longer has to composite.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from custom_cursor_app import pixels
+
+
+def make_cursor(size):
+    """Soft-edged arrow in the top-left third of a padded canvas, with faint noise"""
+    s = size / 256
+    alpha = Image.new('L', (size, size), 0)
+    ImageDraw.Draw(alpha).polygon([(24 * s, 24 * s), (24 * s, 140 * s), (56 * s, 108 * s), (80 * s, 150 * s),
+                                   (96 * s, 142 * s), (74 * s, 100 * s), (116 * s, 100 * s)], fill=255)
+    alpha = alpha.filter(ImageFilter.GaussianBlur(max(1, size / 256)))
+    img = Image.new('RGBA', (size, size), (255, 0, 255, 0))
+    img.paste((40, 140, 240, 255), mask=alpha)
+    img.putalpha(alpha)
+    # Stray near-transparent pixels, as left behind by some editors
+    for i in range(0, size * size, 97):
+        x, y = i % size, i // size
+        if alpha.getpixel((x, y)) == 0:
+            img.putpixel((x, y), (255, 255, 255, 3))
+    return img
+
+
+def python_clean_alpha(img, threshold=pixels.HALO_ALPHA):
+    out = img.copy()
+    access = out.load()
+    for y in range(out.height):
+        for x in range(out.width):
+            if access[x, y][3] <= threshold:
+                access[x, y] = (0, 0, 0, 0)
+    return out
+
+
+def python_premultiply(img):
+    out = img.copy()
+    access = out.load()
+    for y in range(out.height):
+        for x in range(out.width):
+            r, g, b, a = access[x, y]
+            access[x, y] = (r * a // 255, g * a // 255, b * a // 255, a)
+    return out
+
+
+def best_ms(runs, fn, *args, **kwargs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the whole-buffer pixel operations")
+    parser.add_argument("--runs", type=int, default=5, help="Timing runs; the best is reported")
+    parser.add_argument("--sizes", default="256,1024", help="Comma-separated image sizes")
+    args = parser.parse_args()
+    sizes = [int(v) for v in args.sizes.split(',')]
+
+    operations = [
+        ("clean_alpha", lambda img: pixels.clean_alpha(img)),
+        ("premultiply", lambda img: pixels.premultiply(img)),
+        ("unpremultiply", lambda img: pixels.unpremultiply(pixels.premultiply(img))),
+        ("alpha_bbox", lambda img: pixels.alpha_bbox(img)),
+        ("trim", lambda img: pixels.trim(img)),
+        ("outline 2px", lambda img: pixels.outline(img, 2)),
+        ("drop_shadow", lambda img: pixels.drop_shadow(img)),
+        ("tint", lambda img: pixels.tint(img, (255, 80, 80), 0.5)),
+    ]
+    images = {size: make_cursor(size) for size in sizes}
+
+    print(f"{'operation (ms)':<24}" + "".join(f"{f'{size} px':>12}" for size in sizes))
+    for name, fn in operations:
+        print(f"{name:<24}" + "".join(f"{best_ms(args.runs, fn, images[size]):>12.3f}" for size in sizes))
+
+    img = images[sizes[0]]
+    print(f"\n{f'per pixel in Python, {sizes[0]} px':<40}{'python':>10}{'pixels.py':>12}{'speedup':>10}")
+    for name, slow, fast in (("clean_alpha", python_clean_alpha, pixels.clean_alpha),
+                             ("premultiply", python_premultiply, pixels.premultiply)):
+        slow_ms = best_ms(max(1, args.runs // 2), slow, img)
+        fast_ms = best_ms(args.runs, fast, img)
+        print(f"{name:<40}{slow_ms:>10.2f}{fast_ms:>12.3f}{slow_ms / fast_ms:>9.0f}x")
+
+    cleaned = pixels.clean_alpha(img)
+    trimmed, _ = pixels.trim(cleaned)
+    untrimmed, _ = pixels.trim(img)
+    area = img.width * img.height
+    print(f"\ntrim: {img.size} -> {trimmed.size} after halo cleanup "
+          f"({100 * (1 - trimmed.width * trimmed.height / area):.0f}% less overlay area), "
+          f"{untrimmed.size} without it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
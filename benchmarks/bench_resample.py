@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Cursor downscaling benchmark
+Reduces a 4096 px RGBA source with soft alpha edges to every standard
+cursor size, comparing a direct Lanczos resize of the source with each
+resample mode, cold (mip chain built in the timing) and warm (chain reused).
+Also measures edge fringing: the color that leaks out of fully transparent
+pixels into the semi-transparent edge, against a naive per-channel resize
+that ignores alpha. Exits non-zero if a mode fringes or if a cold chain is
+slower than resizing the source directly.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageStat
+
+from custom_cursor_app.curfile import CURSOR_SIZES
+from custom_cursor_app.resample import MODES, MipChain
+
+
+def make_source(size):
+    """White arrow with a blurred alpha edge, over transparent pure red"""
+    alpha = Image.new('L', (size, size), 0)
+    s = size / 256
+    ImageDraw.Draw(alpha).polygon([(8 * s, 8 * s), (8 * s, 220 * s), (70 * s, 160 * s), (120 * s, 248 * s),
+                                   (150 * s, 232 * s), (104 * s, 146 * s), (190 * s, 146 * s)], fill=255)
+    alpha = alpha.filter(ImageFilter.GaussianBlur(size / 128))
+    img = Image.new('RGBA', (size, size), (255, 0, 0, 0))
+    img.paste((255, 255, 255, 255), mask=alpha)
+    img.putalpha(alpha)
+    return img
+
+
+def naive_resize(img, size):
+    # Filter every channel on its own, as if alpha did not weight the colors
+    return Image.merge('RGBA', [band.resize(size, Image.LANCZOS) for band in img.split()])
+
+
+def fringe(img):
+    """Mean red excess (R - G) over the semi-transparent pixels; 0 for a clean white edge"""
+    r, g, _, a = img.split()
+    edge = a.point(lambda v: 255 if 0 < v < 255 else 0)
+    if not edge.getbbox():
+        return 0.0
+    return ImageStat.Stat(ImageChops.subtract(r, g), mask=edge).mean[0]
+
+
+def difference(a, b):
+    """Mean absolute difference of the premultiplied channels"""
+    return sum(ImageStat.Stat(ImageChops.difference(a.convert('RGBa'), b.convert('RGBa'))).mean) / 4
+
+
+def best_of(runs, fn):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare mip-chain resampling with direct resizes")
+    parser.add_argument("--source", type=int, default=4096, help="Source image size in pixels")
+    parser.add_argument("--runs", type=int, default=3, help="Timing runs; the best is reported")
+    parser.add_argument("--max-fringe", type=float, default=1.0, help="Largest allowed fringe for a mode")
+    args = parser.parse_args()
+
+    source = make_source(args.source)
+    sizes = [(size, size) for size in CURSOR_SIZES]
+
+    def direct():
+        return [source.resize(size, Image.LANCZOS) for size in sizes]
+
+    reference = direct()
+    chain = MipChain(source)
+    chain.level_for((1, 1))
+    print(f"{args.source} px source, mip chain {len(chain.levels)} levels, {chain.nbytes / 1e6:.1f} MB")
+
+    print(f"\n{'all sizes (ms)':<24}{'cold':>10}{'warm':>10}")
+    direct_ms = best_of(args.runs, direct)
+    print(f"{'direct lanczos':<24}{direct_ms:>10.1f}{direct_ms:>10.1f}")
+    cold = {}
+    for mode in MODES:
+        cold[mode] = best_of(args.runs, lambda: [MipChain(source).resize(size, mode) for size in sizes])
+        warm = best_of(args.runs, lambda: [chain.resize(size, mode) for size in sizes])
+        print(f"{mode:<24}{cold[mode]:>10.1f}{warm:>10.1f}")
+
+    print(f"\n{'size':<8}{'naive':>10}{'direct':>10}" + "".join(f"{mode:>10}" for mode in MODES)
+          + "".join(f"{'diff ' + mode:>16}" for mode in MODES))
+    worst = 0.0
+    for size, expected in zip(sizes, reference):
+        results = {mode: chain.resize(size, mode) for mode in MODES}
+        worst = max([worst] + [fringe(img) for img in results.values()])
+        print(f"{size[0]:<8}{fringe(naive_resize(source, size)):>10.2f}{fringe(expected):>10.2f}"
+              + "".join(f"{fringe(img):>10.2f}" for img in results.values())
+              + "".join(f"{difference(img, expected):>16.2f}" for img in results.values()))
+    print("\nfringe: mean red bleed in the semi-transparent edge (0-255); diff: mean error against direct lanczos")
+
+    ok = worst <= args.max_fringe and all(ms <= direct_ms for ms in cold.values())
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Screen index benchmark
+Starts the offscreen platform with a six-monitor, mixed-DPR layout and
+compares ScreenIndex.screen_at with QGuiApplication.screenAt, checks that
+both agree everywhere, walks the overlay across every screen to confirm that
+it switches to the pre-scaled pixmap without rendering on the move path, and
+times the slab lookup against a linear scan for larger synthetic layouts.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+# Three monitors across, two rows, at 1x, 1.5x and 2x
+LAYOUT = [
+    (0, 0, 1920, 1080, 1.0), (1920, 0, 2560, 1440, 2.0), (4480, 0, 1920, 1080, 1.5),
+    (0, 1080, 1920, 1080, 1.0), (1920, 1440, 2560, 1440, 2.0), (4480, 1080, 1920, 1200, 1.0),
+]
+
+
+def write_config(path):
+    screens = [{"name": f"screen{i}", "x": x, "y": y, "width": w, "height": h,
+                "logicalDpi": 96, "logicalBaseDpi": 96, "dpr": dpr}
+               for i, (x, y, w, h, dpr) in enumerate(LAYOUT)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"synchronousWindowSystemEvents": False, "windowFrameMargins": False, "screens": screens}, f)
+
+
+def random_points(count, seed=1):
+    rng = random.Random(seed)
+    width = max(x + w for x, _, w, _, _ in LAYOUT)
+    height = max(y + h for _, y, _, h, _ in LAYOUT)
+    return [(rng.randrange(-100, width + 100), rng.randrange(-100, height + 100)) for _ in range(count)]
+
+
+def per_call_us(fn, points):
+    start = time.perf_counter()
+    for x, y in points:
+        fn(x, y)
+    return (time.perf_counter() - start) / len(points) * 1e6
+
+
+def synthetic_grid(columns, rows, size=1000):
+    from custom_cursor_app.screens import ScreenInfo
+    return [ScreenInfo(None, c * size, r * size, size, size, 1.0, 60.0)
+            for r in range(rows) for c in range(columns)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the screen index with QGuiApplication.screenAt")
+    parser.add_argument("--points", type=int, default=100000, help="Lookups per measurement")
+    args = parser.parse_args()
+
+    config = os.path.join(tempfile.mkdtemp(), "screens.json")
+    write_config(config)
+    os.environ["QT_QPA_PLATFORM"] = f"offscreen:configfile={config}"
+
+    from PyQt6.QtCore import QPoint
+    from PyQt6.QtGui import QColor, QGuiApplication, QPixmap
+    from PyQt6.QtWidgets import QApplication
+
+    from custom_cursor_app.overlay import CursorOverlay
+    from custom_cursor_app.screens import build_slabs, find_in_slabs, screen_index
+
+    app = QApplication(sys.argv)
+    index = screen_index()
+    print(f"{len(index.screens)} screens, DPRs {index.dprs()}")
+
+    points = random_points(args.points)
+    mismatches = sum(1 for x, y in points
+                     if (index.screen_at(x, y) or (None,))[0] is not QGuiApplication.screenAt(QPoint(x, y)))
+
+    scattered_index = per_call_us(index.screen_at, points)
+    scattered_qt = per_call_us(lambda x, y: QGuiApplication.screenAt(QPoint(x, y)), points)
+    # A pointer mostly stays on one screen between samples
+    still = [(500 + i % 7, 500) for i in range(args.points)]
+    still_index = per_call_us(index.screen_at, still)
+    still_qt = per_call_us(lambda x, y: QGuiApplication.screenAt(QPoint(x, y)), still)
+
+    print(f"\n{'lookup (us/call)':<28}{'index':>10}{'screenAt':>10}")
+    print(f"{'random points':<28}{scattered_index:>10.2f}{scattered_qt:>10.2f}")
+    print(f"{'pointer on one screen':<28}{still_index:>10.2f}{still_qt:>10.2f}")
+    print(f"disagreements with screenAt: {mismatches}")
+
+    # Walk the overlay through every screen and back
+    overlay = CursorOverlay()
+    overlay.pause()
+    pixmap = QPixmap(48, 48)
+    pixmap.fill(QColor(50, 153, 255, 200))
+    overlay.set_cursor_image(pixmap, 4, 4)
+    prerendered = len(overlay.pixmap_cache)
+    wrong_dpr = 0
+    for x, y, w, h, dpr in LAYOUT + LAYOUT[::-1]:
+        overlay.move_to_pointer(x + w // 2, y + h // 2)
+        overlay.repaint()
+        wrong_dpr += overlay._screen is None or overlay._screen.dpr != dpr
+    visited = len(overlay.pixmap_cache)
+    print(f"\noverlay: {prerendered} pre-rendered pixmaps, {visited} after visiting every screen, "
+          f"{wrong_dpr} screens with the wrong DPR")
+    overlay.hide_overlay()
+
+    print(f"\n{'synthetic grid':<16}{'slabs (us)':>12}{'linear (us)':>12}")
+    for columns, rows in ((3, 2), (8, 8), (16, 16)):
+        screens = synthetic_grid(columns, rows)
+        edges, slabs = build_slabs(screens)
+        grid_points = [(random.randrange(columns * 1000), random.randrange(rows * 1000))
+                       for _ in range(args.points // 10)]
+        slab_us = per_call_us(lambda x, y: find_in_slabs(edges, slabs, x, y), grid_points)
+        linear_us = per_call_us(lambda x, y: next((s for s in screens if s.contains(x, y)), None), grid_points)
+        print(f"{f'{columns}x{rows}':<16}{slab_us:>12.2f}{linear_us:>12.2f}")
+
+    ok = mismatches == 0 and wrong_dpr == 0 and visited == prerendered
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Cursor snapshot check
+Drives CursorSnapshots against the fake cursor system through the same
+transactions the app runs: apply then reset, an apply that fails part way
+(which must roll back), a clean exit (the snapshot is kept without asking
+for recovery, even after a later session that applied nothing crashed) and
+a crash (a child process applies cursors and dies without cleaning up; the
+next launch must find and restore the originals). Then
+times taking and restoring a snapshot. Exits non-zero if any check fails.
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from custom_cursor_app.snapshot import CursorSnapshots, FakeCursorSystem
+
+CUSTOM = {'arrow': 'neon-arrow', 'ibeam': 'neon-ibeam', 'hand': 'neon-hand'}
+
+
+def crash_child(snapshot_path, cursors_path):
+    """Apply custom cursors in this process and exit without any cleanup"""
+    system = FakeCursorSystem(path=cursors_path)
+    CursorSnapshots(snapshot_path).apply(system, lambda: system.apply(CUSTOM))
+    os._exit(1)
+
+
+def check_apply_reset(directory):
+    system = FakeCursorSystem()
+    original = system.capture()
+    snapshots = CursorSnapshots(os.path.join(directory, "apply.json"))
+    snapshots.apply(system, lambda: system.apply(CUSTOM))
+    applied = system.cursors == CUSTOM
+    snapshots.restore(system)
+    return applied and system.cursors == original and not snapshots.active
+
+
+def check_rollback(directory):
+    system = FakeCursorSystem(fail_role='hand')
+    original = system.capture()
+    snapshots = CursorSnapshots(os.path.join(directory, "rollback.json"))
+    try:
+        snapshots.apply(system, lambda: system.apply(CUSTOM))
+    except OSError:
+        pass
+    else:
+        return False
+    return system.cursors == original and system.restores == 1 and not snapshots.active
+
+
+def check_clean_exit(directory):
+    path = os.path.join(directory, "clean.json")
+    system = FakeCursorSystem()
+    original = system.capture()
+    snapshots = CursorSnapshots(path)
+    snapshots.apply(system, lambda: system.apply(CUSTOM))
+    snapshots.mark_clean()
+
+    # The next session must not recover, but can still reset to the originals
+    relaunched = CursorSnapshots(path)
+    if relaunched.needs_recovery():
+        return False
+    relaunched.restore(system)
+    return system.cursors == original and not os.path.exists(path)
+
+
+def check_idle_crash(directory):
+    path = os.path.join(directory, "idle.json")
+    system = FakeCursorSystem()
+    snapshots = CursorSnapshots(path)
+    snapshots.apply(system, lambda: system.apply(CUSTOM))
+    snapshots.mark_clean()
+
+    # A session that applies nothing and then crashes must not make the
+    # next launch revert the cursors kept on purpose
+    CursorSnapshots(path)  # launched, applied nothing, crashed
+    if CursorSnapshots(path).needs_recovery():
+        return False
+    # One that applies before crashing must
+    crashed = CursorSnapshots(path)
+    crashed.apply(system, lambda: system.apply({'arrow': 'other-arrow'}))
+    return CursorSnapshots(path).needs_recovery()
+
+
+def check_crash(directory):
+    snapshot_path = os.path.join(directory, "crash.json")
+    cursors_path = os.path.join(directory, "cursors.json")
+    original = FakeCursorSystem(path=cursors_path).capture()
+    child = subprocess.run([sys.executable, os.path.abspath(__file__), "--crash", snapshot_path, cursors_path])
+    system = FakeCursorSystem(path=cursors_path)
+    if child.returncode == 0 or system.cursors != CUSTOM:
+        return False
+
+    relaunched = CursorSnapshots(snapshot_path)
+    if not relaunched.needs_recovery():
+        return False
+    relaunched.restore(system)
+    return FakeCursorSystem(path=cursors_path).cursors == original and not relaunched.needs_recovery()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cursor snapshot apply, rollback and crash recovery")
+    parser.add_argument("--runs", type=int, default=200, help="Snapshot round trips to time")
+    parser.add_argument("--roles", type=int, default=14, help="Cursor roles in the timed snapshot")
+    parser.add_argument("--crash", nargs=2, metavar=("SNAPSHOT", "CURSORS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.crash:
+        crash_child(*args.crash)
+
+    directory = tempfile.mkdtemp()
+    checks = [("apply then reset", check_apply_reset), ("failed apply rolls back", check_rollback),
+              ("clean exit keeps snapshot", check_clean_exit), ("idle session crash is ignored", check_idle_crash),
+              ("crash is recovered", check_crash)]
+    failures = 0
+    print(f"{'check':<30}{'result':>8}")
+    for name, check in checks:
+        passed = check(directory)
+        failures += not passed
+        print(f"{name:<30}{'ok' if passed else 'FAIL':>8}")
+
+    system = FakeCursorSystem({f"role{i}": f"system-{i}" for i in range(args.roles)})
+    custom = {role: f"custom-{role}" for role in system.cursors}
+    snapshots = CursorSnapshots(os.path.join(directory, "timed.json"))
+    take = restore = 0.0
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        snapshots.apply(system, lambda: system.apply(custom))
+        middle = time.perf_counter()
+        snapshots.restore(system)
+        take += middle - start
+        restore += time.perf_counter() - middle
+    print(f"\n{args.roles} roles: snapshot + apply {take / args.runs * 1000:.3f} ms, "
+          f"restore {restore / args.runs * 1000:.3f} ms")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark and budget check
+Launches fresh interpreters that import the app under -X importtime and show
+the main window, then reports import time, time-to-first-window and the
+slowest imports. With --check it fails when the median exceeds the budget in
+startup_budget.json or when a module that must load lazily (PIL, the
+platform bindings, the overlay) is imported before the window appears.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, '..', 'src')
+BUDGET_PATH = os.path.join(HERE, 'startup_budget.json')
+
+CHILD = r"""
+import json, os, sys, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+import custom_cursor_app.app as app_module
+imported = time.perf_counter()
+app = QApplication(sys.argv)
+window = app_module.CustomCursorApp()
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000.0,
+    "first_window_ms": (shown - start) * 1000.0,
+    "modules": sorted(sys.modules),
+}), flush=True)
+os._exit(0)
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def run_once(home):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=SRC, HOME=home)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD],
+                          capture_output=True, text=True, env=env, timeout=120)
+    wall_ms = (time.perf_counter() - start) * 1000.0
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith("{"):
+            result = json.loads(line)
+    if result is None:
+        raise RuntimeError(f"Startup run failed:\n{proc.stderr[-2000:]}")
+    result["process_ms"] = wall_ms
+    result["imports"] = [(int(cumulative), name) for _, cumulative, indent, name
+                         in _IMPORTTIME.findall(proc.stderr)]
+    return result
+
+
+def load_budget():
+    with open(BUDGET_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app startup and check it against the budget")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter launches")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--check", action="store_true", help="Fail if the startup budget is exceeded")
+    args = parser.parse_args()
+
+    # A scratch home keeps the user's cursor library out of the measurement
+    with tempfile.TemporaryDirectory() as home:
+        runs = [run_once(home) for _ in range(args.runs)]
+
+    medians = {key: statistics.median(run[key] for run in runs)
+               for key in ("import_ms", "first_window_ms", "process_ms")}
+    print(f"{'median over':<24}{args.runs:>6} runs")
+    print(f"{'import app (ms)':<24}{medians['import_ms']:>10.1f}")
+    print(f"{'first window (ms)':<24}{medians['first_window_ms']:>10.1f}")
+    print(f"{'process to window (ms)':<24}{medians['process_ms']:>10.1f}")
+
+    print(f"\nslowest imports (cumulative us, last run)")
+    for cumulative, name in sorted(runs[-1]["imports"], reverse=True)[:args.top]:
+        print(f"  {cumulative:>8}  {name}")
+
+    if not args.check:
+        return 0
+
+    budget = load_budget()
+    failures = []
+    for key in ("import_ms", "first_window_ms"):
+        if medians[key] > budget[key]:
+            failures.append(f"{key} {medians[key]:.1f} ms exceeds budget {budget[key]:.1f} ms")
+    loaded = set(runs[-1]["modules"])
+    for name in budget["lazy_modules"]:
+        if any(module == name or module.startswith(name + ".") for module in loaded):
+            failures.append(f"{name} was imported before the first window")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("\nOK: startup within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
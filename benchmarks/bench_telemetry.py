@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Telemetry overhead benchmark
+Runs each instrumented callback (event filter, tracker poll, pacer frame,
+maintenance check, overlay move and paint, animation step) with telemetry off
+and on, and reports the difference both per call (relative to the
+callback's own cost) and as CPU share at the busiest rate each callback runs
+in the app. Exits with status 1 if enabling telemetry adds more than
+--max-call-overhead percent to any callback, or costs more than
+--max-overhead percent of one core.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import QEvent, QPointF, Qt
+from PyQt6.QtGui import QColor, QMouseEvent, QPixmap
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from custom_cursor_app.events import CursorEventFilter
+from custom_cursor_app.maintenance import CursorMaintenance, FakeCursorBackend
+from custom_cursor_app.overlay import CursorOverlay
+from custom_cursor_app.pacing import FramePacer
+from custom_cursor_app.playback import FrameScheduler
+from custom_cursor_app.telemetry import TELEMETRY
+from custom_cursor_app.tracking import PointerTracker
+
+
+def build_cases(app):
+    """Name, calls per second at the busiest, and a function doing one call"""
+    target = QWidget()
+    maintenance = CursorMaintenance()
+    event_filter = CursorEventFilter(maintenance)
+    maintenance.start(FakeCursorBackend())
+    event = QMouseEvent(QEvent.Type.MouseMove, QPointF(5, 5), QPointF(5, 5), Qt.MouseButton.NoButton,
+                        Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+
+    position = [0]
+
+    def moving_source():
+        position[0] += 1
+        return position[0], 300
+
+    pacer = FramePacer()
+    tracker = PointerTracker(source=moving_source, use_native=False)
+    tracker.moved.connect(pacer.submit)
+
+    overlay = CursorOverlay()
+    overlay.pause()
+    pixmap = QPixmap(32, 32)
+    pixmap.fill(QColor(255, 0, 0, 200))
+    overlay.set_cursor_image(pixmap)
+
+    def move_and_paint():
+        position[0] += 1
+        overlay.move_to_pointer(position[0] % 800, 300)
+        overlay.repaint()
+
+    scheduler = FrameScheduler([10] * 16)
+    scheduler.start()
+
+    def submit_and_flush():
+        position[0] += 1
+        pacer.submit(position[0], 300)
+        pacer.flush()
+
+    cases = [
+        ("event filter", 1000, lambda: app.sendEvent(target, event)),
+        ("tracker poll", 125, tracker.poll),
+        ("pacer frame", 240, submit_and_flush),
+        ("maintenance check", 20, maintenance.check),
+        ("overlay move+paint", 240, move_and_paint),
+        ("animation step", 100, scheduler._advance),
+    ]
+    keep = (target, event_filter, tracker, overlay, scheduler)
+    return cases, keep
+
+
+def per_call_us(fn, calls, repeats):
+    """
+    Best per-call time with telemetry off and on, and the median percentage
+    telemetry adds over back-to-back off/on pairs, so drift and one-off
+    stalls do not land on one side only
+    """
+    offs, ons, added = [], [], []
+    for _ in range(repeats):
+        pair = {}
+        for enabled in (False, True):
+            TELEMETRY.enabled = enabled
+            start = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            pair[enabled] = (time.perf_counter() - start) / calls * 1e6
+        offs.append(pair[False])
+        ons.append(pair[True])
+        added.append((pair[True] - pair[False]) / pair[False] * 100.0)
+    return min(offs), min(ons), max(statistics.median(added), 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the CPU cost of enabling telemetry")
+    parser.add_argument("--calls", type=int, default=5000, help="Calls per measurement")
+    parser.add_argument("--repeats", type=int, default=21, help="Off/on measurement pairs per case")
+    parser.add_argument("--max-overhead", type=float, default=1.0, help="Allowed overhead in percent of one core")
+    parser.add_argument("--max-call-overhead", type=float, default=15.0,
+                        help="Allowed overhead in percent of a callback's own cost")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    cases, keep = build_cases(app)
+
+    print(f"{'callback':<20}{'rate/s':>8}{'off us':>10}{'on us':>10}{'added us':>10}{'call %':>10}{'core %':>10}")
+    total_share = 0.0
+    worst_call = 0.0
+    recorded = {}
+    counted = {}
+    for name, rate, fn in cases:
+        TELEMETRY.enable(True)
+        off, on, call = per_call_us(fn, args.calls, args.repeats)
+        snapshot = TELEMETRY.snapshot()
+        for metric, h in snapshot['histograms'].items():
+            if h['count']:
+                recorded[metric] = h
+        for metric, c in snapshot['counters'].items():
+            if c['count']:
+                counted[metric] = c
+        added = max(on - off, 0.0)
+        share = added * rate / 1e6 * 100.0
+        total_share += share
+        worst_call = max(worst_call, call)
+        print(f"{name:<20}{rate:>8}{off:>10.2f}{on:>10.2f}{added:>10.2f}{call:>9.1f}%{share:>9.4f}%")
+
+    print(f"\ntelemetry overhead: up to {worst_call:.0f}% of a callback (budget {args.max_call_overhead:.0f}%), "
+          f"{total_share:.4f}% of one core at peak rates (budget {args.max_overhead:.1f}%)")
+    print("\nrecorded while enabled:")
+    for metric, h in sorted(recorded.items()):
+        print(f"  {metric:<24}{h['count']:>8} calls  {h['sampled']:>6} timed  mean {h['mean_us']:.1f} us  "
+              f"p99 {h['p99_us']:.0f} us")
+    for metric, c in sorted(counted.items()):
+        print(f"  {metric:<24}{c['count']:>8} events")
+
+    keep[3].hide_overlay()
+    return 1 if total_share > args.max_overhead or worst_call > args.max_call_overhead else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
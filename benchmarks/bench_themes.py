@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Theme apply benchmark
+Builds a zipped theme pack with a distinct 256 px image for every cursor
+role, then times loading and encoding it the way the Windows apply path
+does: cold on one thread, cold on every core, and again once the encoded
+files are cached (switching back to a theme used before). Every encoded
+file is parsed back to check its hotspot. Exits non-zero if the cached
+apply is not at least --min-speedup times faster than the cold one.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import zipfile
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from custom_cursor_app.curfile import parse_cur
+from custom_cursor_app.imaging import ImagePipeline
+from custom_cursor_app import imaging, themes
+
+
+class _InlineJob:
+    key = "theme"
+
+    def report(self, percent):
+        pass
+
+
+def make_pack(directory, size):
+    """Write a theme.json pack with one image per role and zip it"""
+    pack = os.path.join(directory, "pack")
+    os.makedirs(pack)
+    cursors = {}
+    for index, role in enumerate(themes.ROLES):
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        s = size / 32
+        draw.polygon([(2 * s, 2 * s), (2 * s, 26 * s), (9 * s, 20 * s), (14 * s, 30 * s), (26 * s, 14 * s)],
+                     fill=(20 * index % 256, 120, 255 - 15 * index, 255), outline=(255, 255, 255, 255))
+        img.save(os.path.join(pack, f"{role}.png"))
+        # Half the roles rely on the proposed hotspot
+        cursors[role] = {"image": f"{role}.png"} if index % 2 else {"image": f"{role}.png", "hotspot": [3, 4]}
+    with open(os.path.join(pack, themes.MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({"name": "Benchmark", "cursors": cursors}, f)
+
+    archive = os.path.join(directory, "theme.zip")
+    with zipfile.ZipFile(archive, 'w') as z:
+        for name in os.listdir(pack):
+            z.write(os.path.join(pack, name), f"benchmark/{name}")
+    return archive
+
+
+def apply_once(archive, root, threads):
+    start = time.perf_counter()
+    theme = themes.load_theme(archive, root)
+    encode = partial(themes.encode_cursor_file, cache_dir=os.path.join(root, "encoded"))
+    _, paths = themes.encode_theme(_InlineJob(), theme, encode, threads=threads)
+    return (time.perf_counter() - start) * 1000, theme, paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time theme pack encoding, cold and cached")
+    parser.add_argument("--size", type=int, default=256, help="Image size of every role")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="Encoder threads")
+    parser.add_argument("--min-speedup", type=float, default=20.0, help="Required cached/cold speedup")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    archive = make_pack(directory, args.size)
+    print(f"{len(themes.ROLES)} roles at {args.size} px, {args.threads} encoder threads")
+
+    print(f"\n{'apply':<28}{'ms':>10}")
+    timings = {}
+    runs = [("cold, 1 thread", 1)] + ([(f"cold, {args.threads} threads", args.threads)] if args.threads > 1 else [])
+    for name, threads in runs:
+        # A fresh cache and image pipeline, as on first use
+        root = tempfile.mkdtemp(dir=directory)
+        imaging.image_pipeline = ImagePipeline()
+        timings[name], theme, paths = apply_once(archive, root, threads)
+        print(f"{name:<28}{timings[name]:>10.1f}")
+    cached, _, paths = apply_once(archive, root, args.threads)
+    print(f"{'cached (second switch)':<28}{cached:>10.3f}")
+
+    wrong = 0
+    for cursor in theme:
+        with open(paths[cursor.role], 'rb') as f:
+            entries = parse_cur(f.read())
+        largest = entries[-1]
+        expected = themes.cursor_hotspot(cursor)
+        scale = largest.width / args.size
+        if (largest.hotspot_x, largest.hotspot_y) != (round(expected[0] * scale), round(expected[1] * scale)):
+            wrong += 1
+    print(f"\n{len(paths)} cursors encoded, {wrong} with an unexpected hotspot")
+
+    speedup = min(timings.values()) / cached
+    print(f"cached apply is {speedup:.0f}x faster than the fastest cold one")
+    return 0 if wrong == 0 and speedup >= args.min_speedup else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
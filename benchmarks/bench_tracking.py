@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Pointer tracking benchmark
+Replays synthetic pointer traces through PointerTracker on a replay clock,
+headlessly, and compares wakeups against the old fixed 1 ms position timer.
+Native lag is the simulated event-loop dispatch delay (--dispatch-ms).
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from custom_cursor_app.tracking import replay_trace
+
+
+def idle_trace(duration_ms):
+    """Pointer parked in one place"""
+    return [(0, 400, 300)]
+
+
+def continuous_trace(duration_ms, step_ms=8):
+    """Pointer moving diagonally for the whole run"""
+    return [(t, t // step_ms, t // step_ms) for t in range(0, duration_ms, step_ms)]
+
+
+def bursty_trace(duration_ms, burst_ms=500, pause_ms=4500, step_ms=8):
+    """Short bursts of motion separated by long idle pauses"""
+    trace = []
+    x = 0
+    for start in range(0, duration_ms, burst_ms + pause_ms):
+        for t in range(start, min(start + burst_ms, duration_ms), step_ms):
+            x += 1
+            trace.append((t, x, 200))
+    return trace
+
+
+TRACES = {
+    'idle': idle_trace,
+    'continuous': continuous_trace,
+    'bursty': bursty_trace,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count tracker wakeups for synthetic pointer traces")
+    parser.add_argument("--seconds", type=int, default=60, help="Length of each trace in seconds")
+    parser.add_argument("--dispatch-ms", type=int, default=1, help="Time for a zero-delay timer to come round the event loop")
+    args = parser.parse_args()
+
+    duration_ms = args.seconds * 1000
+    baseline = duration_ms + 1  # Old position_timer fired every millisecond
+
+    print(f"{'trace':<12}{'mode':<10}{'wakeups':>10}{'moves':>10}{'vs 1ms':>10}{'max lag':>10}")
+    for name, build in TRACES.items():
+        trace = build(duration_ms)
+        for native in (False, True):
+            stats = replay_trace(trace, duration_ms, native=native, dispatch_ms=args.dispatch_ms)
+            mode = 'native' if native else 'polling'
+            ratio = stats.wakeups / baseline
+            print(f"{name:<12}{mode:<10}{stats.wakeups:>10}{stats.moves:>10}{ratio:>9.1%}{stats.max_lag_ms:>8}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare two pytest-benchmark JSON files
+Prints the change of every benchmark against the baseline and exits with
+status 1 if any got slower than the threshold. The minimum is compared by
+default since it is the least sensitive to scheduler noise. --update makes
+the current run the new baseline, without the raw per-round timings.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, 'baselines', 'linux-offscreen.json')
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load(path):
+    return {bench['fullname']: bench['stats'] for bench in read(path)['benchmarks']}
+
+
+def update_baseline(current_path, baseline_path):
+    """Copy a run to the baseline, dropping the raw timings to keep it small"""
+    data = read(current_path)
+    for bench in data['benchmarks']:
+        bench['stats'].pop('data', None)
+    with open(baseline_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a baseline")
+    parser.add_argument("current", help="JSON written by pytest --benchmark-json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Allowed slowdown in percent")
+    parser.add_argument("--stat", default="min", choices=("min", "median", "mean"), help="Statistic to compare")
+    parser.add_argument("--update", action="store_true", help="Replace the baseline with the current run")
+    args = parser.parse_args()
+
+    if args.update:
+        update_baseline(args.current, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load(args.baseline)
+    current = load(args.current)
+
+    regressions = []
+    print(f"{'benchmark':<60}{'baseline us':>14}{'current us':>14}{'change':>10}")
+    for name in sorted(current):
+        now = current[name][args.stat] * 1e6
+        if name not in baseline:
+            print(f"{name:<60}{'-':>14}{now:>14.2f}{'new':>10}")
+            continue
+        before = baseline[name][args.stat] * 1e6
+        change = (now - before) / before * 100.0
+        flag = "  REGRESSION" if change > args.threshold else ""
+        print(f"{name:<60}{before:>14.2f}{now:>14.2f}{change:>+9.1f}%{flag}")
+        if flag:
+            regressions.append(name)
+    for name in sorted(set(baseline) - set(current)):
+        print(f"{name:<60}{'missing from current run':>38}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0f}%")
+        return 1
+    print(f"\nOK: no regressions above {args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
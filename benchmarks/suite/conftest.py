@@ -0,0 +1,50 @@
+"""
+Shared fixtures for the benchmark suite
+Everything runs on Qt's offscreen platform, so the suite works on a headless
+Linux machine.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+
+import pytest
+from PyQt6.QtGui import QColor, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    yield app
+
+
+@pytest.fixture(scope="session")
+def cursor_png(tmp_path_factory):
+    """A 256 px RGBA cursor with soft edges and a fully transparent border"""
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGBA', (256, 256), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.polygon([(8, 8), (8, 220), (70, 160), (120, 248), (150, 232), (104, 146), (190, 146)],
+                 fill=(30, 120, 230, 220), outline=(255, 255, 255, 255))
+    path = tmp_path_factory.mktemp("images") / "cursor.png"
+    img.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def overlay(qapp):
+    """A visible cursor overlay showing a 64 px pixmap, not following the pointer"""
+    from custom_cursor_app.overlay import CursorOverlay
+
+    overlay = CursorOverlay()
+    overlay.pause()
+    pixmap = QPixmap(64, 64)
+    pixmap.fill(QColor(50, 153, 255, 200))
+    overlay.set_cursor_image(pixmap, 4, 4)
+    yield overlay
+    overlay.hide_overlay()
+    overlay.deleteLater()
@@ -0,0 +1,69 @@
+"""
+Overlay and event dispatch benchmarks
+"""
+
+from PyQt6.QtCore import QEvent, QPointF, Qt, QTimerEvent
+from PyQt6.QtGui import QImage, QMouseEvent
+from PyQt6.QtWidgets import QWidget
+
+from custom_cursor_app.events import CursorEventFilter
+from custom_cursor_app.maintenance import CursorMaintenance, FakeCursorBackend
+
+# Mostly uninteresting traffic with some pointer and activation events mixed in
+EVENT_MIX = [
+    QEvent.Type.Timer, QEvent.Type.UpdateRequest, QEvent.Type.LayoutRequest, QEvent.Type.User,
+    QEvent.Type.Timer, QEvent.Type.UpdateRequest, QEvent.Type.MouseMove, QEvent.Type.HoverMove,
+    QEvent.Type.Timer, QEvent.Type.WindowActivate,
+]
+
+
+def make_event(kind):
+    if kind == QEvent.Type.MouseMove:
+        return QMouseEvent(kind, QPointF(5, 5), QPointF(5, 5), Qt.MouseButton.NoButton,
+                           Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+    if kind == QEvent.Type.Timer:
+        return QTimerEvent(0)
+    return QEvent(kind)
+
+
+def bench_paint_event(benchmark, overlay):
+    """One CursorOverlay.paintEvent, rendered into an offscreen image"""
+    target = QImage(overlay.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    target.fill(Qt.GlobalColor.transparent)
+    benchmark(overlay.render, target)
+
+
+def bench_update_position(benchmark, overlay):
+    """Pointer query plus overlay move, as done on every paced frame"""
+    benchmark(overlay.update_position)
+
+
+def bench_move_to_pointer(benchmark, overlay):
+    """Overlay move to alternating positions, so Qt cannot skip it"""
+    positions = [(100, 100), (101, 100)]
+    state = [0]
+
+    def move():
+        state[0] ^= 1
+        overlay.move_to_pointer(*positions[state[0]])
+
+    benchmark(move)
+
+
+def bench_event_filter_dispatch(benchmark, qapp):
+    """A mix of ten events through the installed application-wide filter"""
+    maintenance = CursorMaintenance()
+    event_filter = CursorEventFilter(maintenance)
+    maintenance.start(FakeCursorBackend())
+    target = QWidget()
+    events = [make_event(kind) for kind in EVENT_MIX]
+
+    def dispatch():
+        for event in events:
+            qapp.sendEvent(target, event)
+
+    try:
+        assert event_filter.installed
+        benchmark(dispatch)
+    finally:
+        maintenance.stop()
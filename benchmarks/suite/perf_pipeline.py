@@ -0,0 +1,40 @@
+"""
+Cursor pipeline benchmarks: PNG decode/normalize and .cur encoding
+"""
+
+import pytest
+from PIL import Image
+
+from custom_cursor_app.curfile import CURSOR_SIZES, encode_cur, write_cur
+from custom_cursor_app.imaging import ImagePipeline
+
+
+def bench_decode_normalize(benchmark, cursor_png):
+    """Cold decode of a PNG into RGBA, hashing included"""
+    def decode():
+        return ImagePipeline().load(cursor_png)
+
+    img = benchmark(decode)
+    assert img.mode == 'RGBA'
+
+
+def bench_decode_cached(benchmark, cursor_png):
+    """Repeat load of an unchanged file, served from the content cache"""
+    pipeline = ImagePipeline()
+    pipeline.load(cursor_png)
+    benchmark(pipeline.load, cursor_png)
+
+
+@pytest.mark.parametrize("size", CURSOR_SIZES)
+def bench_encode_cur_size(benchmark, cursor_png, size):
+    """One .cur entry at each standard size (DIB below 128 px, PNG above)"""
+    img = Image.open(cursor_png).convert('RGBA')
+    data = benchmark(encode_cur, img, (8, 8), [size])
+    assert data[:4] == b'\x00\x00\x02\x00'
+
+
+def bench_write_cur(benchmark, cursor_png, tmp_path):
+    """write_cur with every size the source supports, as the Windows backend saves cursors"""
+    img = Image.open(cursor_png).convert('RGBA')
+    path = str(tmp_path / "cursor.cur")
+    benchmark(write_cur, path, img, (8, 8))
@@ -10,8 +10,12 @@ import platform
 import subprocess
 import shutil
 import argparse
+import json
 from pathlib import Path
 
+# Must match LOCATOR_NAME in src/main.py
+LOCATOR_NAME = "app_locator.json"
+
 def create_default_icon():
     """Create a default icon for the application if none exists"""
     from PIL import Image, ImageDraw
@@ -104,6 +108,23 @@ def create_default_icon():
     
     return str(icon_path)
 
+def write_locator(locator_dir="build/locator"):
+    """
+    Write the locator manifest main.py reads to import the app without searching.
+    The bundle places the custom_cursor_app package next to the locator.
+    """
+    os.makedirs(locator_dir, exist_ok=True)
+    locator_path = os.path.join(locator_dir, LOCATOR_NAME)
+    with open(locator_path, "w") as f:
+        json.dump({
+            "version": 1,
+            "path": ".",
+            "module": "custom_cursor_app.app",
+            "entry": "run_app",
+        }, f, indent=2)
+    print(f"Wrote app locator: {locator_path}")
+    return locator_path
+
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Build Custom Cursor App executable")
@@ -375,11 +396,15 @@ def main():
     # Add data files
     build_cmd.extend(["--add-data", f"README.md:."])
     
+    # Locator manifest so main.py can import the app in O(1) inside the bundle
+    build_cmd.extend(["--add-data", f"{write_locator()}:."])
+    
     # Add additional PyInstaller options to help with module imports
     build_cmd.extend([
         "--runtime-hook", "runtime_hook.py",
         "--hidden-import=custom_cursor_app",
         "--hidden-import=custom_cursor_app.app",
+        "--hidden-import=custom_cursor_app.overlay",
         "--hidden-import=struct",
         "--hidden-import=_struct",
         "--hidden-import=importlib",
@@ -414,10 +439,14 @@ if getattr(sys, 'frozen', False):
     # Platform-specific options with more aggressive optimizations
     if system == "Windows":
         print("Building for Windows...")
+        # The backend is loaded on demand with importlib, so PyInstaller can't see it
+        build_cmd.append("--hidden-import=custom_cursor_app.backends.windows")
         # Add Windows-specific options
         build_cmd.extend(["--add-binary", "venv/Lib/site-packages/PyQt6/Qt6/bin/*:PyQt6/Qt6/bin/"])
     elif system == "Darwin":  # macOS
         print("Building for macOS...")
+        # The backend is loaded on demand with importlib, so PyInstaller can't see it
+        build_cmd.append("--hidden-import=custom_cursor_app.backends.macos")
         # Add macOS-specific options - preserve Qt frameworks for PyQt6 6.5+
         build_cmd.extend([
             # Use the --collect-all option to properly collect Qt frameworks
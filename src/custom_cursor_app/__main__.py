@@ -1,9 +1,33 @@
 #!/usr/bin/env python3
 """
 Entry point for the Custom Cursor App
+`python -m custom_cursor_app convert ...` runs the headless converter instead
+of the GUI.
 """
 
-from .app import run_app
+import argparse
+import sys
 
-if __name__ == "__main__":
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "convert":
+        # The converter never imports Qt, so it works without a display
+        from .cli import main as cli_main
+        return cli_main(argv)
+
+    # --log-level is ours; everything else is left for Qt
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--log-level")
+    args, rest = parser.parse_known_args(argv)
+    sys.argv[1:] = rest
+
+    from .logs import configure_logging
+    configure_logging(args.log_level, console=True)
+
+    from .app import run_app
     run_app()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
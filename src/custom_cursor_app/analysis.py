@@ -0,0 +1,214 @@
+"""
+Cursor image analysis: the tight alpha box and a proposed hotspot.
+A hotspot stored in the file (a PNG text chunk such as "hotspot: 3,4" or
+xhot/yhot, as written by cursor editors and xcursorgen configs) wins;
+otherwise shapes that look the same turned half way round (crosshairs,
+rings) get their center, others the sharpest corner of their convex hull,
+which is the tip of arrow-like cursors, or the topmost pixel when there is
+no sharp corner (hands). The hull is built from each row's leftmost and
+rightmost opaque pixel, found with bounding-box calls in C, so only a few
+hundred points are handled in Python.
+"""
+
+import math
+import struct
+from collections import namedtuple
+
+from PIL import Image, ImageChops
+
+from .pixels import alpha_channel, bbox
+
+# Larger images are analyzed at a reduced size
+ANALYSIS_SIZE = 256
+# Corners at most this sharp (in degrees) count as a tip
+TIP_MAX_ANGLE = 100.0
+# Alpha above which a pixel counts as part of the shape
+SHAPE_ALPHA = 128
+# Share of the shape that must survive a half turn for it to count as symmetric
+SYMMETRY = 0.9
+
+HOTSPOT_METADATA = 'metadata'
+HOTSPOT_TIP = 'tip'
+HOTSPOT_TOP = 'top'
+HOTSPOT_CENTER = 'center'
+
+CursorAnalysis = namedtuple("CursorAnalysis", ["box", "hotspot", "source"])
+
+_HOTSPOT_KEYS = (('xhot', 'yhot'), ('hotspot_x', 'hotspot_y'), ('hotspotx', 'hotspoty'), ('hot_x', 'hot_y'))
+
+
+def _parse_point(value):
+    parts = value.replace(',', ' ').split()
+    if len(parts) != 2:
+        return None
+    try:
+        return int(float(parts[0])), int(float(parts[1]))
+    except ValueError:
+        return None
+
+
+def hotspot_from_metadata(info):
+    """Return the (x, y) hotspot stored in an image's text chunks (img.info / img.text), or None"""
+    text = {str(k).strip().lower(): str(v).strip() for k, v in info.items() if isinstance(v, (str, bytes))}
+    if 'hotspot' in text:
+        point = _parse_point(text['hotspot'])
+        if point is not None:
+            return point
+    for x_key, y_key in _HOTSPOT_KEYS:
+        if x_key in text and y_key in text:
+            point = _parse_point(f"{text[x_key]} {text[y_key]}")
+            if point is not None:
+                return point
+    return None
+
+
+def _png_text(f):
+    # Text chunks of a PNG opened at its first chunk, stepping over the image
+    # data instead of decoding it the way img.text does
+    from PIL import PngImagePlugin
+
+    png = PngImagePlugin.PngStream(f)
+    while True:
+        cid, pos, length = png.read()
+        if cid == b'IEND':
+            return png.im_text
+        if cid in (b'tEXt', b'zTXt', b'iTXt'):
+            png.call(cid, pos, length)
+        f.seek(pos + length + 4)
+
+
+def read_hotspot_metadata(path):
+    """Read a stored hotspot from the file at path, or None"""
+    try:
+        with Image.open(path) as img:
+            info = dict(img.info)
+            is_png = img.format == 'PNG'
+        if is_png:
+            # Text chunks after the image data are not in img.info
+            with open(path, 'rb') as f:
+                f.seek(8)
+                info.update(_png_text(f))
+    except (OSError, SyntaxError, ValueError, struct.error):
+        return None
+    return hotspot_from_metadata(info)
+
+
+def _outline_points(mask):
+    # Leftmost and rightmost set pixel of every row
+    points = []
+    width = mask.width
+    for y in range(mask.height):
+        box = mask.crop((0, y, width, y + 1)).getbbox()
+        if box is not None:
+            points.append((box[0], y))
+            if box[2] - 1 != box[0]:
+                points.append((box[2] - 1, y))
+    return points
+
+
+def _convex_hull(points):
+    # Andrew's monotone chain, counter-clockwise in image coordinates
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def _neighbor(hull, index, step, reach):
+    # First hull vertex at least reach away from hull[index], walking by step
+    origin = hull[index]
+    for i in range(1, len(hull)):
+        point = hull[(index + step * i) % len(hull)]
+        if math.dist(origin, point) >= reach:
+            return point
+    return hull[(index + step) % len(hull)]
+
+
+def is_symmetric(mask, threshold=SYMMETRY):
+    """True if most of a cropped binary mask is still set after turning it by 180 degrees"""
+    total = mask.histogram()[255]
+    kept = ImageChops.multiply(mask, mask.rotate(180)).histogram()[255]
+    return total > 0 and kept >= threshold * total
+
+
+def find_tip(mask):
+    """
+    Return ((x, y), angle) for the sharpest convex hull corner of a binary
+    mask, or None if the mask is empty. Corners are measured against hull
+    points a tenth of the shape's size away, so pixel steps are ignored.
+    """
+    hull = _convex_hull(_outline_points(mask))
+    if not hull:
+        return None
+    if len(hull) < 3:
+        return hull[0], 0.0
+    box = mask.getbbox()
+    reach = max(2.0, 0.1 * max(box[2] - box[0], box[3] - box[1]))
+    best = None
+    for index, point in enumerate(hull):
+        before = _neighbor(hull, index, -1, reach)
+        after = _neighbor(hull, index, 1, reach)
+        a = math.atan2(before[1] - point[1], before[0] - point[0])
+        b = math.atan2(after[1] - point[1], after[0] - point[0])
+        angle = abs(math.degrees(a - b)) % 360
+        angle = min(angle, 360 - angle)
+        # Ties go to the corner nearest the top-left, where cursor tips usually are
+        key = (round(angle, 1), point[0] + point[1])
+        if best is None or key < best[0]:
+            best = key, point, angle
+    return best[1], best[2]
+
+
+def analyze(img, path=None):
+    """
+    Analyze an RGBA cursor image. Returns CursorAnalysis(box, hotspot,
+    source) where box is the tight alpha box (None for a blank image) and
+    source says where the hotspot came from.
+    """
+    alpha = alpha_channel(img)
+    box = bbox(alpha)
+    stored = read_hotspot_metadata(path) if path is not None else None
+    if stored is None:
+        stored = hotspot_from_metadata(img.info)
+    if stored is not None and 0 <= stored[0] < img.width and 0 <= stored[1] < img.height:
+        return CursorAnalysis(box, stored, HOTSPOT_METADATA)
+    if box is None:
+        return CursorAnalysis(None, (0, 0), HOTSPOT_TOP)
+
+    # Work on the shape's box, reduced to at most ANALYSIS_SIZE
+    factor = max(1, math.ceil(max(box[2] - box[0], box[3] - box[1]) / ANALYSIS_SIZE))
+    shape = alpha.crop(box)
+    if factor > 1:
+        shape = shape.reduce(factor)
+    mask = shape.point([255 if a > SHAPE_ALPHA else 0 for a in range(256)])
+    if mask.getbbox() is None:
+        # Only faint pixels: fall back to the full alpha
+        mask = shape.point([255 if a else 0 for a in range(256)])
+
+    tip = None if is_symmetric(mask) else find_tip(mask)
+    if tip is None:
+        x, y, source = (mask.width - 1) // 2, (mask.height - 1) // 2, HOTSPOT_CENTER
+    elif tip[1] <= TIP_MAX_ANGLE:
+        (x, y), source = tip[0], HOTSPOT_TIP
+    else:
+        # The middle of the topmost row, e.g. a fingertip
+        y = mask.getbbox()[1]
+        left, _, right, _ = mask.crop((0, y, mask.width, y + 1)).getbbox()
+        x, source = (left + right - 1) // 2, HOTSPOT_TOP
+    # Back to source pixels, at the center of the reduced pixel
+    x = min(box[0] + x * factor + factor // 2, box[2] - 1)
+    y = min(box[1] + y * factor + factor // 2, box[3] - 1)
+    return CursorAnalysis(box, (x, y), source)
@@ -0,0 +1,135 @@
+"""
+Animated cursor loading and Windows .ani encoding.
+Frames come from APNG/GIF files or sprite sheets, are decoded up front, and
+are deduplicated into a compact atlas for playback.
+"""
+
+import hashlib
+import math
+import struct
+
+from PIL import Image, ImageSequence
+
+from .curfile import encode_cur
+from .pixels import clean_alpha
+
+DEFAULT_FRAME_MS = 100
+# .ani display rates are in jiffies (1/60 s)
+JIFFY_MS = 1000.0 / 60.0
+
+ANI_FLAG_ICON = 0x1
+ANI_FLAG_SEQUENCE = 0x2
+
+
+class AnimatedCursor:
+    """Decoded animation frames (RGBA, all the same size) and their durations"""
+    def __init__(self, frames, durations, hotspot=(0, 0)):
+        if not frames:
+            raise ValueError("An animation needs at least one frame")
+        if len(frames) != len(durations):
+            raise ValueError("Every frame needs a duration")
+        self.frames = frames
+        self.durations = [max(1, int(d)) for d in durations]
+        self.hotspot = hotspot
+
+    @property
+    def size(self):
+        return self.frames[0].size
+
+    def __len__(self):
+        return len(self.frames)
+
+
+def is_animated(path):
+    """Return True if the file at path holds more than one frame"""
+    with Image.open(path) as img:
+        return getattr(img, 'n_frames', 1) > 1
+
+
+def load_animation(path, sprite=None, frame_ms=DEFAULT_FRAME_MS):
+    """
+    Load an animated cursor from an APNG/GIF file or a sprite sheet.
+    sprite is an optional (frame_width, frame_height) that slices the image
+    into frames row by row; frame_ms is used when no durations are stored.
+    """
+    with Image.open(path) as img:
+        if sprite is not None:
+            sheet = clean_alpha(img)
+            frame_width, frame_height = sprite
+            frames = [
+                sheet.crop((x, y, x + frame_width, y + frame_height))
+                for y in range(0, sheet.height - frame_height + 1, frame_height)
+                for x in range(0, sheet.width - frame_width + 1, frame_width)
+            ]
+            return AnimatedCursor(frames, [frame_ms] * len(frames))
+
+        frames = []
+        durations = []
+        for frame in ImageSequence.Iterator(img):
+            frames.append(clean_alpha(frame))
+            durations.append(frame.info.get('duration') or frame_ms)
+    return AnimatedCursor(frames, durations)
+
+
+def build_atlas(frames):
+    """
+    Pack frames into one near-square atlas image, storing duplicates once.
+    Returns (atlas, rects, sequence) where rects are (x, y, w, h) per unique
+    frame and sequence maps each animation step to its rect index.
+    """
+    width, height = frames[0].size
+    unique = {}
+    sequence = []
+    for frame in frames:
+        digest = hashlib.blake2b(frame.tobytes(), digest_size=16).digest()
+        sequence.append(unique.setdefault(digest, len(unique)))
+
+    columns = math.ceil(math.sqrt(len(unique)))
+    rows = math.ceil(len(unique) / columns)
+    atlas = Image.new('RGBA', (columns * width, rows * height), (0, 0, 0, 0))
+    rects = []
+    placed = set()
+    for frame, index in zip(frames, sequence):
+        if index in placed:
+            continue
+        placed.add(index)
+        x, y = (index % columns) * width, (index // columns) * height
+        atlas.paste(frame, (x, y))
+        rects.append((x, y, width, height))
+    return atlas, rects, sequence
+
+
+def _chunk(tag, data):
+    # RIFF chunks are padded to an even length
+    return tag + struct.pack('<I', len(data)) + data + (b'\0' if len(data) % 2 else b'')
+
+
+def encode_ani(animation, hotspot=None, sizes=None, resize=None):
+    """Encode an AnimatedCursor as a Windows .ani file and return the bytes"""
+    hotspot = hotspot if hotspot is not None else animation.hotspot
+    _, rects, sequence = build_atlas(animation.frames)
+
+    # Encode each unique frame once as a multi-resolution cursor
+    icons = [None] * len(rects)
+    for frame, index in zip(animation.frames, sequence):
+        if icons[index] is None:
+            icons[index] = encode_cur(frame, hotspot, sizes, resize)
+
+    rates = [max(1, round(d / JIFFY_MS)) for d in animation.durations]
+    steps = len(sequence)
+    flags = ANI_FLAG_ICON | ANI_FLAG_SEQUENCE
+    anih = struct.pack('<9I', 36, len(icons), steps, 0, 0, 0, 0, rates[0], flags)
+
+    body = b'ACON' + _chunk(b'anih', anih)
+    body += _chunk(b'rate', struct.pack(f'<{steps}I', *rates))
+    body += _chunk(b'seq ', struct.pack(f'<{steps}I', *sequence))
+    body += _chunk(b'LIST', b'fram' + b''.join(_chunk(b'icon', icon) for icon in icons))
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def write_ani(path, animation, hotspot=None, sizes=None, resize=None):
+    """Encode an AnimatedCursor as a .ani file at path"""
+    data = encode_ani(animation, hotspot, sizes, resize)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
@@ -4,101 +4,68 @@ Custom Cursor App - Main Application
 A cross-platform application that allows users to upload PNG files and use them as custom cursors.
 """
 
+import logging
 import os
 import sys
-import io
-import platform
-from pathlib import Path
-from PIL import Image
+from collections import namedtuple
+
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QLabel, QPushButton, 
                             QVBoxLayout, QHBoxLayout, QWidget, QFileDialog, 
-                            QMessageBox, QSpinBox, QGroupBox, QFormLayout)
-from PyQt6.QtGui import QPixmap, QIcon, QImage, QCursor, QGuiApplication, QPainter, QColor
-from PyQt6.QtCore import Qt, QSize, QBuffer, QIODevice, QEvent, QObject, QTimer, QPoint
+                            QMessageBox, QSpinBox, QGroupBox, QTabWidget)
+from PyQt6.QtGui import QKeySequence, QPixmap, QShortcut
+from PyQt6.QtCore import Qt, QTimer
 
-# Platform-specific imports
-if platform.system() == 'Windows':
-    import win32api
-    import win32con
-    import win32gui
-    import ctypes
-    from ctypes import wintypes
-elif platform.system() == 'Darwin':  # macOS
-    from PyQt6.QtCore import QByteArray
-    try:
-        from Cocoa import NSCursor, NSImage, NSData, NSBitmapImageRep, NSPoint
-    except ImportError:
-        print("Error: pyobjc-framework-Cocoa is required for macOS. Install with: pip install pyobjc-framework-Cocoa")
-        sys.exit(1)
+from .backends import CURRENT_OS, is_supported, load_backend
+from .events import CursorEventFilter
+from .gallery import CursorGalleryView, CursorListView, CursorPackModel, EntryRole, LibraryModel, PathRole
+from .jobs import JobRunner
+from .library import CursorLibrary
+from .lifecycle import CursorLifecycle
+from .maintenance import CursorMaintenance, NSCursorBackend, QtOverrideCursorBackend
+from .snapshot import CursorSnapshots
+from .telemetry import TELEMETRY, install_dump_signal, take_telemetry_flag
 
+logger = logging.getLogger(__name__)
 
-class CursorOverlay(QWidget):
-    """A borderless, transparent window that follows the mouse cursor to create a system-wide custom cursor effect"""
-    def __init__(self):
-        super().__init__()
-        # Create a borderless, transparent window that stays on top of everything
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | 
-                           Qt.WindowType.Tool | 
-                           Qt.WindowType.WindowStaysOnTopHint | 
-                           Qt.WindowType.WindowTransparentForInput | 
-                           Qt.WindowType.NoDropShadowWindowHint)
-        
-        # Make sure the window is completely transparent
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
-        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
-        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
-        
-        # Set initial size
-        self.resize(32, 32)
-        
-        # Initialize variables
-        self.cursor_pixmap = None
-        self.hotspot_x = 0
-        self.hotspot_y = 0
-        
-        # Hide the actual system cursor when over our window
-        self.setCursor(Qt.CursorShape.BlankCursor)
-        
-        # Create a timer to update the overlay position
-        self.position_timer = QTimer(self)
-        self.position_timer.timeout.connect(self.update_position)
-        self.position_timer.start(1)  # Update extremely frequently for smooth movement
-    
-    def set_cursor_image(self, pixmap, hotspot_x=0, hotspot_y=0):
-        """Set the cursor image and hotspot"""
-        self.cursor_pixmap = pixmap
-        self.hotspot_x = hotspot_x
-        self.hotspot_y = hotspot_y
-        self.resize(pixmap.width(), pixmap.height())
-        self.show()
-        self.update()
-    
-    def update_position(self):
-        """Update the overlay position to follow the mouse cursor"""
-        if self.cursor_pixmap:
-            cursor_pos = QCursor.pos()
-            # Adjust position by hotspot
-            self.move(cursor_pos.x() - self.hotspot_x, cursor_pos.y() - self.hotspot_y)
-            
-            # Ensure we're always on top and visible
-            if not self.isVisible():
-                self.show()
-                self.raise_()
-    
-    def paintEvent(self, event):
-        """Draw the cursor image"""
-        if self.cursor_pixmap:
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-            painter.drawPixmap(0, 0, self.cursor_pixmap)
-            painter.end()
-    
-    def hide_overlay(self):
-        """Hide the cursor overlay"""
-        self.hide()
-        self.cursor_pixmap = None
+# PIL, the image modules, the overlay and the platform backends are imported
+# on first use so that nothing but Qt is loaded before the window appears
+
+LoadedImage = namedtuple("LoadedImage", ["path", "animation", "preview", "size", "hotspot", "hotspot_source",
+                                         "entry", "pending"])
+
+
+def prepare_image_job(job, image_path, hotspot=None, entry=None, library=None):
+    """
+    Decode an image for the preview and the apply paths (runs on a worker thread).
+    Without a hotspot, one is proposed from the file's metadata or the shape.
+    With a library, the image is also stored and its index record prepared.
+    """
+    from .analysis import analyze
+    from .animation import is_animated, load_animation
+    from .bridge import pil_to_qimage
+    from .imaging import image_pipeline
+    
+    # Animated images are decoded up front, every frame at once
+    animation = load_animation(image_path) if is_animated(image_path) else None
+    job.report(25)
+    
+    # Decode through the shared pipeline; the apply paths reuse the same decoded image
+    source = image_pipeline.load(image_path)
+    job.report(50)
+    
+    hotspot_source = None
+    if hotspot is None:
+        frame = animation.frames[0] if animation is not None else source
+        _, hotspot, hotspot_source = analyze(frame, image_path)
+    job.report(60)
+    
+    # Scaled down to fit the preview; a QImage (unlike a QPixmap) may be built off the GUI thread
+    preview = pil_to_qimage(image_pipeline.fitted(image_path, 200))
+    job.report(80)
+    
+    pending = library.prepare(image_path, hotspot) if library is not None else None
+    job.report(100)
+    return LoadedImage(image_path, animation, preview, source.size, hotspot, hotspot_source, entry, pending)
 
 
 class CustomCursorApp(QMainWindow):
@@ -113,32 +80,90 @@ class CustomCursorApp(QMainWindow):
         QApplication.setOrganizationDomain("customcursorapp.com")      
         # Initialize variables
         self.current_image_path = None
+        self.current_animation = None
+        self.current_entry = None
+        
+        # Persistent library of every cursor the user has loaded
+        self.cursor_library = CursorLibrary()
         self.hotspot_x = 0
         self.hotspot_y = 0
         self.custom_cursor = None
-        self.original_cursors = {}
+        self.ns_cursor = None
+        
+        # Snapshot of the system cursors taken before the first apply; one left
+        # behind by a crashed session is restored as soon as the window is up.
+        # A snapshot kept from a clean exit stays clean until this session applies
+        self.snapshots = CursorSnapshots()
+        if self.snapshots.needs_recovery() and is_supported(CURRENT_OS):
+            QTimer.singleShot(0, self.recover_cursors)
         
-        # Create cursor overlay for system-wide cursor
-        self.cursor_overlay = CursorOverlay()
+        # Platform backend and cursor overlay, created on first use
+        self._backend = None
+        self._cursor_overlay = None
+
+        # Single scheduler that reapplies the cursor when something replaces it,
+        # fed by an application-wide event filter installed only while it is active
+        self.maintenance = CursorMaintenance(self)
+        self.event_filter = CursorEventFilter(self.maintenance, self)
+        
+        # Cursor timers only run while a cursor is applied and the user is present
+        self.lifecycle = CursorLifecycle(self)
+        self.lifecycle.add(self.maintenance)
+        
+        # Image decoding and cursor encoding run in the background so the window never freezes
+        self.jobs = JobRunner(self)
+        self.jobs.progress.connect(self.job_progress)
+        self.jobs.finished.connect(self.job_finished)
+        self.jobs.failed.connect(self.job_failed)
+        self.jobs.cancelled.connect(self.job_cancelled)
         
-        # Install event filter for the entire application
-        QApplication.instance().installEventFilter(self)
+        # Hidden diagnostics panel showing timer and overlay costs
+        self._diagnostics = None
+        QShortcut(QKeySequence("Ctrl+Alt+Shift+D"), self, self.show_diagnostics)
         
         # Setup UI
         self.init_ui()
     
-    def eventFilter(self, obj, event):
-        """Event filter to help maintain custom cursor"""
-        if hasattr(self, 'ns_cursor') and self.ns_cursor is not None:
-            # Only handle application activation events to reduce flickering
-            # Handling too many events causes cursor flickering
-            if event.type() in [QEvent.Type.ApplicationActivate, QEvent.Type.WindowActivate]:
-                try:
-                    # Push the cursor again when the application regains focus
-                    self.ns_cursor.push()
-                except Exception as e:
-                    print(f"Error in event filter: {e}")
-        return super().eventFilter(obj, event)
+    @property
+    def backend(self):
+        """Cursor backend for this platform, imported on first apply"""
+        if self._backend is None:
+            self._backend = load_backend(self)
+        return self._backend
+    
+    def recover_cursors(self):
+        """Restore the system cursors a crashed session left replaced"""
+        try:
+            self.snapshots.restore(self.backend)
+            logger.warning("Restored the system cursors left by a session that did not exit cleanly")
+        except Exception as e:
+            logger.error("Could not restore the system cursors from the snapshot: %s", e)
+    
+    @property
+    def cursor_overlay(self):
+        """Overlay window for animated cursors, created on first use"""
+        if self._cursor_overlay is None:
+            from .overlay import CursorOverlay
+            self._cursor_overlay = CursorOverlay()
+            self.lifecycle.add(self._cursor_overlay)
+        return self._cursor_overlay
+    
+    def show_diagnostics(self):
+        """Open the diagnostics panel, which also turns telemetry on"""
+        if self._diagnostics is None:
+            from .diagnostics import DiagnosticsPanel
+            self._diagnostics = DiagnosticsPanel()
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+    
+    def maintenance_backends(self):
+        """Cursor layers the maintenance scheduler should keep applied"""
+        backends = []
+        if self.ns_cursor is not None:
+            backends.append(NSCursorBackend(self.ns_cursor))
+        if self.custom_cursor is not None:
+            backends.append(QtOverrideCursorBackend(self.custom_cursor))
+        return backends
     
     def init_ui(self):
         # Main layout
@@ -157,12 +182,37 @@ class CustomCursorApp(QMainWindow):
         
         self.image_preview = QLabel("No image selected")
         self.image_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_preview.setMinimumSize(400, 400)
+        self.image_preview.setMinimumSize(400, 280)
         self.image_preview.setStyleSheet("border: 1px solid #ccc; background-color: #333;")
         
         preview_layout.addWidget(self.image_preview)
         self.preview_group.setLayout(preview_layout)
         
+        # Cursor library - lists the packed index without decoding any source images
+        self.library_group = QGroupBox("Cursor Library")
+        self.library_group.setStyleSheet("QGroupBox { padding-top: 15px; margin-top: 5px; }")
+        library_layout = QVBoxLayout()
+        library_layout.setContentsMargins(10, 10, 10, 10)
+        
+        self.library_model = LibraryModel(self.cursor_library, self)
+        self.library_view = CursorListView()
+        self.library_view.setModel(self.library_model)
+        self.library_view.setMinimumHeight(110)
+        self.library_view.selectionModel().currentChanged.connect(self.select_library_entry)
+        
+        # Cursor packs - whole directories browsed with thumbnails decoded only for visible rows
+        self.pack_model = CursorPackModel(self)
+        self.pack_view = CursorGalleryView()
+        self.pack_view.setModel(self.pack_model)
+        self.pack_view.selectionModel().currentChanged.connect(self.select_pack_image)
+        
+        self.library_tabs = QTabWidget()
+        self.library_tabs.addTab(self.library_view, "Library")
+        self.library_tabs.addTab(self.pack_view, "Cursor Pack")
+        
+        library_layout.addWidget(self.library_tabs)
+        self.library_group.setLayout(library_layout)
+        
         # Initialize hotspot spinboxes but don't show them in the UI
         self.hotspot_x_spin = QSpinBox()
         self.hotspot_x_spin.setRange(0, 256)
@@ -183,6 +233,14 @@ class CustomCursorApp(QMainWindow):
         self.upload_btn.clicked.connect(self.upload_image)
         self.upload_btn.setMinimumHeight(30)  # Make buttons taller
         
+        self.pack_btn = QPushButton("Open Pack")
+        self.pack_btn.clicked.connect(self.open_pack)
+        self.pack_btn.setMinimumHeight(30)  # Make buttons taller
+        
+        self.theme_btn = QPushButton("Apply Theme")
+        self.theme_btn.clicked.connect(self.apply_theme)
+        self.theme_btn.setMinimumHeight(30)  # Make buttons taller
+        
         self.apply_btn = QPushButton("Apply as Cursor")
         self.apply_btn.clicked.connect(self.apply_cursor)
         self.apply_btn.setEnabled(False)
@@ -193,6 +251,8 @@ class CustomCursorApp(QMainWindow):
         self.reset_btn.setMinimumHeight(30)  # Make buttons taller
         
         buttons_layout.addWidget(self.upload_btn)
+        buttons_layout.addWidget(self.pack_btn)
+        buttons_layout.addWidget(self.theme_btn)
         buttons_layout.addWidget(self.apply_btn)
         buttons_layout.addWidget(self.reset_btn)
         
@@ -201,7 +261,8 @@ class CustomCursorApp(QMainWindow):
         main_layout.setContentsMargins(20, 10, 20, 20)  # Add margins around the entire layout
         main_layout.addWidget(windsurf_label, 0, Qt.AlignmentFlag.AlignCenter)  # Place the label at the top center
         main_layout.addSpacing(5)  # Small space after the label
-        main_layout.addWidget(self.preview_group, 9)  # Give preview 90% of the weight
+        main_layout.addWidget(self.preview_group, 6)  # Give preview most of the weight
+        main_layout.addWidget(self.library_group, 3)
         main_layout.addSpacing(10)  # Space between preview and buttons
         main_layout.addLayout(buttons_layout, 1)  # Give buttons 10% of the weight
         
@@ -213,30 +274,99 @@ class CustomCursorApp(QMainWindow):
     def upload_image(self):
         file_dialog = QFileDialog()
         image_path, _ = file_dialog.getOpenFileName(
-            self, "Select PNG Image", "", "PNG Files (*.png)"
+            self, "Select Cursor Image", "",
+            "Cursor Images (*.png *.apng *.gif);;PNG Files (*.png)"
         )
         
         if image_path:
+            # Keep a copy in the library; it is selected once loaded
+            self.load_image(image_path, add_to_library=True)
+    
+    def select_library_entry(self, index):
+        """Load the library entry selected in the list"""
+        entry = index.data(EntryRole) if index.isValid() else None
+        if entry is None or entry == self.current_entry:
+            return
+        self.load_image(self.cursor_library.asset_path(entry), (entry.hotspot_x, entry.hotspot_y), entry=entry)
+    
+    def open_pack(self):
+        """Browse a directory of cursor images in the pack gallery"""
+        directory = QFileDialog.getExistingDirectory(self, "Select Cursor Pack")
+        if directory:
             try:
-                # Load and display the image
-                self.current_image_path = image_path
-                pixmap = QPixmap(image_path)
-                
-                # Resize if too large for preview
-                if pixmap.width() > 200 or pixmap.height() > 200:
-                    pixmap = pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio)
-                
-                self.image_preview.setPixmap(pixmap)
-                
-                # Reset hotspot values and enable apply button
-                self.hotspot_x_spin.setMaximum(pixmap.width() - 1)
-                self.hotspot_y_spin.setMaximum(pixmap.height() - 1)
-                self.hotspot_x_spin.setValue(0)
-                self.hotspot_y_spin.setValue(0)
-                self.apply_btn.setEnabled(True)
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load image: {str(e)}")
+                self.pack_model.set_directory(directory)
+                self.library_tabs.setCurrentWidget(self.pack_view)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to open cursor pack: {str(e)}")
+    
+    def select_pack_image(self, index):
+        """Load the pack image selected in the gallery"""
+        path = index.data(PathRole) if index.isValid() else None
+        if path is None or path == self.current_image_path:
+            return
+        self.load_image(path)
+    
+    def load_image(self, image_path, hotspot=None, entry=None, add_to_library=False):
+        """Decode an image in the background; it becomes the cursor to apply once loaded"""
+        # Picking another file cancels whatever was still loading or applying
+        self.jobs.cancel("apply")
+        self.apply_btn.setEnabled(False)
+        library = self.cursor_library if add_to_library else None
+        self.jobs.submit("load", prepare_image_job, image_path, hotspot, entry, library)
+    
+    def image_loaded(self, loaded):
+        """Show a decoded image in the preview and make it the cursor to apply"""
+        self.current_image_path = loaded.path
+        self.current_animation = loaded.animation
+        self.current_entry = loaded.entry
+        
+        self.image_preview.setPixmap(QPixmap.fromImage(loaded.preview))
+        
+        # Set hotspot values (in source pixels) and enable apply button
+        width, height = loaded.size
+        self.hotspot_x_spin.setMaximum(max(0, width - 1))
+        self.hotspot_y_spin.setMaximum(max(0, height - 1))
+        self.hotspot_x_spin.setValue(loaded.hotspot[0])
+        self.hotspot_y_spin.setValue(loaded.hotspot[1])
+        self.apply_btn.setEnabled(True)
+        if loaded.hotspot_source is not None:
+            logger.info("Hotspot %s,%s proposed from the %s", loaded.hotspot[0], loaded.hotspot[1],
+                        loaded.hotspot_source)
+        
+        if loaded.pending is not None:
+            # Index the prepared library record and select it
+            entry = self.cursor_library.commit(*loaded.pending)
+            self.library_model.reload()
+            self.current_entry = entry
+            self.library_view.setCurrentIndex(self.library_model.index(entry.index))
+    
+    def job_progress(self, key, percent):
+        label = {"load": "Loading image", "theme": "Applying theme"}.get(key, "Applying cursor")
+        self.statusBar().showMessage(f"{label}... {percent}%")
+    
+    def job_finished(self, key, result):
+        self.statusBar().clearMessage()
+        if key == "load":
+            self.image_loaded(result)
+        elif key == "apply":
+            self.cursor_encoded(result)
+        elif key == "theme":
+            self.theme_encoded(result)
+    
+    def job_failed(self, key, error):
+        logger.error("Background %s job failed: %s", key, error)
+        self.statusBar().clearMessage()
+        if key == "load":
+            QMessageBox.critical(self, "Error", f"Failed to load image: {str(error)}")
+            self.apply_btn.setEnabled(self.current_image_path is not None)
+        elif key == "theme":
+            QMessageBox.critical(self, "Error", f"Failed to apply {self.backend.name} theme: {str(error)}")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to apply {self.backend.name} cursor: {str(error)}")
+    
+    def job_cancelled(self, key):
+        if not self.jobs.is_running(key):
+            self.statusBar().clearMessage()
     
     def update_hotspot(self):
         self.hotspot_x = self.hotspot_x_spin.value()
@@ -247,199 +377,78 @@ class CustomCursorApp(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please upload an image first.")
             return
         
+        if not is_supported(CURRENT_OS):
+            QMessageBox.warning(self, "Unsupported OS", 
+                               f"Your operating system ({CURRENT_OS}) is not supported.")
+            return
+        
         try:
-            # Get the current OS
-            current_os = platform.system()
-            
-            if current_os == 'Windows':
-                self.apply_cursor_windows()
-            elif current_os == 'Darwin':  # macOS
-                self.apply_cursor_macos()
-            else:
-                QMessageBox.warning(self, "Unsupported OS", 
-                                   f"Your operating system ({current_os}) is not supported.")
-                
+            # Encoding runs in the background; cursor_encoded() applies the result
+            self.backend.submit()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to apply cursor: {str(e)}")
     
-    def apply_cursor_windows(self):
-        """Apply the cursor on Windows systems"""
+    def cursor_encoded(self, result):
+        """Apply a cursor prepared by a background apply job"""
         try:
-            # Load the image
-            img = Image.open(self.current_image_path)
-            
-            # Ensure image is in the right format
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-            
-            # Create a temporary .cur file
-            temp_dir = os.path.join(os.path.expanduser("~"), ".custom_cursor_app")
-            os.makedirs(temp_dir, exist_ok=True)
-            
-            cursor_path = os.path.join(temp_dir, "custom_cursor.cur")
-            
-            # Save as .cur file with hotspot
-            self._save_as_cur(img, cursor_path, self.hotspot_x, self.hotspot_y)
-            
-            # Load and apply the cursor
-            cursor_handle = win32gui.LoadImage(
-                0, cursor_path, win32con.IMAGE_CURSOR,
-                0, 0, win32con.LR_LOADFROMFILE
-            )
-            
-            # Set the cursor
-            ctypes.windll.user32.SetSystemCursor(cursor_handle, win32con.OCR_NORMAL)
-            
-            QMessageBox.information(self, "Success", "Custom cursor applied successfully!")
-            
+            message = self.snapshots.apply(self.backend, lambda: self.backend.apply(result))
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to apply Windows cursor: {str(e)}")
-    
-    def _save_as_cur(self, img, path, hotspot_x, hotspot_y):
-        """Save an image as a Windows .cur file"""
-        # Ensure image is not too large (Windows limitation)
-        if img.width > 256 or img.height > 256:
-            img = img.resize((256, 256), Image.LANCZOS)
-        
-        # Cursor file format header
-        header = bytearray([
-            0, 0,  # Reserved, must be 0
-            2, 0,  # Type (1 for ICO, 2 for CUR)
-            1, 0,  # Number of images
-        ])
-        
-        # Directory entry
-        width = img.width if img.width < 256 else 0  # 0 means 256
-        height = img.height if img.height < 256 else 0  # 0 means 256
-        
-        directory = bytearray([
-            width,  # Width
-            height,  # Height
-            0,  # Color count (0 for 32bpp)
-            0,  # Reserved
-            hotspot_x & 0xFF, (hotspot_x >> 8) & 0xFF,  # Hotspot X
-            hotspot_y & 0xFF, (hotspot_y >> 8) & 0xFF,  # Hotspot Y
-            0, 0, 0, 0,  # Size of image data (filled in later)
-            0, 0, 0, 0,  # Offset to image data (filled in later)
-        ])
-        
-        # Convert image to BMP format in memory
-        import io
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format='PNG')
-        img_data = img_byte_arr.getvalue()
-        
-        # Update directory with size and offset
-        img_size = len(img_data)
-        img_offset = len(header) + len(directory)
-        
-        directory[8:12] = img_size.to_bytes(4, byteorder='little')
-        directory[12:16] = img_offset.to_bytes(4, byteorder='little')
-        
-        # Write the cursor file
-        with open(path, 'wb') as f:
-            f.write(header)
-            f.write(directory)
-            f.write(img_data)
-    
-    def apply_cursor_macos(self):
-        """Apply the cursor on macOS systems using the NSCursor approach"""
+            self.job_failed("apply", e)
+            return
+        self.lifecycle.set_active(True)
+        QMessageBox.information(self, "Success", message)
+    
+    def apply_theme(self):
+        """Pick a theme pack (a theme.json or a .zip) and apply every cursor in it"""
+        if not is_supported(CURRENT_OS):
+            QMessageBox.warning(self, "Unsupported OS", 
+                               f"Your operating system ({CURRENT_OS}) is not supported.")
+            return
+        
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select Cursor Theme", "",
+            "Cursor Themes (theme.json *.zip)"
+        )
+        if not path:
+            return
+        
         try:
-            # Stop any existing cursor timers
-            if hasattr(self, 'cursor_timer') and self.cursor_timer.isActive():
-                self.cursor_timer.stop()
-            
-            # Load the image
-            img = Image.open(self.current_image_path)
-            
-            # Convert PIL Image to RGBA if needed
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-            
-            # Resize image to standard cursor size if needed
-            max_size = 32  # Standard cursor size
-            if img.width > max_size or img.height > max_size:
-                # Calculate new dimensions while preserving aspect ratio
-                ratio = min(max_size / img.width, max_size / img.height)
-                new_width = int(img.width * ratio)
-                new_height = int(img.height * ratio)
-                img = img.resize((new_width, new_height), Image.LANCZOS)
-            
-            # Save the cursor to a temporary directory for persistence
-            temp_dir = os.path.join(os.path.expanduser("~"), ".custom_cursor_app")
-            os.makedirs(temp_dir, exist_ok=True)
-            cursor_path = os.path.join(temp_dir, "custom_cursor.png")
-            img.save(cursor_path)
-            
-            # For macOS, we need to use NSCursor for system-wide cursor
-            # Convert PIL image to NSImage
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='PNG')
-            img_data = img_byte_arr.getvalue()
-            
-            # Create NSData from the image bytes
-            ns_data = NSData.dataWithBytes_length_(img_data, len(img_data))
-            
-            # Create NSImage from NSData
-            ns_image_rep = NSBitmapImageRep.imageRepWithData_(ns_data)
-            ns_image = NSImage.alloc().initWithSize_((img.width, img.height))
-            ns_image.addRepresentation_(ns_image_rep)
-            
-            # Create NSCursor with the NSImage
-            hotspot_x = min(self.hotspot_x, img.width - 1)
-            hotspot_y = min(self.hotspot_y, img.height - 1)
-            ns_cursor = NSCursor.alloc().initWithImage_hotSpot_(ns_image, NSPoint(hotspot_x, hotspot_y))
-            
-            # Store the cursor for future reference
-            self.ns_cursor = ns_cursor
-            
-            # Push the cursor onto the cursor stack instead of just setting it
-            # This helps prevent flickering
-            ns_cursor.push()
-            
-            # Create a timer to periodically check if the cursor needs to be reapplied
-            # but with a much lower frequency to prevent flickering
-            self.cursor_timer = QTimer(self)
-            
-            def reapply_cursor():
-                try:
-                    # Only reapply if absolutely necessary
-                    # This reduces flickering by minimizing cursor changes
-                    if hasattr(self, 'ns_cursor') and self.ns_cursor is not None:
-                        # No need to constantly set() the cursor, which causes flickering
-                        # Instead, we'll rely on the push() we did earlier and the event filter
-                        pass
-                except Exception as e:
-                    print(f"Cursor reapply error: {e}")
-            
-            # Connect and start the timer with very low frequency to prevent flickering
-            self.cursor_timer.timeout.connect(reapply_cursor)
-            self.cursor_timer.start(2000)  # Very infrequent checks (2 seconds) to minimize flickering
-            
-            QMessageBox.information(self, "Success", "Custom cursor applied system-wide!")
-            
+            # Loading and encoding every role runs in the background; theme_encoded() installs them
+            self.jobs.cancel("apply")
+            self.backend.submit_theme(path)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to apply macOS cursor: {str(e)}")
-            
+            QMessageBox.critical(self, "Error", f"Failed to apply theme: {str(e)}")
+    
+    def theme_encoded(self, result):
+        """Install a theme prepared by a background theme job"""
+        try:
+            message = self.snapshots.apply(self.backend, lambda: self.backend.apply_theme(result))
+        except Exception as e:
+            self.job_failed("theme", e)
+            return
+        self.lifecycle.set_active(True)
+        QMessageBox.information(self, "Success", message)
+    
+    def play_animation_overlay(self, atlas, rects, sequence, hotspot=None):
+        """Play the current animation on the cursor overlay from its atlas"""
+        hotspot_x, hotspot_y = hotspot if hotspot is not None else (self.hotspot_x, self.hotspot_y)
+        self.cursor_overlay.set_cursor_animation(QPixmap.fromImage(atlas), rects, sequence,
+                                                 self.current_animation.durations, hotspot_x, hotspot_y)
+    
     def reset_cursor(self):
         """Reset to the default system cursor"""
         try:
-            # Stop the timer if it exists
-            if hasattr(self, 'cursor_timer') and self.cursor_timer.isActive():
-                self.cursor_timer.stop()
+            # Stop any animated overlay
+            if self._cursor_overlay is not None:
+                self._cursor_overlay.hide_overlay()
+            
+            # Stop maintaining the custom cursor
+            self.maintenance.stop()
+            self.lifecycle.set_active(False)
             
-            # For macOS, reset the NSCursor to the system default if we were using it
-            if hasattr(self, 'ns_cursor'):
-                # Pop all cursors from the stack to get back to the default
-                while True:
-                    try:
-                        NSCursor.pop()
-                    except:
-                        break  # Break when we've popped all cursors
-                
-                # Set the arrow cursor
-                NSCursor.arrowCursor().set()
-                self.ns_cursor = None
+            # Put back the system cursors from the snapshot in one batch
+            if self._backend is not None or (self.snapshots.active and is_supported(CURRENT_OS)):
+                self.snapshots.restore(self.backend)
             
             # Restore any override cursor from QApplication
             while QApplication.instance().overrideCursor() is not None:
@@ -460,104 +469,57 @@ class CustomCursorApp(QMainWindow):
 
 def run_app():
     """Run the Custom Cursor Application"""
-    print("Starting Custom Cursor App...")
+    logger.info("Starting Custom Cursor App")
+    # --telemetry [PATH] collects timer and overlay costs and writes them as JSON on exit
+    telemetry_path = take_telemetry_flag(sys.argv)
     if not QApplication.instance():
-        print("Creating QApplication instance...")
+        logger.debug("Creating QApplication instance")
         app = QApplication(sys.argv)
     else:
-        print("Using existing QApplication instance...")
+        logger.debug("Using existing QApplication instance")
         app = QApplication.instance()
     
-    print("Creating main window...")
+    logger.debug("Creating main window")
     window = CustomCursorApp()
-    print("Showing main window...")
+    logger.debug("Showing main window")
     window.show()
     
+    if telemetry_path:
+        TELEMETRY.enable()
+        # kill -USR1 <pid> writes a snapshot without quitting
+        install_dump_signal(telemetry_path, app)
+        logger.info("Telemetry enabled, writing to %s", os.path.abspath(telemetry_path))
+    
     # Ensure cursor is restored on application exit
     def cleanup():
-        print("Cleaning up...")
+        logger.info("Cleaning up")
         try:
-            # For macOS, reset the NSCursor to the system default
-            if platform.system() == 'Darwin':
-                # Pop all cursors from the stack to get back to the default
-                while True:
-                    try:
-                        NSCursor.pop()
-                    except:
-                        break  # Break when we've popped all cursors
-                
-                # Set the arrow cursor
-                NSCursor.arrowCursor().set()
+            window.maintenance.stop()
+            window.lifecycle.set_active(False)
+            
+            # Cursors that outlive the process stay applied and keep their
+            # snapshot for a later reset; the others are restored now
+            backend = window._backend
+            if window.snapshots.active:
+                if backend is None or backend.persistent:
+                    window.snapshots.mark_clean()
+                else:
+                    window.snapshots.restore(backend)
             
             # Restore any override cursor from QApplication
             while QApplication.instance().overrideCursor() is not None:
                 QApplication.instance().restoreOverrideCursor()
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            logger.exception("Error during cleanup: %s", e)
+        
+        if telemetry_path:
+            try:
+                TELEMETRY.dump(telemetry_path)
+            except OSError as e:
+                logger.error("Could not write telemetry to %s: %s", telemetry_path, e)
     
     app.aboutToQuit.connect(cleanup)
     
-    # Import necessary modules for event filtering
-    from PyQt6.QtCore import QEvent, QTimer
-    
-    # Create a more robust application-wide event filter
-    class AppEventFilter(QObject):
-        def eventFilter(self, watched, event):
-            # Handle application activation/deactivation events specially
-            if event.type() in [QEvent.Type.ApplicationActivate, QEvent.Type.WindowActivate]:
-                # When app regains focus, force cursor update
-                try:
-                    if platform.system() == 'Darwin' and hasattr(window, 'ns_cursor') and window.ns_cursor is not None:
-                        # Force reapply the cursor
-                        NSCursor.hide()
-                        window.ns_cursor.set()
-                        NSCursor.unhide()
-                except Exception as e:
-                    print(f"Error in activation event: {e}")
-            
-            # Handle all mouse events
-            if hasattr(window, 'custom_cursor') and window.custom_cursor is not None:
-                if event.type() in [QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress, 
-                                  QEvent.Type.MouseButtonRelease, QEvent.Type.HoverMove]:
-                    try:
-                        # For macOS, use NSCursor
-                        if platform.system() == 'Darwin' and hasattr(window, 'ns_cursor'):
-                            window.ns_cursor.set()
-                        
-                        # Also ensure Qt cursor is applied
-                        if QApplication.instance().overrideCursor() is None:
-                            QApplication.instance().setOverrideCursor(window.custom_cursor)
-                    except Exception as e:
-                        print(f"Error in mouse event: {e}")
-            return False
-    
-    # Create and install the event filter
-    app_filter = AppEventFilter()
-    app.installEventFilter(app_filter)
-    
-    # Create a global timer to periodically reapply the cursor
-    # This helps maintain the cursor even when the app loses focus
-    global_cursor_timer = QTimer()
-    
-    def global_reapply_cursor():
-        try:
-            # Handle NSCursor for macOS
-            if platform.system() == 'Darwin' and hasattr(window, 'ns_cursor') and window.ns_cursor is not None:
-                # Force reapply the cursor by hiding/showing
-                NSCursor.hide()
-                window.ns_cursor.set()
-                NSCursor.unhide()
-            
-            # Handle Qt cursor as backup
-            if hasattr(window, 'custom_cursor') and window.custom_cursor is not None:
-                if QApplication.instance().overrideCursor() is None:
-                    QApplication.instance().setOverrideCursor(window.custom_cursor)
-        except Exception as e:
-            print(f"Error in global timer: {e}")
-    
-    global_cursor_timer.timeout.connect(global_reapply_cursor)
-    global_cursor_timer.start(20)  # Check more frequently for better responsiveness
-    
     sys.exit(app.exec())
 
 if __name__ == '__main__':
@@ -0,0 +1,27 @@
+"""
+Platform cursor backends.
+Each backend module is imported the first time a cursor is applied, so the
+win32/Cocoa bindings and PIL never slow down startup.
+"""
+
+import importlib
+import sys
+
+# Resolve the platform once, without importing the platform module
+CURRENT_OS = {'win32': 'Windows', 'darwin': 'Darwin'}.get(sys.platform, sys.platform.capitalize())
+
+_BACKEND_MODULES = {
+    'Windows': 'windows',
+    'Darwin': 'macos',
+}
+
+
+def is_supported(system=CURRENT_OS):
+    """Return True if a cursor backend exists for system"""
+    return system in _BACKEND_MODULES
+
+
+def load_backend(window, system=CURRENT_OS):
+    """Import the backend module for system and create its backend for window"""
+    module = importlib.import_module(f".{_BACKEND_MODULES[system]}", __name__)
+    return module.BACKEND(window)
@@ -0,0 +1,155 @@
+"""
+macOS cursor backend: pushes an NSCursor built from raw pixels and keeps it
+applied through the maintenance scheduler. NSCursor can't animate, so
+animated cursors play on the cursor overlay instead. There is no public API
+for replacing the other system cursors, so a theme applies its arrow.
+Pushed cursors only live as long as the process, so the snapshot holds no
+cursor data and restoring pops what this backend pushed.
+"""
+
+try:
+    from Cocoa import NSCursor, NSPoint
+except ImportError:
+    raise ImportError("pyobjc-framework-Cocoa is required for macOS. Install with: pip install pyobjc-framework-Cocoa")
+
+
+def prepare_cursor_job(job, image_path, animation, hotspot=(0, 0), max_size=32):
+    """
+    Build what the macOS apply path hands to Cocoa or the overlay (runs on a
+    worker thread). Transparent margins are trimmed and the hotspot (given in
+    source pixels) moved to match, so the overlay window and the NSImage only
+    cover the visible cursor.
+    """
+    from ..bridge import pil_to_qimage
+    from ..pixels import trim_frames
+
+    if animation is not None:
+        from ..animation import build_atlas
+        frames, hotspot = trim_frames(animation.frames, hotspot)
+        atlas, rects, sequence = build_atlas(frames)
+        job.report(100)
+        return pil_to_qimage(atlas), rects, sequence, hotspot
+
+    prepared = fit_cursor(image_path, hotspot, max_size)
+    job.report(100)
+    return prepared
+
+
+def fit_cursor(image_path, hotspot, max_size=32):
+    """Return (image, hotspot) for an NSCursor: fitted to max_size and trimmed"""
+    from ..imaging import image_pipeline
+    from ..pixels import trim
+
+    # Load the image as RGBA, resized to standard cursor size if needed
+    # while preserving aspect ratio (cached by the shared pipeline)
+    source = image_pipeline.load(image_path)
+    img = image_pipeline.fitted(image_path, max_size)
+    scale = img.width / source.width
+    return trim(img, (int(hotspot[0] * scale), int(hotspot[1] * scale)))
+
+
+def prepare_theme_cursor(cursor):
+    """Encode one theme role for apply_theme()"""
+    from ..themes import cursor_hotspot
+    return fit_cursor(cursor.path, cursor_hotspot(cursor))
+
+
+def restore_default_cursor(pushed):
+    """Pop the given number of pushed cursors and fall back to the arrow"""
+    # Popping an empty stack does nothing, so only pop what was pushed
+    for _ in range(pushed):
+        NSCursor.pop()
+
+    # Set the arrow cursor
+    NSCursor.arrowCursor().set()
+
+
+class MacOSBackend:
+    """Applies cursors with NSCursor using the raw-pixel bridge"""
+    name = "macOS"
+    # Pushed cursors go away with the process
+    persistent = False
+
+    def __init__(self, window):
+        self.window = window
+        self._pushed = 0
+
+    def submit(self):
+        """Start preparing the window's current cursor; apply() pushes it once done"""
+        # Stop maintaining any previous cursor
+        self.window.maintenance.stop()
+
+        # Resizing runs in the background
+        self.window.jobs.submit("apply", prepare_cursor_job, self.window.current_image_path,
+                                self.window.current_animation, (self.window.hotspot_x, self.window.hotspot_y))
+
+    def apply(self, prepared):
+        """Push an NSCursor (or play an animation) from a prepared image"""
+        window = self.window
+        # NSCursor can't animate, so animated cursors play on the overlay,
+        # over the default arrow rather than a previously pushed cursor
+        if window.current_animation is not None:
+            self._pop()
+            window.play_animation_overlay(*prepared)
+            return "Animated cursor applied!"
+
+        self._push(*prepared)
+        return "Custom cursor applied system-wide!"
+
+    def submit_theme(self, path):
+        """Start loading the theme pack at path; apply_theme() pushes its arrow"""
+        from ..themes import theme_job
+
+        self.window.maintenance.stop()
+        self.window.jobs.submit("theme", theme_job, path, prepare_theme_cursor, roles=('arrow',))
+
+    def apply_theme(self, encoded):
+        """Push a theme's arrow cursor"""
+        theme, prepared = encoded
+        self._push(*prepared['arrow'])
+        return f"Theme '{theme.name}' applied (arrow cursor)"
+
+    def _push(self, img, hotspot):
+        """Push an NSCursor built from an RGBA image and keep it applied"""
+        from ..bridge import pil_to_nsimage
+
+        window = self.window
+        # A static cursor replaces any animation still playing on the overlay
+        if window._cursor_overlay is not None:
+            window._cursor_overlay.hide_overlay()
+
+        # Hand the raw RGBA pixels to an NSImage, with no PNG round trip;
+        # the pixel buffer must outlive the cursor
+        ns_image, window.ns_cursor_pixels = pil_to_nsimage(img)
+
+        # Create NSCursor with the NSImage
+        hotspot_x = min(hotspot[0], img.width - 1)
+        hotspot_y = min(hotspot[1], img.height - 1)
+        ns_cursor = NSCursor.alloc().initWithImage_hotSpot_(ns_image, NSPoint(hotspot_x, hotspot_y))
+
+        # Store the cursor for future reference
+        window.ns_cursor = ns_cursor
+
+        # Push the cursor onto the cursor stack instead of just setting it
+        # This helps prevent flickering
+        ns_cursor.push()
+        self._pushed += 1
+
+        # Reapply only when something else replaces the cursor
+        window.maintenance.start(*window.maintenance_backends())
+
+    def capture(self):
+        """Snapshot state: nothing, since pushed cursors never outlive the process"""
+        return {}
+
+    def restore(self, state):
+        """Pop every cursor this backend pushed and fall back to the arrow"""
+        self._pop()
+
+    def _pop(self):
+        restore_default_cursor(self._pushed)
+        self._pushed = 0
+        self.window.ns_cursor = None
+
+
+BACKEND = MacOSBackend
@@ -0,0 +1,135 @@
+"""
+Windows cursor backend: encodes .cur/.ani files in the background and sets
+them as the system cursor, or as every system cursor of a theme at once.
+SetSystemCursor only lasts for the logon session and never touches the
+user's cursor scheme in the registry, so the snapshot records nothing and
+restoring reloads the scheme with a single SystemParametersInfo call.
+"""
+
+import ctypes
+import os
+
+import win32con
+import win32gui
+
+# SetSystemCursor ids for each theme role (winuser.h OCR_* values)
+THEME_CURSORS = {
+    'arrow': 32512,      # OCR_NORMAL
+    'ibeam': 32513,      # OCR_IBEAM
+    'wait': 32514,       # OCR_WAIT
+    'crosshair': 32515,  # OCR_CROSS
+    'up': 32516,         # OCR_UP
+    'size_nwse': 32642,  # OCR_SIZENWSE
+    'size_nesw': 32643,  # OCR_SIZENESW
+    'size_we': 32644,    # OCR_SIZEWE
+    'size_ns': 32645,    # OCR_SIZENS
+    'move': 32646,       # OCR_SIZEALL
+    'no': 32648,         # OCR_NO
+    'hand': 32649,       # OCR_HAND
+    'busy': 32650,       # OCR_APPSTARTING
+    'help': 32651,       # OCR_HELP
+}
+SPI_SETCURSORS = 0x0057
+
+
+def encode_cursor_job(job, image_path, animation, hotspot, cursor_path, reuse=False):
+    """Write the .cur/.ani file for the Windows apply path (runs on a worker thread)"""
+    from ..animation import write_ani
+    from ..curfile import write_cur
+    from ..imaging import image_pipeline
+
+    if animation is not None:
+        # Animated cursors are written as .ani and loaded with their frame timing
+        write_ani(cursor_path, animation, hotspot)
+    elif not (reuse and os.path.exists(cursor_path)):
+        # Save as .cur file with hotspot, reusing the pipeline's cached sizes
+        img = image_pipeline.load(image_path)
+        job.report(20)
+        write_cur(cursor_path, img, hotspot, resize=lambda _, size: image_pipeline.resized(image_path, size))
+    job.report(100)
+    return cursor_path
+
+
+class WindowsBackend:
+    """Applies cursors with SetSystemCursor"""
+    name = "Windows"
+    # System cursors stay replaced after the app exits
+    persistent = True
+
+    def __init__(self, window):
+        self.window = window
+
+    def submit(self):
+        """Start encoding the window's current cursor; apply() sets it once done"""
+        window = self.window
+        # Create a temporary cursor file
+        temp_dir = os.path.join(os.path.expanduser("~"), ".custom_cursor_app")
+        os.makedirs(temp_dir, exist_ok=True)
+
+        hotspot = (window.hotspot_x, window.hotspot_y)
+        if window.current_animation is not None:
+            cursor_path = os.path.join(temp_dir, "custom_cursor.ani")
+        elif window.current_entry is not None:
+            # Library entries keep one encoded .cur per hotspot
+            cursor_path = window.cursor_library.encoded_path(window.current_entry, ".cur", hotspot)
+        else:
+            cursor_path = os.path.join(temp_dir, "custom_cursor.cur")
+
+        window.jobs.submit("apply", encode_cursor_job, window.current_image_path, window.current_animation,
+                           hotspot, cursor_path, reuse=window.current_entry is not None)
+
+    @staticmethod
+    def _load_cursor(cursor_path):
+        if cursor_path.endswith(".ani"):
+            return ctypes.windll.user32.LoadCursorFromFileW(cursor_path)
+        # Load the cursor at the system cursor size for the current DPI
+        return win32gui.LoadImage(
+            0, cursor_path, win32con.IMAGE_CURSOR,
+            0, 0, win32con.LR_LOADFROMFILE | win32con.LR_DEFAULTSIZE
+        )
+
+    def apply(self, cursor_path):
+        """Load an encoded .cur/.ani file and make it the system cursor"""
+        cursor_handle = self._load_cursor(cursor_path)
+
+        # Set the cursor
+        ctypes.windll.user32.SetSystemCursor(cursor_handle, win32con.OCR_NORMAL)
+        return "Custom cursor applied successfully!"
+
+    def submit_theme(self, path):
+        """Start loading and encoding the theme pack at path; apply_theme() installs it"""
+        from ..themes import encode_cursor_file, theme_job
+
+        self.window.jobs.submit("theme", theme_job, path, encode_cursor_file, roles=THEME_CURSORS)
+
+    def apply_theme(self, encoded):
+        """Install every encoded role of a theme as one batch"""
+        theme, paths = encoded
+        # Load every cursor before replacing any, so a bad file changes nothing
+        handles = {}
+        try:
+            for role, cursor_path in paths.items():
+                handle = self._load_cursor(cursor_path)
+                if not handle:
+                    raise OSError(f"Could not load the {role} cursor from {cursor_path}")
+                handles[role] = handle
+        except Exception:
+            for handle in handles.values():
+                ctypes.windll.user32.DestroyCursor(handle)
+            raise
+        # SetSystemCursor takes ownership of each handle
+        for role, handle in handles.items():
+            ctypes.windll.user32.SetSystemCursor(handle, THEME_CURSORS[role])
+        return f"Theme '{theme.name}' applied ({len(handles)} cursors)"
+
+    def capture(self):
+        """Snapshot state: nothing, since the registry scheme is never modified"""
+        return {}
+
+    def restore(self, state):
+        """Reload every system cursor from the user's current scheme in one call"""
+        if not ctypes.windll.user32.SystemParametersInfoW(SPI_SETCURSORS, 0, None, 0):
+            raise ctypes.WinError()
+
+
+BACKEND = WindowsBackend
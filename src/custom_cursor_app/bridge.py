@@ -0,0 +1,69 @@
+"""
+Raw-pixel handoff from PIL to Qt and Cocoa.
+The RGBA pixels are copied out of PIL as raw bytes, which QImage /
+NSBitmapImageRep read directly, instead of being encoded to PNG and decoded
+again. PIL has no public view of its own pixel storage (large images are
+held in separate blocks), so that copy is the one left.
+"""
+
+from collections import namedtuple
+
+from PyQt6.QtGui import QImage, QPixmap
+
+from .pixels import rgba
+
+# NSBitmapFormat flag for straight (non-premultiplied) alpha, as PIL stores it
+NS_ALPHA_NONPREMULTIPLIED = 1 << 1
+
+NSImageHandle = namedtuple("NSImageHandle", ["image", "pixels"])
+
+
+def pil_to_qimage(img):
+    """
+    Build a QImage from an RGBA PIL image's pixels without encoding.
+    The pixels are copied once (tobytes); the QImage views that copy, which
+    is kept alive on the QImage itself.
+    """
+    img = rgba(img)
+    pixels = img.tobytes()
+    image = QImage(pixels, img.width, img.height, img.width * 4, QImage.Format.Format_RGBA8888)
+    image._pixels = pixels
+    return image
+
+
+def pil_to_qpixmap(img):
+    """Convert an RGBA PIL image to a QPixmap"""
+    return QPixmap.fromImage(pil_to_qimage(img))
+
+
+def pil_to_nsimage(img, planar=False, cocoa=None):
+    """
+    Build an NSImage from an RGBA PIL image's raw pixels.
+    Meshed RGBA bytes are used by default; planar=True hands over one plane
+    per channel. The rep reads the Python buffers directly (a copy of the
+    pixels made by tobytes, then into a bytearray), so the returned
+    NSImageHandle.pixels must be kept alive as long as the image is in use.
+    The planes are bytearrays, since the rep takes writable (unsigned char **)
+    data.
+    cocoa defaults to the Cocoa module and can be replaced for testing.
+    """
+    if cocoa is None:
+        import Cocoa as cocoa
+
+    img = rgba(img)
+    width, height = img.size
+    if planar:
+        pixels = tuple(bytearray(channel.tobytes()) for channel in img.split())
+        planes = pixels + (None,)
+        bytes_per_row, bits_per_pixel = width, 8
+    else:
+        pixels = bytearray(img.tobytes())
+        planes = (pixels, None, None, None, None)
+        bytes_per_row, bits_per_pixel = width * 4, 32
+
+    rep = cocoa.NSBitmapImageRep.alloc().initWithBitmapDataPlanes_pixelsWide_pixelsHigh_bitsPerSample_samplesPerPixel_hasAlpha_isPlanar_colorSpaceName_bitmapFormat_bytesPerRow_bitsPerPixel_(
+        planes, width, height, 8, 4, True, planar, cocoa.NSDeviceRGBColorSpace,
+        NS_ALPHA_NONPREMULTIPLIED, bytes_per_row, bits_per_pixel)
+    ns_image = cocoa.NSImage.alloc().initWithSize_((width, height))
+    ns_image.addRepresentation_(rep)
+    return NSImageHandle(ns_image, pixels)
@@ -0,0 +1,360 @@
+"""
+Headless cursor conversion: python -m custom_cursor_app convert ...
+Converts directories or globs of images into .cur/.ani/.png files across a
+process pool and records every output in a JSON manifest. Inputs whose content
+hash, hotspot and settings match the previous manifest are skipped. Nothing
+here imports Qt, so it runs without a display.
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image
+
+from .animation import load_animation, write_ani
+from .curfile import CURSOR_SIZES, write_cur
+from .imaging import fit_size
+from .pixels import clean_alpha
+from .resample import DEFAULT_MODE, MODES, MipChain, chain_resizer
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+INPUT_EXTENSIONS = ('.png', '.apng', '.gif')
+FORMATS = ('cur', 'ani', 'png')
+
+
+def parse_hotspot_rules(values):
+    """
+    Parse --hotspot values of the form [PATTERN=]X,Y or [PATTERN=]center.
+    Returns (pattern, spec) pairs; a rule without a pattern matches everything.
+    """
+    rules = []
+    for value in values or ():
+        pattern, _, spec = value.rpartition('=')
+        spec = spec.strip().lower()
+        if spec != 'center':
+            try:
+                x, y = (int(v) for v in spec.split(','))
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"Invalid hotspot '{value}', expected [PATTERN=]X,Y or center")
+            spec = (x, y)
+        rules.append((pattern or '*', spec))
+    return rules
+
+
+def hotspot_for(name, rules):
+    """Return the hotspot spec of the first rule matching a file name"""
+    for pattern, spec in rules:
+        if fnmatch.fnmatch(name, pattern):
+            return spec
+    return (0, 0)
+
+
+def parse_sprite_rules(values):
+    """
+    Parse --sprite values of the form [PATTERN=]WxH.
+    Returns (pattern, (width, height)) pairs; matching inputs are sliced into
+    WxH frames and converted as animations.
+    """
+    rules = []
+    for value in values or ():
+        pattern, _, spec = value.rpartition('=')
+        try:
+            width, height = (int(v) for v in spec.strip().lower().split('x'))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid sprite '{value}', expected [PATTERN=]WxH")
+        if width < 1 or height < 1:
+            raise argparse.ArgumentTypeError(f"Invalid sprite '{value}', frames need a positive size")
+        rules.append((pattern or '*', (width, height)))
+    return rules
+
+
+def sprite_for(name, rules):
+    """Return the frame size of the first sprite rule matching a file name, or None"""
+    for pattern, frame_size in rules:
+        if fnmatch.fnmatch(name, pattern):
+            return frame_size
+    return None
+
+
+def resolve_hotspot(spec, width, height):
+    """Turn a hotspot spec into pixel coordinates inside a width x height image"""
+    if spec == 'center':
+        return width // 2, height // 2
+    return min(spec[0], width - 1), min(spec[1], height - 1)
+
+
+def collect_inputs(patterns, recursive=False):
+    """
+    Expand files, directories and glob patterns into (path, relative name) pairs.
+    The relative name keeps sub-directories, so files of different folders get
+    different outputs; files that differ only by extension still share them
+    (see find_conflicts).
+    """
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            root = pattern
+            walker = os.walk(root) if recursive else [(root, [], os.listdir(root))]
+            for dirpath, _, files in walker:
+                for name in files:
+                    if name.lower().endswith(INPUT_EXTENSIONS):
+                        path = os.path.join(dirpath, name)
+                        found.setdefault(os.path.abspath(path), os.path.relpath(path, root))
+        else:
+            matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+            for path in matches:
+                if os.path.isfile(path):
+                    found.setdefault(os.path.abspath(path), os.path.basename(path))
+    return sorted(found.items(), key=lambda item: item[1])
+
+
+def output_paths(relative, out_dir, formats):
+    """Every file an input may write: its relative name without extension, once per format"""
+    stem = os.path.join(out_dir, os.path.splitext(relative)[0])
+    return [os.path.normcase(os.path.abspath(f"{stem}.{fmt}")) for fmt in formats]
+
+
+def find_conflicts(inputs, out_dir, formats):
+    """
+    Return {source: reason} for inputs that cannot be converted safely: two
+    inputs whose outputs have the same name (anim.gif and anim.png), or an
+    input one of whose outputs would overwrite an input file.
+    """
+    sources = {os.path.normcase(source): relative for source, relative in inputs}
+    claims = {}
+    conflicts = {}
+    for source, relative in inputs:
+        for path in output_paths(relative, out_dir, formats):
+            if path in sources:
+                conflicts[source] = f"its output would overwrite the input {sources[path]}"
+            elif path in claims and claims[path][0] != source:
+                other, other_relative = claims[path]
+                conflicts[source] = f"it writes {os.path.basename(path)} like {other_relative}"
+                conflicts.setdefault(other, f"it writes {os.path.basename(path)} like {relative}")
+            else:
+                claims[path] = (source, relative)
+    return conflicts
+
+
+def file_hash(path, previous=None):
+    """
+    Content hash of a file, reusing the previous manifest's hash when the
+    file's mtime and size are unchanged.
+    """
+    st = os.stat(path)
+    if previous and previous.get('mtime_ns') == st.st_mtime_ns and previous.get('size') == st.st_size:
+        return previous['hash'], st
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest(), st
+
+
+def convert_one(task):
+    """Convert a single input; runs in a worker process"""
+    source, relative, out_dir, hotspot_spec, sizes, formats, quality, sprite = task
+    stem = os.path.splitext(relative)[0]
+    target = os.path.join(out_dir, stem)
+    # Manifest paths always use forward slashes
+    stem = stem.replace(os.sep, '/')
+    os.makedirs(os.path.dirname(target) or out_dir, exist_ok=True)
+    outputs = []
+
+    with Image.open(source) as img:
+        # A sprite sheet is an animation of its frame-sized cells
+        animated = sprite is not None or getattr(img, 'n_frames', 1) > 1
+        width, height = sprite or img.size
+    hotspot = resolve_hotspot(hotspot_spec, width, height)
+
+    animation = None
+    if animated and 'ani' in formats:
+        animation = load_animation(source, sprite)
+        write_ani(target + '.ani', animation, hotspot, sizes, chain_resizer(quality))
+        outputs.append(stem + '.ani')
+    # Without an .ani output an animation's .cur is its first frame
+    still_cur = 'cur' in formats and not (animated and 'ani' in formats)
+    if still_cur or 'png' in formats:
+        # One mip chain serves every cursor size and the PNG
+        if sprite is not None:
+            chain = MipChain((animation or load_animation(source, sprite)).frames[0])
+        else:
+            with Image.open(source) as img:
+                chain = MipChain(clean_alpha(img))
+    if still_cur:
+        write_cur(target + '.cur', chain.source, hotspot, sizes, lambda _, size: chain.resize(size, quality))
+        outputs.append(stem + '.cur')
+    if 'png' in formats:
+        # A normalized RGBA PNG fitted into the largest target size
+        max_size = max(sizes) if sizes else max(CURSOR_SIZES)
+        chain.resize(fit_size(chain.source.width, chain.source.height, max_size), quality).save(target + '.png')
+        outputs.append(stem + '.png')
+    if not outputs:
+        raise ValueError(f"a still image has no {', '.join(formats)} output")
+
+    return {
+        'hotspot': list(hotspot),
+        'width': width,
+        'height': height,
+        'animated': animated,
+        'outputs': outputs,
+    }
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def _unchanged(previous, digest, settings, out_dir):
+    return (previous is not None
+            and previous.get('hash') == digest
+            and previous.get('settings') == settings
+            and all(os.path.exists(os.path.join(out_dir, name)) for name in previous.get('outputs', ())))
+
+
+def convert(inputs, out_dir, hotspot_rules=(), sizes=None, formats=('cur', 'ani'), jobs=None,
+            force=False, recursive=False, manifest_path=None, quality=DEFAULT_MODE, sprite_rules=()):
+    """
+    Convert inputs into out_dir and write the manifest.
+    Returns (converted, skipped, failed) counts.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = manifest_path or os.path.join(out_dir, MANIFEST_NAME)
+    previous_entries = {} if force else load_manifest(manifest_path).get('entries', {})
+    sizes = sorted(set(sizes)) if sizes else None
+
+    entries = {}
+    tasks = []
+    skipped = failed = 0
+    sources = collect_inputs(inputs, recursive)
+    # Rejected before dispatch, so two workers never write the same file
+    conflicts = find_conflicts(sources, out_dir, formats)
+    for source, relative in sources:
+        if source in conflicts:
+            print(f"Not converting {source}: {conflicts[source]}", file=sys.stderr)
+            failed += 1
+            continue
+        key = relative.replace(os.sep, '/')
+        previous = previous_entries.get(key)
+        try:
+            digest, st = file_hash(source, previous)
+        except OSError as e:
+            print(f"Skipping {source}: {e}", file=sys.stderr)
+            continue
+        spec = hotspot_for(os.path.basename(relative), hotspot_rules)
+        settings = {'hotspot': spec if spec == 'center' else list(spec),
+                    'sizes': sizes, 'formats': sorted(formats), 'quality': quality}
+        sprite = sprite_for(os.path.basename(relative), sprite_rules)
+        if sprite is not None:
+            # Only set when used, so manifests written without sprites stay valid
+            settings['sprite'] = list(sprite)
+        entry = {'source': source, 'hash': digest, 'mtime_ns': st.st_mtime_ns,
+                 'size': st.st_size, 'settings': settings}
+        if _unchanged(previous, digest, settings, out_dir):
+            entries[key] = dict(previous, source=source, mtime_ns=st.st_mtime_ns, size=st.st_size)
+            skipped += 1
+            continue
+        entries[key] = entry
+        tasks.append((key, (source, relative, out_dir, spec, sizes, tuple(formats), quality, sprite)))
+
+    converted = 0
+    if tasks:
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+            futures = {pool.submit(convert_one, task): key for key, task in tasks}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    entries[key].update(future.result())
+                    converted += 1
+                except Exception as e:
+                    print(f"Failed to convert {entries[key]['source']}: {e}", file=sys.stderr)
+                    del entries[key]
+                    failed += 1
+
+    manifest = {'version': MANIFEST_VERSION, 'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'entries': dict(sorted(entries.items()))}
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return converted, skipped, failed
+
+
+def _sizes(value):
+    try:
+        sizes = [int(v) for v in value.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size list '{value}'")
+    if not sizes or any(s < 1 or s > 256 for s in sizes):
+        raise argparse.ArgumentTypeError("Cursor sizes must be between 1 and 256")
+    return sizes
+
+
+def _formats(value):
+    formats = [v.strip().lower() for v in value.split(',') if v.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"Unknown format(s): {', '.join(unknown) or value}")
+    return formats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m custom_cursor_app",
+                                     description="Custom Cursor App command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser("convert", help="Convert images into cursor files")
+    convert_parser.add_argument("inputs", nargs="+", help="Image files, directories or glob patterns")
+    convert_parser.add_argument("-o", "--output", required=True, help="Output directory")
+    convert_parser.add_argument("--hotspot", action="append", default=[], metavar="[PATTERN=]X,Y",
+                                help="Hotspot rule; PATTERN matches file names, X,Y may be 'center'. "
+                                     "The first matching rule wins (default 0,0)")
+    convert_parser.add_argument("--sprite", action="append", default=[], metavar="[PATTERN=]WxH",
+                                help="Slice matching images into WxH frames, row by row, and convert "
+                                     "them as animations")
+    convert_parser.add_argument("--sizes", type=_sizes, default=None,
+                                help="Comma-separated cursor sizes (default: every standard size up to the image)")
+    convert_parser.add_argument("--formats", type=_formats, default=['cur', 'ani'],
+                                help="Comma-separated outputs from cur, ani, png (default: cur,ani)")
+    convert_parser.add_argument("--quality", choices=list(MODES), default=DEFAULT_MODE,
+                                help=f"Downscaling quality (default: {DEFAULT_MODE})")
+    convert_parser.add_argument("-j", "--jobs", type=int, default=None,
+                                help="Worker processes (default: all cores)")
+    convert_parser.add_argument("-r", "--recursive", action="store_true", help="Descend into sub-directories")
+    convert_parser.add_argument("--manifest", default=None,
+                                help=f"Manifest path (default: OUTPUT/{MANIFEST_NAME})")
+    convert_parser.add_argument("--force", action="store_true", help="Convert even unchanged inputs")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        rules = parse_hotspot_rules(args.hotspot)
+        sprites = parse_sprite_rules(args.sprite)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    converted, skipped, failed = convert(args.inputs, args.output, rules, args.sizes, args.formats,
+                                         args.jobs, args.force, args.recursive, args.manifest,
+                                         args.quality, sprites)
+    print(f"Converted {converted}, skipped {skipped} unchanged, failed {failed} "
+          f"in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
@@ -0,0 +1,177 @@
+"""
+Windows cursor (.cur) and icon (.ico) file encoding.
+Writes one file holding every standard cursor size so the OS can pick the
+DPI-appropriate image without rescaling at runtime. Small sizes are stored as
+32-bit BGRA DIBs with an AND mask, large sizes as PNG. A pure-Python parser
+is included for reading the files back.
+"""
+
+import io
+import struct
+from collections import namedtuple
+
+from PIL import Image
+
+from .resample import chain_resizer
+
+CURSOR_SIZES = (16, 24, 32, 48, 64, 96, 128, 256)
+# Entries at least this large are stored as PNG instead of a DIB
+PNG_MIN_SIZE = 128
+
+TYPE_ICO = 1
+TYPE_CUR = 2
+
+_HEADER = struct.Struct('<HHH')
+_ENTRY = struct.Struct('<BBBBHHII')
+_BITMAPINFOHEADER = struct.Struct('<IiiHHIIiiII')
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+CursorEntry = namedtuple("CursorEntry", ["width", "height", "hotspot_x", "hotspot_y", "kind", "data"])
+
+
+def select_sizes(width, height, sizes=CURSOR_SIZES):
+    """Sizes worth emitting for a source image: no upscaling past the source"""
+    largest = max(width, height)
+    chosen = [size for size in sizes if size <= largest]
+    if not chosen or chosen[-1] < largest:
+        # Keep the next size up so the full source resolution is preserved
+        larger = [size for size in sizes if size > largest]
+        if larger:
+            chosen.append(larger[0])
+        elif not chosen:
+            chosen.append(sizes[-1])
+    return chosen
+
+
+def render_size(img, size, hotspot, resize=None):
+    """
+    Fit img into a size x size canvas without distorting its aspect ratio.
+    The image is anchored top-left and the hotspot is scaled to match.
+    Returns (canvas, (hotspot_x, hotspot_y)).
+    """
+    resize = resize or chain_resizer()
+    ratio = min(size / img.width, size / img.height)
+    scaled_size = (max(1, round(img.width * ratio)), max(1, round(img.height * ratio)))
+    scaled = img if scaled_size == img.size else resize(img, scaled_size)
+    if scaled.size == (size, size):
+        canvas = scaled
+    else:
+        canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        canvas.paste(scaled, (0, 0))
+    hotspot_x = min(int(hotspot[0] * ratio), size - 1)
+    hotspot_y = min(int(hotspot[1] * ratio), size - 1)
+    return canvas, (hotspot_x, hotspot_y)
+
+
+def encode_dib(img):
+    """Encode an RGBA image as a 32-bit bottom-up DIB with an AND mask"""
+    width, height = img.size
+    xor = img.tobytes('raw', 'BGRA', 0, -1)
+    # AND mask bit is set where the pixel is fully transparent; rows pad to 32 bits
+    mask = img.getchannel('A').point(lambda a: 255 if a == 0 else 0).convert('1', dither=Image.Dither.NONE)
+    mask_stride = (width + 31) // 32 * 4
+    and_mask = mask.tobytes('raw', '1', mask_stride, -1)
+    header = _BITMAPINFOHEADER.pack(40, width, height * 2, 1, 32, 0, len(xor) + len(and_mask), 0, 0, 0, 0)
+    return header + xor + and_mask
+
+
+def encode_png(img):
+    """Encode an RGBA image as PNG"""
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def encode_cur(img, hotspot=(0, 0), sizes=None, resize=None, file_type=TYPE_CUR):
+    """
+    Encode img as a multi-resolution cursor (or icon) file and return the bytes.
+    hotspot is given in source image pixels and scaled for each size; resize
+    is called as resize(img, (width, height)) and may return cached results;
+    by default every size is scaled from one shared mip chain.
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    if sizes is None:
+        sizes = select_sizes(img.width, img.height)
+    resize = resize or chain_resizer()
+
+    entries = []
+    for size in sizes:
+        canvas, (hotspot_x, hotspot_y) = render_size(img, size, hotspot, resize)
+        data = encode_png(canvas) if size >= PNG_MIN_SIZE else encode_dib(canvas)
+        entries.append((size, hotspot_x, hotspot_y, data))
+    return pack_entries(entries, file_type)
+
+
+def pack_entries(entries, file_type=TYPE_CUR):
+    """Pack (size, hotspot_x, hotspot_y, data) entries into a .cur/.ico file"""
+    out = bytearray(_HEADER.pack(0, file_type, len(entries)))
+    offset = _HEADER.size + _ENTRY.size * len(entries)
+    for size, hotspot_x, hotspot_y, data in entries:
+        dimension = size if size < 256 else 0  # 0 means 256
+        if file_type == TYPE_CUR:
+            field1, field2 = hotspot_x, hotspot_y
+        else:
+            field1, field2 = 1, 32  # Color planes and bits per pixel
+        out += _ENTRY.pack(dimension, dimension, 0, 0, field1, field2, len(data), offset)
+        offset += len(data)
+    for _, _, _, data in entries:
+        out += data
+    return bytes(out)
+
+
+def write_cur(path, img, hotspot=(0, 0), sizes=None, resize=None):
+    """Encode img as a multi-resolution .cur file at path"""
+    data = encode_cur(img, hotspot, sizes, resize)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
+
+
+def _decode_dib(data, width, height):
+    # Convert the bottom-up BGRA rows back to top-down RGBA
+    header = _BITMAPINFOHEADER.unpack_from(data, 0)
+    header_size, bit_count = header[0], header[4]
+    if bit_count != 32:
+        raise ValueError(f"Unsupported DIB bit depth: {bit_count}")
+    stride = width * 4
+    pixels = bytearray(stride * height)
+    for row in range(height):
+        src = header_size + (height - 1 - row) * stride
+        line = data[src:src + stride]
+        dst = row * stride
+        pixels[dst:dst + stride:4] = line[2::4]
+        pixels[dst + 1:dst + stride:4] = line[1::4]
+        pixels[dst + 2:dst + stride:4] = line[0::4]
+        pixels[dst + 3:dst + stride:4] = line[3::4]
+    return bytes(pixels)
+
+
+def parse_cur(data):
+    """
+    Parse a .cur/.ico file without PIL.
+    Returns a list of CursorEntry; DIB entries are decoded to top-down RGBA
+    bytes, PNG entries keep their PNG bytes.
+    """
+    reserved, file_type, count = _HEADER.unpack_from(data, 0)
+    if reserved != 0 or file_type not in (TYPE_ICO, TYPE_CUR):
+        raise ValueError("Not a cursor or icon file")
+    entries = []
+    for index in range(count):
+        width, height, _, _, field1, field2, size, offset = _ENTRY.unpack_from(
+            data, _HEADER.size + index * _ENTRY.size)
+        width = width or 256
+        height = height or 256
+        blob = data[offset:offset + size]
+        if len(blob) != size:
+            raise ValueError(f"Entry {index} is truncated")
+        hotspot = (field1, field2) if file_type == TYPE_CUR else (0, 0)
+        if blob.startswith(_PNG_SIGNATURE):
+            png_width, png_height = struct.unpack_from('>II', blob, 16)
+            if (png_width, png_height) != (width, height):
+                raise ValueError(f"Entry {index} PNG size does not match its directory entry")
+            entries.append(CursorEntry(width, height, hotspot[0], hotspot[1], 'png', blob))
+        else:
+            entries.append(CursorEntry(width, height, hotspot[0], hotspot[1], 'dib',
+                                       _decode_dib(blob, width, height)))
+    return entries
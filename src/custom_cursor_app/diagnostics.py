@@ -0,0 +1,85 @@
+"""
+Hidden diagnostics panel (Ctrl+Alt+Shift+D in the main window).
+Shows the telemetry counters and histograms, refreshed twice a second while
+the panel is visible. Opening it turns telemetry collection on.
+"""
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (QFileDialog, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+                             QTableWidgetItem, QVBoxLayout, QWidget)
+
+from .telemetry import TELEMETRY
+
+REFRESH_MS = 500
+COLUMNS = ("metric", "count", "per s", "mean us", "p50 us", "p99 us", "max us")
+
+
+class DiagnosticsPanel(QWidget):
+    """Live table of timer, event filter and overlay costs"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Custom Cursors - Diagnostics")
+        self.resize(640, 360)
+
+        self.summary = QLabel()
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        save_button = QPushButton("Save JSON...")
+        save_button.clicked.connect(self.save)
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.summary, 1)
+        buttons.addWidget(reset_button)
+        buttons.addWidget(save_button)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(buttons)
+        layout.addWidget(self.table)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        TELEMETRY.enable()
+        self.refresh()
+        self._timer.start(REFRESH_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        # The panel itself should not tick while nobody is looking
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def reset(self):
+        TELEMETRY.reset()
+        self.refresh()
+
+    def save(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Telemetry", "telemetry.json", "JSON Files (*.json)")
+        if path:
+            TELEMETRY.dump(path)
+
+    def refresh(self):
+        """Rebuild the table from a fresh snapshot"""
+        snapshot = TELEMETRY.snapshot()
+        rows = []
+        for name, h in snapshot['histograms'].items():
+            rows.append((name, h['count'], h['per_second'], h['mean_us'], h['p50_us'], h['p99_us'], h['max_us']))
+        for name, c in snapshot['counters'].items():
+            rows.append((name, c['count'], c['per_second'], None, None, None, None))
+
+        self.summary.setText(f"{snapshot['elapsed_s']:.1f} s since reset")
+        self.table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                if value is None:
+                    text = ""
+                elif isinstance(value, float):
+                    text = f"{value:.1f}"
+                else:
+                    text = str(value)
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.table.resizeColumnsToContents()
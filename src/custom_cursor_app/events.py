@@ -0,0 +1,58 @@
+"""
+Application-wide event dispatch for cursor maintenance.
+The filter sees every event in the application, so it only does a frozenset
+membership test per event and is uninstalled whenever no custom cursor is
+active.
+"""
+
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+
+from .telemetry import timed
+
+ACTIVATION_EVENTS = frozenset({
+    QEvent.Type.ApplicationActivate,
+    QEvent.Type.WindowActivate,
+})
+POINTER_EVENTS = frozenset({
+    QEvent.Type.MouseMove,
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseButtonRelease,
+    QEvent.Type.HoverMove,
+})
+WATCHED_EVENTS = ACTIVATION_EVENTS | POINTER_EVENTS
+
+
+class CursorEventFilter(QObject):
+    """Forwards activation and pointer events to a CursorMaintenance scheduler"""
+    def __init__(self, maintenance, parent=None):
+        super().__init__(parent)
+        self._poke = maintenance.poke
+        self._invalidate = maintenance.invalidate
+        self.installed = False
+        # Follow the scheduler so the filter only exists while a cursor is applied
+        maintenance.activeChanged.connect(self.set_installed)
+
+    def set_installed(self, installed):
+        """Install or uninstall the filter on the application"""
+        app = QApplication.instance()
+        if app is None or installed == self.installed:
+            return
+        if installed:
+            app.installEventFilter(self)
+        else:
+            app.removeEventFilter(self)
+        self.installed = installed
+
+    @timed("event_filter")
+    def eventFilter(self, watched, event):
+        kind = event.type()
+        if kind not in WATCHED_EVENTS:
+            return False
+        if kind in ACTIVATION_EVENTS:
+            # Another app had focus and may have set its own cursor
+            self._invalidate()
+        else:
+            # Mouse activity only cuts the maintenance backoff short
+            self._poke()
+        return False
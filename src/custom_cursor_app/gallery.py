@@ -0,0 +1,312 @@
+"""
+Model/view classes for browsing cursor collections.
+Views only request data for rows they paint; library thumbnails come from the
+packed index, while cursor-pack thumbnails are decoded on a background thread
+pool for visible rows and kept in a bounded pixmap cache.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, QRunnable, QSize, Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QListView
+
+from .jobs import worker_pool
+from .library import THUMB_SIZE, make_thumbnail
+
+logger = logging.getLogger(__name__)
+
+EntryRole = Qt.ItemDataRole.UserRole + 1
+PathRole = Qt.ItemDataRole.UserRole + 2
+
+PACK_EXTENSIONS = ('.png', '.apng', '.gif')
+
+
+class LibraryModel(QAbstractListModel):
+    """Exposes a CursorLibrary's index; thumbnails come straight from index.bin"""
+    def __init__(self, library, parent=None):
+        super().__init__(parent)
+        self.library = library
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.library)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.library.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.name
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixels = self.library.thumbnail(entry.index)
+            image = QImage(pixels, THUMB_SIZE, THUMB_SIZE, THUMB_SIZE * 4, QImage.Format.Format_RGBA8888)
+            return QPixmap.fromImage(image)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{entry.name} ({entry.width}x{entry.height})"
+        if role == EntryRole:
+            return entry
+        return None
+
+    def reload(self):
+        """Re-read the library index and refresh every view"""
+        self.beginResetModel()
+        self.library.load()
+        self.endResetModel()
+
+
+class CursorListView(QListView):
+    """Icon grid with uniform item sizes so only visible rows are laid out"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.setIconSize(QSize(THUMB_SIZE, THUMB_SIZE))
+        self.setGridSize(QSize(THUMB_SIZE + 28, THUMB_SIZE + 28))
+
+
+class ThumbnailCache:
+    """Bounded LRU cache of thumbnail pixmaps"""
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self._pixmaps = OrderedDict()
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    def get(self, key):
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def put(self, key, pixmap):
+        self._pixmaps[key] = pixmap
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self.capacity:
+            self._pixmaps.popitem(last=False)
+
+    def clear(self):
+        self._pixmaps.clear()
+
+
+def _modified(path):
+    """The file's mtime, or None if it cannot be read"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _LoaderSignals(QObject):
+    loaded = pyqtSignal(int, int, object, object)
+
+
+class _ThumbnailJob(QRunnable):
+    """Decodes one source image into a thumbnail QImage on a pool thread"""
+    def __init__(self, signals, generation, row, path):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = signals
+        self.generation = generation
+        self.row = row
+        self.path = path
+
+    def run(self):
+        from PIL import Image
+
+        # Taken before decoding, so a file replaced meanwhile is decoded again
+        mtime = _modified(self.path)
+        try:
+            with Image.open(self.path) as img:
+                # Let PIL take its cheap reduction path for large sources
+                img.thumbnail((THUMB_SIZE * 2, THUMB_SIZE * 2), Image.BILINEAR, reducing_gap=2.0)
+                pixels = make_thumbnail(img.convert('RGBA'))
+            image = QImage(pixels, THUMB_SIZE, THUMB_SIZE, THUMB_SIZE * 4, QImage.Format.Format_RGBA8888).copy()
+        except Exception as e:
+            logger.warning("Failed to load thumbnail for %s: %s", self.path, e)
+            image = None
+        self.signals.loaded.emit(self.generation, self.row, image, mtime)
+
+
+class ThumbnailLoader(QObject):
+    """Decodes thumbnails on a background pool, dropping requests that scrolled away"""
+    loaded = pyqtSignal(int, object, object)
+
+    def __init__(self, parent=None, threads=None):
+        super().__init__(parent)
+        # Decoding must never compete with painting the GUI thread
+        self.pool = worker_pool(self, threads, QThread.Priority.LowPriority)
+        self.generation = 0
+        self.decoded = 0
+        self._pending = {}
+        self._signals = _LoaderSignals(self)
+        self._signals.loaded.connect(self._on_loaded)
+
+    def request(self, row, path):
+        """Queue a thumbnail decode for row unless one is already pending"""
+        if row in self._pending:
+            return
+        job = _ThumbnailJob(self._signals, self.generation, row, path)
+        self._pending[row] = job
+        self.pool.start(job)
+
+    def keep_only(self, first, last):
+        """Cancel queued decodes for rows outside first..last"""
+        for row in [r for r in self._pending if r < first or r > last]:
+            if self.pool.tryTake(self._pending[row]):
+                del self._pending[row]
+
+    def reset(self):
+        """Drop every pending decode; results still in flight are ignored"""
+        self.pool.clear()
+        self._pending.clear()
+        self.generation += 1
+
+    def shutdown(self):
+        """Cancel queued decodes and wait for running ones (see worker_pool)"""
+        self.reset()
+        self.pool.waitForDone()
+
+    def _on_loaded(self, generation, row, image, mtime):
+        if generation != self.generation:
+            return
+        self._pending.pop(row, None)
+        self.decoded += 1
+        self.loaded.emit(row, image, mtime)
+
+
+class CursorPackModel(QAbstractListModel):
+    """A directory of cursor images whose thumbnails are decoded only when visible"""
+    def __init__(self, parent=None, cache_size=512):
+        super().__init__(parent)
+        self.paths = []
+        self.cache = ThumbnailCache(cache_size)
+        self.loader = ThumbnailLoader(self)
+        self.loader.loaded.connect(self._on_thumbnail)
+        self._placeholder = QPixmap(THUMB_SIZE, THUMB_SIZE)
+        self._placeholder.fill(Qt.GlobalColor.transparent)
+        self._broken = self._broken_placeholder()
+        # mtime of each path that failed to decode; not retried until it changes
+        self._failed = {}
+        # Thumbnails arriving together are announced with a single dataChanged
+        self._changed = []
+        self._notify_timer = QTimer(self)
+        self._notify_timer.setSingleShot(True)
+        self._notify_timer.timeout.connect(self._notify_changed)
+
+    def set_paths(self, paths):
+        """Show the given image paths"""
+        self.beginResetModel()
+        self.loader.reset()
+        self.cache.clear()
+        self._failed.clear()
+        self._changed = []
+        self.paths = list(paths)
+        self.endResetModel()
+
+    def set_directory(self, directory):
+        """Show every cursor image found in a directory"""
+        entries = sorted(e.path for e in os.scandir(directory)
+                         if e.is_file() and e.name.lower().endswith(PACK_EXTENSIONS))
+        self.set_paths(entries)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        path = self.paths[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.splitext(os.path.basename(path))[0]
+        if role == Qt.ItemDataRole.DecorationRole:
+            # Views only ask for rows they paint, so this is where decoding is triggered
+            pixmap = self.cache.get(path)
+            if pixmap is not None:
+                return pixmap
+            if path in self._failed:
+                if self._failed[path] == _modified(path):
+                    return self._broken
+                del self._failed[path]
+            self.loader.request(row, path)
+            return self._placeholder
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return path
+        if role == PathRole:
+            return path
+        return None
+
+    def close(self):
+        """Stop background decoding before the model is dropped"""
+        self.loader.shutdown()
+
+    def set_visible_rows(self, first, last):
+        """Cancel decodes for rows that are no longer on screen"""
+        self.loader.keep_only(first, last)
+
+    def _on_thumbnail(self, row, image, mtime):
+        if row >= len(self.paths):
+            return
+        if image is None:
+            self._failed[self.paths[row]] = mtime
+        else:
+            self.cache.put(self.paths[row], QPixmap.fromImage(image))
+        self._changed.append(row)
+        if not self._notify_timer.isActive():
+            self._notify_timer.start(0)
+
+    @staticmethod
+    def _broken_placeholder():
+        """A crossed-out frame shown for images that could not be decoded"""
+        pixmap = QPixmap(THUMB_SIZE, THUMB_SIZE)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setPen(QPen(QColor(160, 160, 160), 2))
+        inset = THUMB_SIZE // 4
+        painter.drawRect(inset, inset, THUMB_SIZE - 2 * inset, THUMB_SIZE - 2 * inset)
+        painter.drawLine(inset, inset, THUMB_SIZE - inset, THUMB_SIZE - inset)
+        painter.drawLine(inset, THUMB_SIZE - inset, THUMB_SIZE - inset, inset)
+        painter.end()
+        return pixmap
+
+    def _notify_changed(self):
+        if not self._changed:
+            return
+        first, last = min(self._changed), max(self._changed)
+        self._changed = []
+        self.dataChanged.emit(self.index(first), self.index(last), [Qt.ItemDataRole.DecorationRole])
+
+
+class CursorGalleryView(CursorListView):
+    """Gallery view that tells its model which rows are on screen"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.verticalScrollBar().valueChanged.connect(self._report_visible_rows)
+
+    def visible_rows(self):
+        """Return the (first, last) rows currently in the viewport"""
+        viewport = self.viewport().rect()
+        first = self.indexAt(viewport.topLeft())
+        last = self.indexAt(viewport.bottomRight())
+        model = self.model()
+        first_row = first.row() if first.isValid() else 0
+        last_row = last.row() if last.isValid() else (model.rowCount() - 1 if model else -1)
+        return first_row, last_row
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._report_visible_rows()
+
+    def _report_visible_rows(self, *args):
+        model = self.model()
+        if hasattr(model, 'set_visible_rows'):
+            model.set_visible_rows(*self.visible_rows())
@@ -0,0 +1,179 @@
+"""
+Image decode/normalize pipeline shared by the preview and the apply paths.
+Images are decoded once into RGBA, cleared of stray halo pixels (see
+pixels.py) and cached by content hash together with every derived size,
+within an LRU memory budget. Sizes are scaled through a cached mip chain
+(see resample.py), so every size of an image shares the same reductions.
+File hashes are remembered per (path, mtime, size) so unchanged files are
+never re-read.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from .pixels import clean_alpha
+from .resample import DEFAULT_MODE, MipChain
+
+# Default memory budget for decoded and resized images (bytes)
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+# Pillow allocates large images in blocks of this size. Blocks above glibc's
+# largest dynamic mmap threshold (32 MB) always come from the OS already
+# zeroed; smaller ones are reused from the heap and cleared while Pillow
+# holds the GIL, which stalled the GUI for ~50 ms per large decode.
+Image.core.set_block_size(64 * 1024 * 1024)
+
+
+def fit_size(width, height, max_size):
+    """Largest size within max_size x max_size that keeps the aspect ratio"""
+    if width <= max_size and height <= max_size:
+        return width, height
+    ratio = min(max_size / width, max_size / height)
+    return max(1, int(width * ratio)), max(1, int(height * ratio))
+
+
+class ImagePipeline:
+    """Content-addressed cache of decoded RGBA images and their derived sizes"""
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._hashes = {}
+        self._images = OrderedDict()
+        self._sizes = {}
+
+    def content_hash(self, path):
+        """Return the content hash of the file at path"""
+        return self._resolve(path)[0]
+
+    def load(self, path):
+        """
+        Return the decoded RGBA image for path.
+        The image is shared with the cache and must not be modified.
+        """
+        digest, data = self._resolve(path)
+        with self._lock:
+            img = self._get((digest, 'rgba'))
+            if img is not None:
+                return img
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        # Decode into RGBA, dropping faint halo pixels and the hidden color of
+        # transparent ones; opaque images skip the alpha pass
+        img = clean_alpha(Image.open(io.BytesIO(data)))
+        img.load()
+        # Cached cleaned, so the alpha pass runs once per content hash
+        with self._lock:
+            self._put((digest, 'rgba'), img)
+        return img
+
+    def mip_chain(self, path):
+        """Return the cached MipChain of the image at path"""
+        source = self.load(path)
+        key = (self.content_hash(path), 'mip')
+        with self._lock:
+            chain = self._get(key)
+            if chain is None:
+                chain = MipChain(source)
+                self._put(key, chain)
+        return chain
+
+    def resized(self, path, size, mode=DEFAULT_MODE):
+        """Return the image resized to exactly size = (width, height) with a resample.MODES quality"""
+        source = self.load(path)
+        if source.size == tuple(size):
+            return source
+        digest = self.content_hash(path)
+        key = (digest, 'size', tuple(size), mode)
+        with self._lock:
+            img = self._get(key)
+            if img is not None:
+                return img
+        # Resizing runs outside the pipeline lock so workers scale in parallel
+        chain = self.mip_chain(path)
+        img = chain.resize(size, mode)
+        with self._lock:
+            # The chain grows new levels on demand; account for them here
+            self._grow((digest, 'mip'), chain)
+            # Another thread may have made the same size meanwhile
+            img = self._images.get(key, img)
+            self._put(key, img)
+        return img
+
+    def fitted(self, path, max_size, mode=DEFAULT_MODE):
+        """Return the image scaled down to fit max_size, keeping the aspect ratio"""
+        source = self.load(path)
+        return self.resized(path, fit_size(source.width, source.height, max_size), mode)
+
+    def clear(self):
+        with self._lock:
+            self._hashes.clear()
+            self._images.clear()
+            self._sizes.clear()
+            self.memory = 0
+
+    def _resolve(self, path):
+        # Hash the file only when its path, mtime or size is new
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stat_key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._hashes.get(stat_key)
+        if digest is not None:
+            return digest, None
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        with self._lock:
+            self._hashes[stat_key] = digest
+        return digest, data
+
+    def _get(self, key):
+        img = self._images.get(key)
+        if img is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._images.move_to_end(key)
+        return img
+
+    @staticmethod
+    def _nbytes(entry):
+        if isinstance(entry, MipChain):
+            return entry.nbytes
+        return entry.width * entry.height * 4
+
+    def _put(self, key, entry):
+        if key in self._images:
+            return
+        self._images[key] = entry
+        self._sizes[key] = self._nbytes(entry)
+        self.memory += self._sizes[key]
+        self._evict()
+
+    def _grow(self, key, entry):
+        # Re-measure an entry that is still cached
+        if self._images.get(key) is not entry:
+            return
+        size = self._nbytes(entry)
+        self.memory += size - self._sizes[key]
+        self._sizes[key] = size
+        self._evict()
+
+    def _evict(self):
+        # Evict least recently used entries, always keeping the newest one
+        while self.memory > self.budget and len(self._images) > 1:
+            key, _ = self._images.popitem(last=False)
+            self.memory -= self._sizes.pop(key)
+
+
+# Pipeline shared by the preview and the platform apply paths
+image_pipeline = ImagePipeline()
@@ -0,0 +1,156 @@
+"""
+Background jobs for image loading and cursor encoding.
+Job functions run on a QThreadPool and hand progress, results and errors back
+to the GUI thread through JobRunner's signals. Jobs are keyed by purpose
+("load", "apply", ...); submitting a job under a key that is still busy
+cancels the older one, so only the latest request ever reports back.
+"""
+
+import threading
+
+from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+
+def worker_pool(owner, threads=None, priority=None):
+    """
+    Create a QThreadPool owned by owner, with threads workers (by default one
+    per core but the GUI thread's, at least two). owner.shutdown() is called
+    when the app quits and must end with pool.waitForDone(): the pool's
+    destructor waits for its workers while holding the GIL they need to finish.
+    """
+    pool = QThreadPool(owner)
+    pool.setMaxThreadCount(threads or max(2, QThread.idealThreadCount() - 1))
+    if priority is not None:
+        pool.setThreadPriority(priority)
+    app = QCoreApplication.instance()
+    if app is not None:
+        app.aboutToQuit.connect(owner.shutdown)
+    return pool
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function once its job has been cancelled"""
+
+
+class Job:
+    """Handle passed to a job function for progress reports and cancellation checks"""
+    def __init__(self, key, signals):
+        self.key = key
+        self._signals = signals
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check(self):
+        """Stop the job here if it has been cancelled"""
+        if self._cancelled.is_set():
+            raise JobCancelled(self.key)
+
+    def report(self, percent):
+        """Report progress (0-100); also a cancellation point"""
+        self.check()
+        self._signals.progress.emit(self, int(percent))
+
+
+class _JobSignals(QObject):
+    progress = pyqtSignal(object, int)
+    done = pyqtSignal(object, object)
+    error = pyqtSignal(object, object)
+
+
+class _JobRunnable(QRunnable):
+    def __init__(self, job, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.job = job
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        job = self.job
+        try:
+            result = self.fn(job, *self.args, **self.kwargs)
+        except JobCancelled:
+            job._signals.done.emit(job, None)
+        except Exception as e:
+            job._signals.error.emit(job, e)
+        else:
+            job._signals.done.emit(job, result)
+
+
+class JobRunner(QObject):
+    """Runs job functions fn(job, *args) off the GUI thread, one live job per key"""
+    progress = pyqtSignal(str, int)
+    finished = pyqtSignal(str, object)
+    failed = pyqtSignal(str, object)
+    cancelled = pyqtSignal(str)
+
+    def __init__(self, parent=None, threads=None):
+        super().__init__(parent)
+        self.pool = worker_pool(self, threads)
+        self._jobs = {}
+        self._signals = _JobSignals(self)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.done.connect(self._on_done)
+        self._signals.error.connect(self._on_error)
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Run fn(job, *args, **kwargs) in the background, cancelling any job under key"""
+        self.cancel(key)
+        job = Job(key, self._signals)
+        runnable = _JobRunnable(job, fn, args, kwargs)
+        self._jobs[key] = (job, runnable)
+        self.pool.start(runnable)
+        return job
+
+    def cancel(self, key):
+        """Cancel the job under key; it reports cancelled instead of finished"""
+        current = self._jobs.pop(key, None)
+        if current is None:
+            return
+        job, runnable = current
+        job.cancel()
+        if self.pool.tryTake(runnable):
+            # Never started, so nothing else will report it
+            self.cancelled.emit(key)
+
+    def is_running(self, key):
+        return key in self._jobs
+
+    def shutdown(self):
+        """Cancel every job and wait for running ones to stop (see worker_pool)"""
+        for key in list(self._jobs):
+            self.cancel(key)
+        self.pool.waitForDone()
+
+    def _is_current(self, job):
+        current = self._jobs.get(job.key)
+        return current is not None and current[0] is job
+
+    def _on_progress(self, job, percent):
+        if self._is_current(job) and not job.cancelled:
+            self.progress.emit(job.key, percent)
+
+    def _on_done(self, job, result):
+        if not self._is_current(job):
+            # Superseded or cancelled while running
+            self.cancelled.emit(job.key)
+            return
+        del self._jobs[job.key]
+        if job.cancelled:
+            self.cancelled.emit(job.key)
+        else:
+            self.finished.emit(job.key, result)
+
+    def _on_error(self, job, error):
+        if not self._is_current(job):
+            self.cancelled.emit(job.key)
+            return
+        del self._jobs[job.key]
+        self.failed.emit(job.key, error)
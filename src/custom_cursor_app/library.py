@@ -0,0 +1,203 @@
+"""
+Persistent cursor library under ~/.custom_cursor_app/library.
+Source images are stored content-addressed in assets/, and index.bin packs
+every entry's hash, dimensions, hotspot, name and a raw RGBA thumbnail into
+fixed-size records. Listing the library reads only those records, so
+thousands of entries load without decoding a single source image.
+"""
+
+import logging
+import mmap
+import os
+import shutil
+import struct
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), ".custom_cursor_app", "library")
+
+THUMB_SIZE = 48
+THUMB_BYTES = THUMB_SIZE * THUMB_SIZE * 4
+
+MAGIC = b'CCLIB\x00\x00\x01'
+_HEADER = struct.Struct('<8sII')           # magic, record size, entry count
+_RECORD = struct.Struct('<20sHHHH8s64s')   # digest, width, height, hotspot x/y, extension, name
+ENTRY_SIZE = _RECORD.size + THUMB_BYTES
+
+LibraryEntry = namedtuple("LibraryEntry",
+                          ["index", "digest", "width", "height", "hotspot_x", "hotspot_y", "ext", "name"])
+
+
+def make_thumbnail(img, size=THUMB_SIZE):
+    """Fit img into a size x size transparent square and return its RGBA bytes"""
+    from PIL import Image
+
+    thumb = img.copy()
+    thumb.thumbnail((size, size), Image.LANCZOS)
+    canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    canvas.paste(thumb, ((size - thumb.width) // 2, (size - thumb.height) // 2))
+    return canvas.tobytes()
+
+
+class CursorLibrary:
+    """
+    Cursor assets plus a packed index of their metadata and thumbnails.
+    The index is changed on the GUI thread; find() also runs on workers (in
+    prepare), so the entry table is only swapped or extended under a lock.
+    """
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.assets_dir = os.path.join(root, "assets")
+        self.encoded_dir = os.path.join(root, "encoded")
+        self.index_path = os.path.join(root, "index.bin")
+        self.entries = []
+        self._by_digest = {}
+        self._lock = threading.Lock()
+        self._map = None
+        self._file = None
+        self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def load(self):
+        """Read the index records (thumbnails stay on disk until requested)"""
+        count = self._open_map()
+        entries = [self._read_entry(index) for index in range(count)]
+        with self._lock:
+            self.entries = entries
+            self._by_digest = {entry.digest: entry for entry in entries}
+
+    def _open_map(self):
+        # Map the index and return the number of complete entries in it
+        self.close()
+        if not os.path.exists(self.index_path) or os.path.getsize(self.index_path) < _HEADER.size:
+            return 0
+        self._file = open(self.index_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or record_size != ENTRY_SIZE:
+            logger.warning("Ignoring cursor library index with unknown format: %s", self.index_path)
+            self.close()
+            return 0
+        # Trust only complete entries in case a write was interrupted
+        return min(count, (len(self._map) - _HEADER.size) // ENTRY_SIZE)
+
+    def _read_entry(self, index):
+        digest, width, height, hotspot_x, hotspot_y, ext, name = _RECORD.unpack_from(
+            self._map, _HEADER.size + index * ENTRY_SIZE)
+        return LibraryEntry(index, digest.hex(), width, height, hotspot_x, hotspot_y,
+                            ext.rstrip(b'\0').decode('ascii'),
+                            name.rstrip(b'\0').decode('utf-8', 'replace'))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def find(self, digest):
+        """Return the entry with the given content hash, or None"""
+        with self._lock:
+            return self._by_digest.get(digest)
+
+    def thumbnail(self, index):
+        """Raw RGBA bytes of the THUMB_SIZE x THUMB_SIZE thumbnail for an entry"""
+        offset = _HEADER.size + index * ENTRY_SIZE + _RECORD.size
+        return self._map[offset:offset + THUMB_BYTES]
+
+    def asset_path(self, entry):
+        """Path of the stored source image for an entry"""
+        return os.path.join(self.assets_dir, entry.digest + entry.ext)
+
+    def encoded_path(self, entry, suffix, hotspot=None):
+        """Path where an encoded form (e.g. '.cur') of an entry is cached"""
+        hotspot_x, hotspot_y = hotspot if hotspot is not None else (entry.hotspot_x, entry.hotspot_y)
+        os.makedirs(self.encoded_dir, exist_ok=True)
+        return os.path.join(self.encoded_dir, f"{entry.digest}-{hotspot_x}-{hotspot_y}{suffix}")
+
+    def add(self, path, hotspot=(0, 0), name=None):
+        """Copy an image into the library and index it; existing content is reused"""
+        return self.commit(*self.prepare(path, hotspot, name))
+
+    def prepare(self, path, hotspot=(0, 0), name=None):
+        """
+        Decode and store an image's asset and build its index record.
+        This does all the I/O of add() without touching the index, so it can run
+        on a worker thread. Returns (digest, blob) for commit(); blob is None
+        when the content is already indexed.
+        """
+        from .imaging import image_pipeline
+
+        digest = image_pipeline.content_hash(path)
+        if self.find(digest) is not None:
+            return digest, None
+
+        img = image_pipeline.load(path)
+        ext = os.path.splitext(path)[1].lower()[:8] or '.png'
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        encoded_name = name.encode('utf-8')[:64]
+
+        os.makedirs(self.assets_dir, exist_ok=True)
+        asset = os.path.join(self.assets_dir, digest + ext)
+        if not os.path.exists(asset):
+            shutil.copyfile(path, asset)
+
+        record = _RECORD.pack(bytes.fromhex(digest), img.width, img.height,
+                              hotspot[0], hotspot[1], ext.encode('ascii'), encoded_name)
+        return digest, record + make_thumbnail(img)
+
+    def commit(self, digest, blob):
+        """Index a record built by prepare() and return its entry"""
+        if blob is not None and self.find(digest) is None:
+            self._append(blob)
+        return self.find(digest)
+
+    def remove(self, digest):
+        """Drop an entry from the index and delete its stored asset"""
+        entry = self.find(digest)
+        if entry is None:
+            return
+        kept = [e for e in self.entries if e.digest != digest]
+        blobs = [bytes(self._map[_HEADER.size + e.index * ENTRY_SIZE:_HEADER.size + (e.index + 1) * ENTRY_SIZE])
+                 for e in kept]
+        asset = self.asset_path(entry)
+        self._rewrite(blobs)
+        if os.path.exists(asset):
+            os.remove(asset)
+
+    def _append(self, blob):
+        os.makedirs(self.root, exist_ok=True)
+        count = len(self.entries)
+        self.close()
+        mode = 'r+b' if os.path.exists(self.index_path) else 'w+b'
+        with open(self.index_path, mode) as f:
+            # Write the entry first, then bump the count, so a crash never indexes half an entry
+            f.seek(_HEADER.size + count * ENTRY_SIZE)
+            f.write(blob)
+            f.truncate()
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, ENTRY_SIZE, count + 1))
+        # Only the new record needs parsing
+        self._open_map()
+        entry = self._read_entry(count)
+        with self._lock:
+            self.entries.append(entry)
+            self._by_digest[entry.digest] = entry
+
+    def _rewrite(self, blobs):
+        self.close()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, ENTRY_SIZE, len(blobs)))
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, self.index_path)
+        self.load()
@@ -0,0 +1,232 @@
+"""
+Cursor lifecycle: decides when the cursor timers may run.
+Nothing ticks until a custom cursor is applied. While one is applied, the
+tracker, maintenance scheduler and overlay animation are paused when the
+screen locks or the pointer has not moved for a while, and resumed on the
+next input. While paused, a native pointer monitor wakes the app, so no
+timer fires at all; only where no native monitor exists does a slow probe
+watch for input instead.
+"""
+
+import logging
+
+from PyQt6.QtCore import QAbstractNativeEventFilter, QCoreApplication, QObject, QTimer, Qt, pyqtSignal
+
+from .backends import CURRENT_OS
+from .tracking import CocoaBlocks, _qt_cursor_pos, install_native_monitor
+
+logger = logging.getLogger(__name__)
+
+# Pause after the pointer has been still this long (milliseconds)
+IDLE_TIMEOUT_MS = 120000
+# How often the pointer is sampled for idleness while active
+IDLE_CHECK_MS = 5000
+# Fallback input probe while idle when there is no native monitor
+WAKE_PROBE_MS = 1000
+
+INACTIVE = "inactive"
+ACTIVE = "active"
+PAUSED = "paused"
+
+
+class _MacSessionMonitor:
+    """Screen lock/unlock distributed notifications"""
+    LOCKED = "com.apple.screenIsLocked"
+    UNLOCKED = "com.apple.screenIsUnlocked"
+
+    def __init__(self, callback, window=None):
+        from Foundation import NSDistributedNotificationCenter
+
+        center = NSDistributedNotificationCenter.defaultCenter()
+        self._observers = CocoaBlocks(center.removeObserver_)
+        self._observers.add(center.addObserverForName_object_queue_usingBlock_, self.LOCKED, None, None,
+                            lambda note: callback(True))
+        self._observers.add(center.addObserverForName_object_queue_usingBlock_, self.UNLOCKED, None, None,
+                            lambda note: callback(False))
+
+    def remove(self):
+        self._observers.remove()
+
+
+class _WindowsSessionMonitor(QAbstractNativeEventFilter):
+    """WM_WTSSESSION_CHANGE lock/unlock messages delivered to the main window"""
+    WM_WTSSESSION_CHANGE = 0x02B1
+    WTS_SESSION_LOCK = 0x7
+    WTS_SESSION_UNLOCK = 0x8
+    NOTIFY_FOR_THIS_SESSION = 0
+
+    def __init__(self, callback, window):
+        super().__init__()
+        import ctypes
+        from ctypes import wintypes
+
+        self._callback = callback
+        self._msg = wintypes.MSG
+        self._wtsapi = ctypes.windll.wtsapi32
+        self._hwnd = int(window.winId())
+        if not self._wtsapi.WTSRegisterSessionNotification(self._hwnd, self.NOTIFY_FOR_THIS_SESSION):
+            raise OSError("WTSRegisterSessionNotification failed")
+        QCoreApplication.instance().installNativeEventFilter(self)
+
+    def nativeEventFilter(self, event_type, message):
+        if event_type == b"windows_generic_MSG":
+            msg = self._msg.from_address(int(message))
+            if msg.message == self.WM_WTSSESSION_CHANGE and msg.wParam in (self.WTS_SESSION_LOCK,
+                                                                         self.WTS_SESSION_UNLOCK):
+                self._callback(msg.wParam == self.WTS_SESSION_LOCK)
+        return False, 0
+
+    def remove(self):
+        QCoreApplication.instance().removeNativeEventFilter(self)
+        self._wtsapi.WTSUnRegisterSessionNotification(self._hwnd)
+
+
+def install_session_monitor(callback, window=None):
+    """Call callback(locked) on screen lock and unlock, or return None if unavailable"""
+    try:
+        if CURRENT_OS == 'Darwin':
+            return _MacSessionMonitor(callback, window)
+        if CURRENT_OS == 'Windows' and window is not None:
+            return _WindowsSessionMonitor(callback, window)
+    except Exception as e:
+        logger.info("Screen lock notifications unavailable: %s", e)
+    return None
+
+
+class CursorLifecycle(QObject):
+    """
+    Pauses and resumes participants (objects with pause() and resume()) as the
+    cursor is applied and removed, the screen locks, and the user goes idle.
+    """
+    stateChanged = pyqtSignal(str)
+
+    def __init__(self, window=None, idle_timeout=IDLE_TIMEOUT_MS, idle_check=IDLE_CHECK_MS,
+                 wake_probe=WAKE_PROBE_MS, source=None, monitor_factory=install_native_monitor,
+                 session_factory=install_session_monitor):
+        super().__init__(window)
+        self._window = window
+        self._source = source or _qt_cursor_pos
+        self._monitor_factory = monitor_factory
+        self._session_factory = session_factory
+        self.idle_timeout = idle_timeout
+        self.state = INACTIVE
+        self.applied = False
+        self.locked = False
+        self.idle = False
+        self._participants = []
+        self._position = None
+        self._still_ms = 0
+        self._wake_monitor = None
+        self._session = None
+        self._wake_pending = False
+        self.checks = 0
+        self.probes = 0
+
+        self._idle_timer = self._coarse_timer(idle_check, self._check_idle)
+        self._wake_timer = self._coarse_timer(wake_probe, self._probe_input)
+
+    def _coarse_timer(self, interval, slot):
+        # Neither timer needs to be exact, but Qt rounds VeryCoarseTimer
+        # intervals to whole seconds, which would turn a sub-second one into a busy loop
+        timer = QTimer(self)
+        timer.setInterval(interval)
+        timer.setTimerType(Qt.TimerType.VeryCoarseTimer if interval >= 1000 else Qt.TimerType.CoarseTimer)
+        timer.timeout.connect(slot)
+        return timer
+
+    def add(self, participant):
+        """Manage a participant, pausing it right away unless the cursor is running"""
+        self._participants.append(participant)
+        if self.state != ACTIVE:
+            participant.pause()
+
+    def set_active(self, active):
+        """A custom cursor was applied (True) or removed (False)"""
+        self.applied = active
+        if active:
+            if self._session is None:
+                self._session = self._session_factory(self.set_locked, self._window)
+            self.idle = False
+            self._update()
+        else:
+            if self._session is not None:
+                self._session.remove()
+                self._session = None
+            self.locked = False
+            self.idle = False
+            self._set_state(INACTIVE)
+
+    def set_locked(self, locked):
+        """The screen was locked (True) or unlocked (False)"""
+        self.locked = locked
+        if not locked:
+            self.idle = False
+        self._update()
+
+    def wake(self):
+        """Input was seen: leave the idle pause"""
+        self._wake_pending = False
+        if self.idle:
+            self.idle = False
+            self._update()
+
+    def _update(self):
+        if not self.applied:
+            return
+        self._set_state(PAUSED if (self.locked or self.idle) else ACTIVE)
+
+    def _set_state(self, state):
+        if state == self.state == INACTIVE:
+            return
+        previous = self.state
+        self.state = state
+
+        self._idle_timer.stop()
+        self._wake_timer.stop()
+        if self._wake_monitor is not None:
+            self._wake_monitor.remove()
+            self._wake_monitor = None
+
+        if state == ACTIVE:
+            self._position = self._source()
+            self._still_ms = 0
+            self._idle_timer.start()
+        elif state == PAUSED and self.idle and not self.locked:
+            # Wait for input without ticking if the platform can tell us about it
+            self._position = self._source()
+            self._wake_monitor = self._monitor_factory(self._on_native_input)
+            if self._wake_monitor is None:
+                self._wake_timer.start()
+
+        if state == previous:
+            return
+        for participant in self._participants:
+            if state == ACTIVE:
+                participant.resume()
+            else:
+                participant.pause()
+        logger.debug("Cursor lifecycle %s -> %s", previous, state)
+        self.stateChanged.emit(state)
+
+    def _check_idle(self):
+        self.checks += 1
+        position = self._source()
+        if position != self._position:
+            self._position = position
+            self._still_ms = 0
+            return
+        self._still_ms += self._idle_timer.interval()
+        if self._still_ms >= self.idle_timeout:
+            self.idle = True
+            self._update()
+
+    def _probe_input(self):
+        self.probes += 1
+        if self._source() != self._position:
+            self.wake()
+
+    def _on_native_input(self):
+        # Native callbacks can arrive inside a system hook; resume from the event loop
+        if not self._wake_pending:
+            self._wake_pending = True
+            QTimer.singleShot(0, self.wake)
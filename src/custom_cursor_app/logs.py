@@ -0,0 +1,157 @@
+"""
+Logging setup for the app.
+Records are handed to a queue on the calling thread and written by a
+background listener thread to a size-rotated file, so logging never blocks
+the GUI thread on disk I/O. Repeated records from the same call site are rate
+limited before they are queued, so an error storm from a timer callback
+cannot fill the disk.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+LOG_FILE = "app.log"
+MAX_BYTES = 2 * 1024 * 1024
+BACKUP_COUNT = 3
+
+# Environment overrides (a --log-level flag wins over LEVEL_ENV)
+LEVEL_ENV = "CUSTOM_CURSOR_LOG_LEVEL"
+FORMAT_ENV = "CUSTOM_CURSOR_LOG_FORMAT"
+DIR_ENV = "CUSTOM_CURSOR_LOG_DIR"
+
+DEFAULT_LEVEL = "INFO"
+
+# At most RATE_BURST records per call site every RATE_INTERVAL seconds
+RATE_BURST = 5
+RATE_INTERVAL = 10.0
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+
+def default_log_dir():
+    """Platform log directory (~/Library/Logs on macOS)"""
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Logs/CustomCursors")
+    return os.path.join(os.path.expanduser("~"), "CustomCursors", "logs")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `burst` records per call site (logger, file, line)
+    every `interval` seconds. The first record after a quiet period reports
+    how many were dropped.
+    """
+    def __init__(self, burst=RATE_BURST, interval=RATE_INTERVAL, clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sites = {}
+
+    def filter(self, record):
+        key = (record.name, record.pathname, record.lineno)
+        now = self._clock()
+        with self._lock:
+            window_start, count, suppressed = self._sites.get(key, (now, 0, 0))
+            if now - window_start >= self.interval:
+                window_start, count = now, 0
+            if count >= self.burst:
+                self._sites[key] = (window_start, count, suppressed + 1)
+                return False
+            self._sites[key] = (window_start, count + 1, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the standard fields plus any `extra` values"""
+    _STANDARD = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self._STANDARD and not key.startswith('_'):
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic text format, noting suppressed repeats"""
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" [{suppressed} similar messages suppressed]"
+        return text
+
+
+def configure_logging(level=None, log_dir=None, fmt=None, console=False):
+    """
+    Route all logging through a queue to a rotating file written on a
+    background thread. level/fmt/log_dir default to the environment
+    (CUSTOM_CURSOR_LOG_LEVEL, CUSTOM_CURSOR_LOG_FORMAT=json|text,
+    CUSTOM_CURSOR_LOG_DIR). Returns the log file path.
+    """
+    global _listener
+    shutdown_logging()
+
+    level = (level or os.environ.get(LEVEL_ENV) or DEFAULT_LEVEL).upper()
+    fmt = (fmt or os.environ.get(FORMAT_ENV) or "text").lower()
+    log_dir = log_dir or os.environ.get(DIR_ENV) or default_log_dir()
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, LOG_FILE)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding='utf-8', delay=True)
+    file_handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(TEXT_FORMAT))
+    handlers = [file_handler]
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(TextFormatter(TEXT_FORMAT))
+        handlers.append(stream_handler)
+
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, level, logging.INFO))
+
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return log_path
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
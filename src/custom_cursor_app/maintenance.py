@@ -0,0 +1,205 @@
+"""
+Custom cursor maintenance.
+A single scheduler owns all cursor reapply logic. It checks whether the
+custom cursor was replaced by someone else, reapplies it only then, and backs
+off exponentially while the cursor stays in place.
+"""
+
+import logging
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+from .telemetry import TELEMETRY, timed
+
+logger = logging.getLogger(__name__)
+
+# Checks that found the cursor replaced and put it back
+_REAPPLIED = TELEMETRY.counter("maintenance.reapply")
+
+# Check interval bounds in milliseconds
+MIN_CHECK_MS = 50
+MAX_CHECK_MS = 5000
+
+
+class CursorBackend:
+    """Checks and reapplies one layer of the custom cursor"""
+    def is_applied(self):
+        """Return True if the custom cursor is still the active one"""
+        raise NotImplementedError
+
+    def reapply(self):
+        """Make the custom cursor active again"""
+        raise NotImplementedError
+
+    def invalidate(self):
+        """Hint that the cursor was probably replaced; backends that can check it directly ignore this"""
+
+
+class NSCursorBackend(CursorBackend):
+    """
+    The NSCursor pushed by the macOS backend.
+    NSCursor.currentCursor() only reflects this app's key window, not what
+    other apps set, so the backend keeps its own flag instead: the cursor
+    counts as applied until invalidate() (on activation) and again after
+    each reapply.
+    """
+    def __init__(self, ns_cursor, ns_cursor_class=None):
+        if ns_cursor_class is None:
+            from Cocoa import NSCursor as ns_cursor_class
+        self._ns_cursor_class = ns_cursor_class
+        self.ns_cursor = ns_cursor
+        self.applied = True
+
+    def is_applied(self):
+        return self.applied
+
+    def invalidate(self):
+        self.applied = False
+
+    def reapply(self):
+        # Hide/unhide forces the window server to pick up the new cursor
+        self._ns_cursor_class.hide()
+        self.ns_cursor.set()
+        self._ns_cursor_class.unhide()
+        self.applied = True
+
+
+class QtOverrideCursorBackend(CursorBackend):
+    """A QApplication override cursor"""
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def is_applied(self):
+        return QApplication.instance().overrideCursor() is not None
+
+    def reapply(self):
+        QApplication.instance().setOverrideCursor(self.cursor)
+
+
+class FakeCursorBackend(CursorBackend):
+    """In-memory cursor stack for exercising the scheduler without a display"""
+    def __init__(self, cursor="custom"):
+        self.cursor = cursor
+        self.stack = [cursor]
+        self.reapplies = 0
+
+    def replace(self, other="arrow"):
+        """Simulate another application setting its own cursor"""
+        self.stack.append(other)
+
+    def is_applied(self):
+        return bool(self.stack) and self.stack[-1] == self.cursor
+
+    def reapply(self):
+        self.reapplies += 1
+        self.stack.append(self.cursor)
+
+
+class CursorMaintenance(QObject):
+    """Reapplies the custom cursor only when it was replaced"""
+    reapplied = pyqtSignal()
+    activeChanged = pyqtSignal(bool)
+
+    def __init__(self, parent=None, min_interval=MIN_CHECK_MS, max_interval=MAX_CHECK_MS, clock=time.monotonic):
+        super().__init__(parent)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._clock = clock
+        self._backends = []
+        self._reapply_times = deque()
+        self.paused = False
+        self.checks = 0
+        self.reapplies = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.check)
+
+    @property
+    def active(self):
+        return bool(self._backends)
+
+    def start(self, *backends):
+        """Maintain the given backends, replacing any previous ones"""
+        was_active = self.active
+        self._backends = list(backends)
+        self.interval = self.min_interval
+        if self._backends and not self.paused:
+            self._timer.start(self.interval)
+        else:
+            self._timer.stop()
+        if self.active != was_active:
+            self.activeChanged.emit(self.active)
+
+    def stop(self):
+        """Stop maintaining the cursor"""
+        self.start()
+
+    def pause(self):
+        """Stop checking but keep the backends, e.g. while the screen is locked"""
+        self.paused = True
+        self._timer.stop()
+
+    def resume(self):
+        """Check again right away after a pause"""
+        self.paused = False
+        if self._backends:
+            self.interval = self.min_interval
+            self._timer.start(0)
+
+    def poke(self, immediate=False):
+        """Hint that the cursor may have been replaced, cutting the backoff short"""
+        if not self._backends or self.paused:
+            return
+        if immediate:
+            self.check()
+        elif self.interval > self.min_interval:
+            self.interval = self.min_interval
+            self._timer.start(self.interval)
+
+    def invalidate(self):
+        """
+        The cursor was probably replaced (the app was activated): mark every
+        backend stale and check right away, or on resume while paused.
+        """
+        for backend in self._backends:
+            backend.invalidate()
+        self.poke(immediate=True)
+
+    @timed("maintenance.check")
+    def check(self):
+        """Reapply any backend whose cursor was replaced and schedule the next check"""
+        if not self._backends or self.paused:
+            return
+        self.checks += 1
+        replaced = False
+        for backend in self._backends:
+            try:
+                if not backend.is_applied():
+                    backend.reapply()
+                    replaced = True
+            except Exception as e:
+                # Runs from a timer: repeats are rate limited by the log setup
+                logger.error("Cursor reapply error: %s", e, exc_info=True)
+
+        if replaced:
+            self.reapplies += 1
+            if TELEMETRY.enabled:
+                _REAPPLIED.add()
+            self._reapply_times.append(self._clock())
+            self.interval = self.min_interval
+            self.reapplied.emit()
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        self._timer.start(self.interval)
+
+    def reapplies_per_minute(self):
+        """Number of reapplies during the last 60 seconds"""
+        cutoff = self._clock() - 60.0
+        while self._reapply_times and self._reapply_times[0] < cutoff:
+            self._reapply_times.popleft()
+        return len(self._reapply_times)
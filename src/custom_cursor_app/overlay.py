@@ -0,0 +1,235 @@
+"""
+Cursor overlay: a transparent, input-transparent top-level window that draws
+the cursor image at the pointer. It is used to play animated cursors, and is
+only imported the first time one is applied.
+"""
+
+from PyQt6.QtCore import Qt, QRect, QRectF
+from PyQt6.QtGui import QCursor, QPainter
+from PyQt6.QtWidgets import QWidget
+
+from .pacing import FramePacer
+from .pixmap_cache import PixmapCache, image_hash
+from .playback import FrameScheduler
+from .screens import screen_index
+from .telemetry import SAMPLE_EVERY, TELEMETRY, timed
+from .tracking import PointerTracker
+
+# Time from moving the overlay to the next time it is painted
+_move_to_paint = TELEMETRY.histogram("overlay.move_to_paint")
+
+
+class CursorOverlay(QWidget):
+    """A borderless, transparent window that follows the mouse cursor to create a system-wide custom cursor effect"""
+    def __init__(self):
+        super().__init__()
+        # Create a borderless, transparent window that stays on top of everything
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | 
+                           Qt.WindowType.Tool | 
+                           Qt.WindowType.WindowStaysOnTopHint | 
+                           Qt.WindowType.WindowTransparentForInput | 
+                           Qt.WindowType.NoDropShadowWindowHint)
+        
+        # Make sure the window is completely transparent
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+        
+        # Set initial size
+        self.resize(32, 32)
+        
+        # Initialize variables
+        self.cursor_pixmap = None
+        self.hotspot_x = 0
+        self.hotspot_y = 0
+        self.scale = 1.0
+
+        # Animated cursors draw one frame rect of an atlas at a time
+        self.animation = None
+        self._frame_rects = []
+        self._sequence = []
+        self._frame_rect = None
+
+        # Cursor image pre-rendered for the current device pixel ratio
+        self.pixmap_cache = PixmapCache()
+        self._image_key = None
+        self._frame_dpr = None
+        self._frame_pixmap = None
+        self._moved_at = None
+        self.paused = False
+        
+        # Screen under the hotspot, looked up in the shared index instead of screenAt
+        self.screens = screen_index()
+        self.screens.changed.connect(self._screens_changed)
+        self._screen = None
+        
+        # Hide the actual system cursor when over our window
+        self.setCursor(Qt.CursorShape.BlankCursor)
+        
+        # Follow the pointer only when it actually moves, at most once per display frame;
+        # tracking runs only while a cursor image is set
+        self.pacer = FramePacer(self)
+        self.pacer.frame.connect(self.move_to_pointer)
+        self.tracker = PointerTracker(self)
+        self.tracker.moved.connect(self.pacer.submit)
+
+    def set_cursor_image(self, pixmap, hotspot_x=0, hotspot_y=0):
+        """Set the cursor image and hotspot"""
+        self.stop_animation()
+        self._set_source(pixmap, pixmap.width(), pixmap.height(), hotspot_x, hotspot_y)
+
+    def set_cursor_animation(self, atlas, rects, sequence, durations, hotspot_x=0, hotspot_y=0):
+        """Play an animated cursor whose frames are packed into one atlas pixmap"""
+        self.stop_animation()
+        self._frame_rects = [QRect(*rect) for rect in rects]
+        self._sequence = list(sequence)
+        self._frame_rect = self._frame_rects[self._sequence[0]]
+        self._set_source(atlas, self._frame_rect.width(), self._frame_rect.height(), hotspot_x, hotspot_y)
+
+        # Repaint only when the visible frame changes
+        self.animation = FrameScheduler(durations, self)
+        self.animation.frameChanged.connect(self._show_step)
+        if not self.paused:
+            self.animation.start()
+
+    def stop_animation(self):
+        """Stop any animated cursor playback"""
+        if self.animation is not None:
+            self.animation.stop()
+            self.animation.deleteLater()
+            self.animation = None
+        self._frame_rects = []
+        self._sequence = []
+        self._frame_rect = None
+
+    def _show_step(self, step):
+        rect = self._frame_rects[self._sequence[step]]
+        if rect != self._frame_rect:
+            self._frame_rect = rect
+            self.update()
+
+    def _set_source(self, pixmap, width, height, hotspot_x, hotspot_y):
+        key = image_hash(pixmap)
+        if key != self._image_key and self._image_key is not None:
+            self.pixmap_cache.discard(key=self._image_key)
+        self._image_key = key
+        self._frame_pixmap = None
+        self.cursor_pixmap = pixmap
+        self.hotspot_x = hotspot_x
+        self.hotspot_y = hotspot_y
+        self._prerender()
+        self.resize(round(width * self.scale), round(height * self.scale))
+        self.update_position()
+        self.show()
+        self.update()
+        if not self.paused:
+            self.tracker.start()
+    
+    def pause(self):
+        """Stop tracking and animating, leaving the overlay where it is"""
+        self.paused = True
+        self.tracker.stop()
+        self.pacer.stop()
+        if self.animation is not None:
+            self.animation.stop()
+    
+    def resume(self):
+        """Catch up with the pointer and restart tracking and animation"""
+        self.paused = False
+        if self.cursor_pixmap:
+            self.update_position()
+            self.tracker.start()
+            if self.animation is not None and not self.animation.isActive():
+                self.animation.start()
+
+    def _prerender(self):
+        # One rendering per screen DPR, so crossing screens never renders on the move path
+        for dpr in self.screens.dprs():
+            self.pixmap_cache.get(self.cursor_pixmap, self._image_key, dpr, self.scale)
+
+    def _screens_changed(self):
+        """Screens were added, removed or reconfigured"""
+        self.pixmap_cache.prune(self.screens.dprs())
+        self._screen = None
+        self._frame_pixmap = None
+        if self.cursor_pixmap:
+            self._prerender()
+            self.update_position()
+
+    def _enter_screen(self, info):
+        """The hotspot moved onto another screen: adopt its DPR and pre-scaled pixmap"""
+        previous = self._screen
+        self._screen = info
+        # An overlay straddling two screens should render for the one under the hotspot
+        handle = self.windowHandle()
+        if handle is not None and handle.screen() is not info.screen:
+            handle.setScreen(info.screen)
+        if previous is None or previous.dpr != info.dpr:
+            self._frame_pixmap = None
+            self.update()
+
+    def update_position(self):
+        """Update the overlay position to follow the mouse cursor"""
+        cursor_pos = QCursor.pos()
+        self.move_to_pointer(cursor_pos.x(), cursor_pos.y())
+
+    @timed("overlay.move")
+    def move_to_pointer(self, x, y):
+        """Move the overlay so its hotspot sits at the given pointer position"""
+        if self.cursor_pixmap:
+            info = self.screens.screen_at(x, y)
+            if info is not None and info is not self._screen:
+                self._enter_screen(info)
+            
+            # Adjust position by hotspot
+            self.move(x - self.hotspot_x, y - self.hotspot_y)
+            if TELEMETRY.enabled and self._moved_at is None:
+                # Latency is sampled like timed() callbacks
+                _move_to_paint.calls += 1
+                if not _move_to_paint.calls % SAMPLE_EVERY:
+                    self._moved_at = TELEMETRY.clock()
+
+            # Ensure we're always on top and visible
+            if not self.isVisible():
+                self.show()
+                self.raise_()
+    
+    @timed("overlay.paint")
+    def paintEvent(self, event):
+        """Draw the cursor image"""
+        if self._moved_at is not None:
+            _move_to_paint.record((TELEMETRY.clock() - self._moved_at) * 1e6)
+            self._moved_at = None
+        if self.cursor_pixmap:
+            # Draw for the screen under the hotspot, even if the window straddles two
+            dpr = self._screen.dpr if self._screen is not None else self.devicePixelRatioF()
+            if self._frame_pixmap is None or dpr != self._frame_dpr:
+                self._frame_dpr = dpr
+                self._frame_pixmap = self.pixmap_cache.get(self.cursor_pixmap, self._image_key, dpr, self.scale)
+            # Pre-rendered at device resolution, so no render hints are needed
+            painter = QPainter(self)
+            if self._frame_rect is None:
+                painter.drawPixmap(0, 0, self._frame_pixmap)
+            else:
+                # Blit the current frame's rect of the atlas 1:1 in device pixels
+                rect = self._frame_rect
+                factor = dpr * self.scale
+                painter.drawPixmap(QRectF(0, 0, rect.width() * self.scale, rect.height() * self.scale),
+                                   self._frame_pixmap,
+                                   QRectF(rect.x() * factor, rect.y() * factor,
+                                          rect.width() * factor, rect.height() * factor))
+            painter.end()
+    
+    def hide_overlay(self):
+        """Hide the cursor overlay"""
+        self.stop_animation()
+        self.tracker.stop()
+        self.pacer.stop()
+        self.hide()
+        self.cursor_pixmap = None
+        self._frame_pixmap = None
+        self._moved_at = None
+        self._screen = None
+        self.pixmap_cache.clear()
+        self._image_key = None
@@ -0,0 +1,147 @@
+"""
+Frame pacing for the cursor overlay.
+The first pointer update in a display frame moves the overlay at once; later
+ones in the same frame are coalesced into one move at the next frame, so the
+overlay is repositioned at most once per frame of the screen under the
+pointer without delaying moves while the pointer is slow.
+"""
+
+import math
+import time
+
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+from .screens import screen_index
+from .telemetry import TELEMETRY, timed
+
+DEFAULT_REFRESH_RATE = 60.0
+
+# Positions replaced by a newer one before their frame came
+_COALESCED = TELEMETRY.counter("pacer.coalesced")
+
+
+class FramePacer(QObject):
+    """Emits frame(x, y) for submitted positions, at most once per refresh interval"""
+    frame = pyqtSignal(int, int)
+
+    def __init__(self, parent=None, clock=time.perf_counter, screens=None):
+        super().__init__(parent)
+        self._clock = clock
+        self._screens = screens
+        self._pending = None
+        self._pending_since = 0.0
+        self._pending_count = 0
+        self._pending_total = 0.0
+        self._screen = None
+        self._last_frame = -1
+        self.refresh_rate = DEFAULT_REFRESH_RATE
+        self.period = 1.0 / DEFAULT_REFRESH_RATE
+        self._anchor = clock()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._flush)
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Clear the latency and throughput counters"""
+        self.submits = 0
+        self.moves = 0
+        self._delivered = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._stats_started = self._clock()
+
+    def stats(self):
+        """
+        Return moves per second and latency since the last reset. Latency is
+        per submit: how long each position waited for the next move.
+        """
+        elapsed = max(self._clock() - self._stats_started, 1e-9)
+        return {
+            'refresh_rate': self.refresh_rate,
+            'submits': self.submits,
+            'moves': self.moves,
+            'moves_per_second': self.moves / elapsed,
+            'mean_latency_ms': (self._latency_total / self._delivered * 1000.0) if self._delivered else 0.0,
+            'max_latency_ms': self._latency_max * 1000.0,
+        }
+
+    def set_refresh_rate(self, rate):
+        """Change the frame period, restarting the frame grid"""
+        rate = rate if rate and rate > 0 else DEFAULT_REFRESH_RATE
+        if rate != self.refresh_rate:
+            self.refresh_rate = rate
+            self.period = 1.0 / rate
+            self._anchor = self._clock()
+            self._last_frame = -1
+
+    def submit(self, x, y):
+        """Move to a pointer position now, or at the next frame if this frame already moved"""
+        self.submits += 1
+        now = self._clock()
+        self._track_screen(x, y)
+        if self._pending is None:
+            self._pending_since = now
+        elif TELEMETRY.enabled:
+            _COALESCED.add()
+        self._pending = (x, y)
+        self._pending_count += 1
+        self._pending_total += now
+        if self._timer.isActive():
+            return
+        if self._frame_index(now) > self._last_frame:
+            self._flush()
+        else:
+            self._schedule(now)
+
+    def flush(self):
+        """Deliver any pending position immediately"""
+        if self._pending is not None:
+            self._timer.stop()
+            self._flush()
+
+    def stop(self):
+        """Drop any pending position"""
+        self._timer.stop()
+        self._pending = None
+        self._pending_count = 0
+        self._pending_total = 0.0
+
+    def _frame_index(self, now):
+        return int((now - self._anchor) / self.period)
+
+    def _schedule(self, now):
+        # Start of the frame after the last delivered move
+        index = self._last_frame + 1
+        deadline = self._anchor + index * self.period
+        self._timer.start(max(0, math.ceil((deadline - now) * 1000.0)))
+
+    @timed("pacer.frame")
+    def _flush(self):
+        if self._pending is None:
+            return
+        now = self._clock()
+        x, y = self._pending
+        self._pending = None
+        self._last_frame = self._frame_index(now)
+        # Every position submitted since the last move waited until now
+        self.moves += 1
+        self._delivered += self._pending_count
+        self._latency_total += self._pending_count * now - self._pending_total
+        self._latency_max = max(self._latency_max, now - self._pending_since)
+        self._pending_count = 0
+        self._pending_total = 0.0
+        self.frame.emit(x, y)
+
+    def _track_screen(self, x, y):
+        if self._screens is None:
+            self._screens = screen_index()
+        # The index hands out new entries when the layout or a refresh rate changes
+        info = self._screens.screen_at(x, y)
+        if info is None or info is self._screen:
+            return
+        self._screen = info
+        self.set_refresh_rate(info.refresh_rate)
@@ -0,0 +1,223 @@
+"""
+Whole-image pixel operations for cursor images.
+Every operation runs on the full buffer in Pillow's C code (channel LUTs,
+masks, filters and compositing), never pixel by pixel in Python. Operations
+that change the canvas take the hotspot and return it moved to match.
+Pillow holds the GIL while it copies a band or finds a bounding box, so on
+large images those run in strips and the GUI thread gets to run in between.
+"""
+
+import math
+
+from PIL import Image, ImageChops, ImageFilter
+
+# Pixels at or below this alpha are treated as stray halo and cleared
+HALO_ALPHA = 8
+# Pixels per strip for operations that hold the GIL (a few ms each)
+STRIP_PIXELS = 1 << 20
+
+
+def rgba(img):
+    """Return img in straight-alpha RGBA, converting only when needed"""
+    return img if img.mode == 'RGBA' else img.convert('RGBA')
+
+
+def _strips(img):
+    # Yield (top, strip) covering img in horizontal strips of about STRIP_PIXELS
+    rows = max(1, STRIP_PIXELS // max(1, img.width))
+    if img.height <= rows:
+        yield 0, img
+        return
+    for top in range(0, img.height, rows):
+        yield top, img.crop((0, top, img.width, min(img.height, top + rows)))
+
+
+def alpha_channel(img):
+    """The alpha band of img as an 'L' image, copied strip by strip"""
+    img = rgba(img)
+    if img.height * img.width <= STRIP_PIXELS:
+        return img.getchannel('A')
+    # Left unfilled: filling holds the GIL, and the strips cover every pixel
+    alpha = Image.new('L', img.size, None)
+    for top, strip in _strips(img):
+        alpha.paste(strip.getchannel('A'), (0, top))
+    return alpha
+
+
+def bbox(img):
+    """img.getbbox() (the alpha box for RGBA), found strip by strip"""
+    boxes = []
+    for top, strip in _strips(img):
+        box = strip.getbbox()
+        if box is not None:
+            boxes.append((box[0], top + box[1], box[2], top + box[3]))
+    if not boxes:
+        return None
+    return min(b[0] for b in boxes), boxes[0][1], max(b[2] for b in boxes), boxes[-1][3]
+
+
+def _has_alpha(img):
+    # Modes with an alpha band, or a palette or color marked transparent
+    return img.mode in ('RGBA', 'RGBa', 'LA', 'La', 'PA') or 'transparency' in img.info
+
+
+def _alpha_lut(fn):
+    return [fn(a) for a in range(256)]
+
+
+def premultiply(img):
+    """Return img with its colors multiplied by alpha (Pillow's 'RGBa' mode)"""
+    return img if img.mode == 'RGBa' else rgba(img).convert('RGBa')
+
+
+def unpremultiply(img):
+    """Return straight-alpha RGBA from a premultiplied 'RGBa' image"""
+    return img.convert('RGBA')
+
+
+def clean_alpha(img, threshold=HALO_ALPHA):
+    """
+    Clear halo pixels with alpha at or below threshold and zero the color of
+    every fully transparent pixel, so no hidden color bleeds in when scaling.
+    Images that cannot hold transparency, or whose alpha has no pixel at or
+    below threshold, are only converted to RGBA.
+    """
+    if not _has_alpha(img):
+        return rgba(img)
+    img = rgba(img)
+    alpha = alpha_channel(img)
+    if not any(alpha.histogram()[:max(0, threshold) + 1]):
+        # Nothing transparent or faint enough to clean
+        return img
+    hidden = alpha.point(_alpha_lut(lambda a: 255 if a <= threshold else 0))
+    img = img.copy()
+    img.paste((0, 0, 0, 0), None, hidden)
+    return img
+
+
+def alpha_bbox(img, threshold=0):
+    """Bounding box (left, top, right, bottom) of pixels with alpha above threshold, or None"""
+    if threshold <= 0:
+        return bbox(rgba(img))
+    return bbox(alpha_channel(img).point(_alpha_lut(lambda a: 255 if a > threshold else 0)))
+
+
+def _union_hotspot(box, hotspot, size):
+    # The hotspot must stay on the canvas, so the box always includes it
+    x = min(max(0, hotspot[0]), size[0] - 1)
+    y = min(max(0, hotspot[1]), size[1] - 1)
+    left, top, right, bottom = box
+    return min(left, x), min(top, y), max(right, x + 1), max(bottom, y + 1)
+
+
+def _pad_box(box, padding, size):
+    left, top, right, bottom = box
+    return (max(0, left - padding), max(0, top - padding),
+            min(size[0], right + padding), min(size[1], bottom + padding))
+
+
+def trim(img, hotspot=(0, 0), threshold=0, padding=0):
+    """
+    Crop the transparent margins around img, keeping padding pixels and the
+    hotspot. Returns (image, hotspot); a fully transparent image is returned
+    unchanged.
+    """
+    box = alpha_bbox(img, threshold)
+    if box is None:
+        return img, hotspot
+    box = _union_hotspot(_pad_box(box, padding, img.size), hotspot, img.size)
+    if box == (0, 0) + img.size:
+        return img, hotspot
+    return img.crop(box), (hotspot[0] - box[0], hotspot[1] - box[1])
+
+
+def trim_frames(frames, hotspot=(0, 0), threshold=0, padding=0):
+    """
+    Crop every frame of an animation to the union of their alpha boxes, so
+    the frames keep a common size and the hotspot a common position.
+    Returns (frames, hotspot).
+    """
+    boxes = [box for box in (alpha_bbox(frame, threshold) for frame in frames) if box is not None]
+    if not boxes:
+        return frames, hotspot
+    size = frames[0].size
+    box = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+           max(b[2] for b in boxes), max(b[3] for b in boxes))
+    box = _union_hotspot(_pad_box(box, padding, size), hotspot, size)
+    if box == (0, 0) + size:
+        return frames, hotspot
+    return [frame.crop(box) for frame in frames], (hotspot[0] - box[0], hotspot[1] - box[1])
+
+
+def _solid(size, color, alpha):
+    layer = Image.new('RGBA', size, tuple(color[:3]) + (0,))
+    layer.putalpha(alpha)
+    return layer
+
+
+def _dilate(alpha, width):
+    # Square max filter as two separable passes of shifted maxima, much
+    # cheaper than a rank filter; the canvas border is at least width pixels
+    # of zeros, so the wrap-around of offset() brings in nothing
+    rows = alpha
+    for d in range(1, width + 1):
+        rows = ImageChops.lighter(rows, ImageChops.lighter(ImageChops.offset(alpha, d, 0),
+                                                           ImageChops.offset(alpha, -d, 0)))
+    grown = rows
+    for d in range(1, width + 1):
+        grown = ImageChops.lighter(grown, ImageChops.lighter(ImageChops.offset(rows, 0, d),
+                                                             ImageChops.offset(rows, 0, -d)))
+    return grown
+
+
+def outline(img, width=1, color=(0, 0, 0, 255), hotspot=(0, 0)):
+    """
+    Draw an outline width pixels wide around the opaque shape of img, growing
+    the canvas so it is not clipped. Returns (image, hotspot).
+    """
+    img = rgba(img)
+    canvas_size = (img.width + 2 * width, img.height + 2 * width)
+    alpha = Image.new('L', canvas_size, 0)
+    alpha.paste(img.getchannel('A'), (width, width))
+    alpha = _dilate(alpha, width)
+    opacity = color[3] if len(color) > 3 else 255
+    if opacity < 255:
+        alpha = alpha.point(_alpha_lut(lambda a: a * opacity // 255))
+    canvas = _solid(canvas_size, color, alpha)
+    canvas.alpha_composite(img, (width, width))
+    return canvas, (hotspot[0] + width, hotspot[1] + width)
+
+
+def drop_shadow(img, offset=(2, 2), radius=2, color=(0, 0, 0, 96), hotspot=(0, 0)):
+    """
+    Put a blurred shadow of img's shape behind it, offset by (dx, dy), growing
+    the canvas to fit. Returns (image, hotspot).
+    """
+    img = rgba(img)
+    dx, dy = offset
+    margin = math.ceil(radius * 2)
+    left, top = max(0, margin - dx), max(0, margin - dy)
+    right, bottom = max(0, margin + dx), max(0, margin + dy)
+    canvas_size = (img.width + left + right, img.height + top + bottom)
+
+    alpha = Image.new('L', canvas_size, 0)
+    alpha.paste(img.getchannel('A'), (left + dx, top + dy))
+    if radius > 0:
+        alpha = alpha.filter(ImageFilter.GaussianBlur(radius))
+    opacity = color[3] if len(color) > 3 else 255
+    alpha = alpha.point(_alpha_lut(lambda a: a * opacity // 255))
+    canvas = _solid(canvas_size, color, alpha)
+    canvas.alpha_composite(img, (left, top))
+    return canvas, (hotspot[0] + left, hotspot[1] + top)
+
+
+def tint(img, color, amount=1.0):
+    """Multiply the colors of img by color, blended in by amount (0-1); alpha is kept"""
+    img = rgba(img)
+    alpha = img.getchannel('A')
+    rgb = img.convert('RGB')
+    tinted = ImageChops.multiply(rgb, Image.new('RGB', img.size, tuple(color[:3])))
+    if amount < 1.0:
+        tinted = Image.blend(rgb, tinted, max(0.0, amount))
+    tinted.putalpha(alpha)
+    return tinted
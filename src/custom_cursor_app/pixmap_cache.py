@@ -0,0 +1,67 @@
+"""
+Pre-rendered cursor pixmaps for the overlay.
+Each cursor image is rendered once per device pixel ratio and scale, so
+painting the overlay is a plain 1:1 blit.
+"""
+
+import hashlib
+
+from PyQt6.QtCore import Qt
+
+
+def image_hash(pixmap):
+    """Return a content hash for a pixmap's pixels"""
+    image = pixmap.toImage()
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    digest = hashlib.blake2b(bytes(bits), digest_size=16)
+    digest.update(f"{image.width()}x{image.height()}:{image.format()}".encode())
+    return digest.hexdigest()
+
+
+def render_pixmap(source, dpr, scale=1.0):
+    """Render source at the device resolution for dpr and scale"""
+    width = max(1, round(source.width() * scale * dpr))
+    height = max(1, round(source.height() * scale * dpr))
+    if (width, height) == (source.width(), source.height()):
+        rendered = source.copy()
+    else:
+        rendered = source.scaled(width, height,
+                                 Qt.AspectRatioMode.IgnoreAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+    rendered.setDevicePixelRatio(dpr)
+    return rendered
+
+
+class PixmapCache:
+    """Pre-rendered pixmaps keyed by (image hash, device pixel ratio, scale)"""
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, source, key, dpr, scale=1.0):
+        """Return the pre-rendered pixmap for source, rendering it on first use"""
+        entry_key = (key, dpr, scale)
+        pixmap = self._entries.get(entry_key)
+        if pixmap is None:
+            pixmap = render_pixmap(source, dpr, scale)
+            self._entries[entry_key] = pixmap
+        return pixmap
+
+    def discard(self, key=None, dpr=None):
+        """Drop entries matching the given image hash and/or device pixel ratio"""
+        for entry_key in list(self._entries):
+            if (key is None or entry_key[0] == key) and (dpr is None or entry_key[1] == dpr):
+                del self._entries[entry_key]
+
+    def prune(self, dprs):
+        """Drop entries rendered for device pixel ratios not in dprs"""
+        dprs = set(dprs)
+        for entry_key in list(self._entries):
+            if entry_key[1] not in dprs:
+                del self._entries[entry_key]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,66 @@
+"""
+Frame-accurate playback for animated cursors.
+The scheduler wakes up once per frame change, so the cost of playback does
+not depend on how many frames the animation has.
+"""
+
+import bisect
+import itertools
+import time
+
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+from .telemetry import timed
+
+
+class FrameScheduler(QObject):
+    """Emits frameChanged(step) exactly when the animation moves to a new step"""
+    frameChanged = pyqtSignal(int)
+
+    def __init__(self, durations, parent=None, clock=time.monotonic):
+        super().__init__(parent)
+        self._clock = clock
+        self._durations = list(durations)
+        # Cumulative end time of each step within one loop, in milliseconds
+        self._ends = list(itertools.accumulate(self._durations))
+        self._loop_ms = self._ends[-1]
+        self._started = 0.0
+        self.step = 0
+        self.wakeups = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._advance)
+
+    def start(self):
+        """Start playing from the first step"""
+        self._started = self._clock()
+        self.step = 0
+        self.frameChanged.emit(0)
+        self._schedule(0.0)
+
+    def stop(self):
+        self._timer.stop()
+
+    def isActive(self):
+        return self._timer.isActive()
+
+    def _position(self):
+        return ((self._clock() - self._started) * 1000.0) % self._loop_ms
+
+    def _schedule(self, position):
+        if len(self._durations) > 1:
+            self._timer.start(max(1, round(self._ends[self.step] - position)))
+
+    @timed("animation.advance")
+    def _advance(self):
+        self.wakeups += 1
+        position = self._position()
+        # Skip any steps missed while the event loop was busy
+        step = bisect.bisect_right(self._ends, position)
+        step = min(step, len(self._ends) - 1)
+        if step != self.step:
+            self.step = step
+            self.frameChanged.emit(step)
+        self._schedule(position)
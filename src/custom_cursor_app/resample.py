@@ -0,0 +1,88 @@
+"""
+Cursor downscaling with precomputed mipmaps.
+Each source image gets a chain of box-filtered half-size levels. A resize
+starts from the nearest level above the target, so the final filter only
+covers less than a 2x reduction. Pillow premultiplies RGBA in reduce and
+resize, so transparent pixels never bleed their color into the edges.
+"""
+
+import threading
+
+from PIL import Image
+
+# Final filter, and how many times larger than the target the starting level must be
+MODES = {
+    'fast': (Image.BILINEAR, 1),
+    'balanced': (Image.BICUBIC, 1),
+    'best': (Image.LANCZOS, 2),
+}
+DEFAULT_MODE = 'balanced'
+
+
+def _half(size):
+    # Image.reduce(2) rounds odd sides up
+    return (size[0] + 1) // 2, (size[1] + 1) // 2
+
+
+class MipChain:
+    """
+    Half-size levels of one RGBA image, built on demand and kept for reuse.
+    Level 0 is the source itself; smaller levels are shared and must not be
+    modified. Levels are built under the chain's own lock, so threads
+    resizing the same image only wait for each other while a level is missing.
+    """
+    def __init__(self, img):
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        self.source = img
+        self.levels = []
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Memory held by the reduced levels (the source is not counted)"""
+        return sum(level.width * level.height * 4 for level in self.levels)
+
+    def level_for(self, size, factor=1):
+        """Smallest level at least factor times size in both dimensions (the source if none is)"""
+        width, height = size[0] * factor, size[1] * factor
+        best = self.source
+        index = 0
+        with self._lock:
+            while True:
+                if index == len(self.levels):
+                    # Only reduce further if the next level is still large enough
+                    next_size = _half(best.size)
+                    if next_size == best.size or next_size[0] < width or next_size[1] < height:
+                        return best
+                    self.levels.append(best.reduce(2))
+                level = self.levels[index]
+                if level.width < width or level.height < height:
+                    return best
+                best = level
+                index += 1
+
+    def resize(self, size, mode=DEFAULT_MODE):
+        """Return the image scaled to exactly size = (width, height) as RGBA"""
+        size = tuple(size)
+        if size == self.source.size:
+            return self.source
+        resample, factor = MODES[mode]
+        level = self.level_for(size, factor)
+        return level if level.size == size else level.resize(size, resample)
+
+
+def chain_resizer(mode=DEFAULT_MODE):
+    """
+    A resize(img, size) callable for the .cur and .ani encoders that builds
+    one MipChain per distinct image, so every size of a frame shares it.
+    """
+    chains = {}
+
+    def resize(img, size):
+        # Holding img in the entry keeps its id from being reused
+        entry = chains.get(id(img))
+        if entry is None:
+            entry = chains[id(img)] = (img, MipChain(img))
+        return entry[1].resize(size, mode)
+    return resize
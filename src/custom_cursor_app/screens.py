@@ -0,0 +1,126 @@
+"""
+Screen geometry index for the overlay and frame pacer.
+The virtual desktop is cut into vertical slabs at every screen's left and
+right edge; within a slab the screens are sorted by top edge, so the screen
+under a point is found with two bisections instead of a scan over all
+screens. The index is rebuilt only when a screen is added or removed or
+changes geometry, DPI or refresh rate.
+"""
+
+import bisect
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+
+class ScreenInfo(namedtuple("ScreenInfo", ["screen", "x", "y", "width", "height", "dpr", "refresh_rate"])):
+    """A screen's geometry in global logical coordinates, with its DPR and refresh rate"""
+    __slots__ = ()
+
+    def contains(self, x, y):
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+
+def build_slabs(screens):
+    """
+    Index ScreenInfo-like entries by slab. Returns (edges, slabs) where slab i
+    spans edges[i] <= x < edges[i + 1] and holds (tops, entries) sorted by top.
+    """
+    edges = sorted({s.x for s in screens} | {s.x + s.width for s in screens})
+    slabs = []
+    for left, right in zip(edges, edges[1:]):
+        column = sorted((s for s in screens if s.x < right and s.x + s.width > left), key=lambda s: s.y)
+        slabs.append(([s.y for s in column], column))
+    return edges, slabs
+
+
+def find_in_slabs(edges, slabs, x, y):
+    """Return the entry containing (x, y), or None"""
+    column = bisect.bisect_right(edges, x) - 1
+    if column < 0 or column >= len(slabs):
+        return None
+    tops, entries = slabs[column]
+    row = bisect.bisect_right(tops, y) - 1
+    # Screens do not overlap (mirrored ones coincide), so only the nearest one starting above can contain y
+    if row >= 0 and entries[row].contains(x, y):
+        return entries[row]
+    return None
+
+
+class ScreenIndex(QObject):
+    """Answers "which screen is this point on?" in O(log n) and says when the layout changed"""
+    changed = pyqtSignal()
+
+    def __init__(self, app=None, parent=None):
+        super().__init__(parent)
+        self._app = app or QGuiApplication.instance()
+        self.screens = []
+        self._edges = []
+        self._slabs = []
+        self._last = None
+        self.rebuilds = 0
+
+        self._app.screenAdded.connect(self._on_screen_added)
+        self._app.screenRemoved.connect(self._on_screen_removed)
+        for screen in self._app.screens():
+            self._watch(screen)
+        self.rebuild()
+
+    def _watch(self, screen):
+        screen.geometryChanged.connect(self._on_screen_changed)
+        screen.logicalDotsPerInchChanged.connect(self._on_screen_changed)
+        screen.physicalDotsPerInchChanged.connect(self._on_screen_changed)
+        screen.refreshRateChanged.connect(self._on_screen_changed)
+
+    def _on_screen_added(self, screen):
+        self._watch(screen)
+        self.rebuild()
+
+    def _on_screen_removed(self, screen):
+        # The screen may still be listed while screenRemoved is being emitted
+        self.rebuild(exclude=screen)
+
+    def _on_screen_changed(self, *args):
+        self.rebuild()
+
+    def rebuild(self, exclude=None):
+        """Re-read every screen and rebuild the slabs"""
+        self.screens = []
+        for screen in self._app.screens():
+            if screen is exclude:
+                continue
+            rect = screen.geometry()
+            self.screens.append(ScreenInfo(screen, rect.x(), rect.y(), rect.width(), rect.height(),
+                                           screen.devicePixelRatio(), screen.refreshRate()))
+        self._edges, self._slabs = build_slabs(self.screens)
+        self._last = None
+        self.rebuilds += 1
+        self.changed.emit()
+
+    def screen_at(self, x, y):
+        """Return the ScreenInfo under the global point (x, y), or None if it is off every screen"""
+        # Consecutive pointer samples are nearly always on the same screen
+        last = self._last
+        if last is not None and last.contains(x, y):
+            return last
+        info = find_in_slabs(self._edges, self._slabs, x, y)
+        if info is not None:
+            self._last = info
+        return info
+
+    def dprs(self):
+        """The distinct device pixel ratios of the connected screens"""
+        return sorted({s.dpr for s in self.screens})
+
+
+_screen_index = None
+
+
+def screen_index():
+    """The application's shared ScreenIndex, created on first use"""
+    global _screen_index
+    if _screen_index is None:
+        app = QGuiApplication.instance()
+        _screen_index = ScreenIndex(app, parent=app)
+    return _screen_index
@@ -0,0 +1,154 @@
+"""
+Snapshot of the original system cursors under ~/.custom_cursor_app.
+The snapshot is taken from the platform backend right before the first
+custom cursor is applied and stays on disk until the originals are restored.
+Applying goes through CursorSnapshots.apply(), which rolls back to the
+snapshot if the apply fails part way, so the system is never left with a
+half-installed set. The file also records whether the session that wrote it
+exited cleanly: a snapshot left by a session that never did means a crash
+left custom cursors behind, and they are restored in one batch at launch.
+"""
+
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".custom_cursor_app", "snapshot.json")
+SNAPSHOT_VERSION = 1
+
+
+class CursorSnapshots:
+    """
+    The persisted snapshot and the apply/restore transactions around it.
+    A cursor system is anything with a name and capture() / restore(state)
+    methods: the platform backends, or FakeCursorSystem.
+    """
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        self.state = self._read()
+
+    @property
+    def active(self):
+        """True while custom cursors may be applied on top of a snapshot"""
+        return self.state is not None
+
+    def needs_recovery(self):
+        """True if a previous session crashed with custom cursors applied"""
+        return self.state is not None and not self.state.get('clean')
+
+    def take(self, system):
+        """
+        Record the system's current cursors unless a snapshot already exists;
+        one kept from a clean exit is marked as in use by this session instead.
+        """
+        if self.state is not None:
+            self.resume()
+            return
+        self.state = {'version': SNAPSHOT_VERSION, 'system': system.name, 'taken': time.time(),
+                      'pid': os.getpid(), 'clean': False, 'cursors': system.capture()}
+        self._write()
+        logger.info("Saved a snapshot of the %s system cursors", system.name)
+
+    def apply(self, system, fn):
+        """
+        Run fn() to apply custom cursors on top of a snapshot and return its
+        result; if it fails, the snapshot is restored before the error is raised.
+        """
+        self.take(system)
+        try:
+            return fn()
+        except Exception:
+            logger.warning("Applying cursors failed, restoring the snapshot")
+            self.restore(system)
+            raise
+
+    def restore(self, system):
+        """Restore the snapshot (or the system defaults without one) in one batch and drop it"""
+        state = self.state
+        system.restore(state['cursors'] if state is not None else None)
+        self.clear()
+
+    def resume(self):
+        """Mark a snapshot kept from a clean exit as in use by this session"""
+        if self.state is not None and self.state.get('clean'):
+            self.state.update(clean=False, pid=os.getpid())
+            self._write()
+
+    def mark_clean(self):
+        """Keep the snapshot for a later session; the custom cursors outlive this one"""
+        if self.state is not None and not self.state.get('clean'):
+            self.state['clean'] = True
+            self._write()
+
+    def clear(self):
+        self.state = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error("Ignoring unreadable cursor snapshot %s: %s", self.path, e)
+            return None
+        if not isinstance(state, dict) or state.get('version') != SNAPSHOT_VERSION:
+            return None
+        return state
+
+    def _write(self):
+        # Written to a temporary file first so a crash never leaves half a snapshot
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        partial = self.path + '.tmp'
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(partial, self.path)
+
+
+class FakeCursorSystem:
+    """
+    In-memory system cursors (role -> cursor name) for exercising snapshots
+    without a platform backend. With a path, the cursors are kept in a file
+    and outlive the process, like cursors set with SetSystemCursor.
+    """
+    name = "Fake"
+    persistent = True
+
+    def __init__(self, cursors=None, path=None, fail_role=None):
+        self.path = path
+        self.fail_role = fail_role
+        self.restores = 0
+        self.cursors = dict(cursors or {'arrow': 'system-arrow', 'ibeam': 'system-ibeam', 'hand': 'system-hand'})
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.cursors = json.load(f)
+
+    def apply(self, cursors):
+        """Replace cursors role by role, failing at fail_role like a bad file part way through"""
+        for role, cursor in cursors.items():
+            if role == self.fail_role:
+                raise OSError(f"Could not load the {role} cursor")
+            self.cursors[role] = cursor
+            self._save()
+        return f"Applied {len(cursors)} cursors"
+
+    def capture(self):
+        return dict(self.cursors)
+
+    def restore(self, state):
+        self.restores += 1
+        if state is not None:
+            self.cursors = dict(state)
+            self._save()
+
+    def _save(self):
+        if self.path is not None:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.cursors, f)
@@ -0,0 +1,220 @@
+"""
+Performance telemetry.
+Histograms for the tracker, frame pacer, maintenance scheduler, event filter
+and overlay, and counters for events with no duration of their own (cursor
+reapplies, coalesced pointer moves). Collection is off unless --telemetry or
+CUSTOM_CURSOR_TELEMETRY is given, or the diagnostics panel is opened; while
+off, an instrumented callback only pays one attribute check. While on, every
+call is counted but only one in SAMPLE_EVERY is timed: timing costs about a
+microsecond, as much as the cheapest callbacks themselves, so sampling keeps
+the added cost per call to a few percent (see benchmarks/bench_telemetry.py).
+"""
+
+import functools
+import json
+import os
+import signal
+import time
+
+TELEMETRY_ENV = "CUSTOM_CURSOR_TELEMETRY"
+TELEMETRY_FLAG = "--telemetry"
+
+# Histogram bucket i holds durations below 2**i microseconds (the last one is open)
+BUCKETS = 24
+# timed() callbacks are timed on one call in this many
+SAMPLE_EVERY = 16
+
+
+class Counter:
+    """Event count, reported with its rate since the last reset"""
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, n=1):
+        self.count += n
+
+    def reset(self):
+        self.count = 0
+
+    def snapshot(self, elapsed):
+        return {'count': self.count, 'per_second': self.count / elapsed}
+
+
+class Histogram:
+    """
+    Durations in microseconds in power-of-two buckets, plus exact count, mean
+    and max. For timed() callbacks, calls counts every call while the other
+    fields cover the sampled ones.
+    """
+    __slots__ = ('calls', 'count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * BUCKETS
+
+    def record(self, us):
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+        self.buckets[min(int(us).bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= wanted:
+                return min(float(1 << index), self.max)
+        return self.max
+
+    def snapshot(self, elapsed):
+        # Histograms recorded directly, not through timed(), have every call as a sample
+        calls = self.calls or self.count
+        return {
+            'count': calls,
+            'per_second': calls / elapsed,
+            'sampled': self.count,
+            'mean_us': self.total / self.count if self.count else 0.0,
+            'p50_us': self.percentile(0.5),
+            'p99_us': self.percentile(0.99),
+            'max_us': self.max,
+            'total_us': self.total,
+        }
+
+
+class Telemetry:
+    """Named counters and histograms shared by the whole app"""
+    def __init__(self, enabled=False, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.counters = {}
+        self.histograms = {}
+        self._started = clock()
+
+    def counter(self, name):
+        if name not in self.counters:
+            self.counters[name] = Counter()
+        return self.counters[name]
+
+    def histogram(self, name):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def enable(self, enabled=True):
+        """Start or stop collecting; starting clears the previous numbers"""
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def reset(self):
+        for metric in list(self.counters.values()) + list(self.histograms.values()):
+            metric.reset()
+        self._started = self.clock()
+
+    def snapshot(self):
+        """All metrics as plain data, rates relative to the last reset"""
+        elapsed = max(self.clock() - self._started, 1e-9)
+        return {
+            'enabled': self.enabled,
+            'elapsed_s': elapsed,
+            'counters': {name: c.snapshot(elapsed) for name, c in sorted(self.counters.items())},
+            'histograms': {name: h.snapshot(elapsed) for name, h in sorted(self.histograms.items())},
+        }
+
+    def dump(self, path):
+        """Write a snapshot as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+
+TELEMETRY = Telemetry()
+
+
+def timed(name):
+    """Decorator counting calls in a histogram and recording the duration of one in SAMPLE_EVERY"""
+    histogram = TELEMETRY.histogram(name)
+    clock = time.perf_counter
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TELEMETRY.enabled:
+                return fn(*args, **kwargs)
+            histogram.calls += 1
+            if histogram.calls % SAMPLE_EVERY:
+                return fn(*args, **kwargs)
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.record((clock() - start) * 1e6)
+        return wrapper
+    return decorate
+
+
+def take_telemetry_flag(argv):
+    """
+    Remove --telemetry[=PATH] from argv and return the dump path, falling back
+    to CUSTOM_CURSOR_TELEMETRY. Returns None when telemetry was not requested.
+    """
+    path = None
+    for i, arg in enumerate(argv):
+        if arg == TELEMETRY_FLAG:
+            has_value = i + 1 < len(argv) and not argv[i + 1].startswith('-')
+            path = argv[i + 1] if has_value else "telemetry.json"
+            del argv[i:i + 1 + has_value]
+            break
+        if arg.startswith(TELEMETRY_FLAG + "="):
+            path = arg.split("=", 1)[1]
+            del argv[i]
+            break
+    if path is None:
+        value = os.environ.get(TELEMETRY_ENV)
+        if value:
+            path = "telemetry.json" if value == "1" else value
+    return path
+
+
+def install_dump_signal(path, parent=None):
+    """
+    Dump telemetry to `path` whenever the process receives SIGUSR1. Python
+    only runs signal handlers between bytecodes, so the signal also wakes the
+    Qt event loop through a socket. Returns the notifier, or None where
+    SIGUSR1 does not exist.
+    """
+    if not hasattr(signal, 'SIGUSR1'):
+        return None
+    import socket
+    from PyQt6.QtCore import QSocketNotifier
+
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    writer.setblocking(False)
+    signal.set_wakeup_fd(writer.fileno())
+    signal.signal(signal.SIGUSR1, lambda signum, frame: TELEMETRY.dump(path))
+
+    notifier = QSocketNotifier(reader.fileno(), QSocketNotifier.Type.Read, parent)
+
+    def drain():
+        # Reading the wakeup byte is enough; the handler itself runs on return to Python
+        try:
+            reader.recv(64)
+        except OSError:
+            pass
+    notifier.activated.connect(drain)
+    notifier.sockets = (reader, writer)
+    return notifier
@@ -0,0 +1,198 @@
+"""
+Cursor theme packs: one image and hotspot per cursor role (arrow, I-beam,
+hand, wait, ...), read from a directory or a .zip holding a theme.json:
+
+    {"name": "Neon",
+     "cursors": {"arrow": {"image": "arrow.png", "hotspot": [0, 0]},
+                 "ibeam": {"image": "ibeam.png"}}}
+
+A role without a hotspot gets the one proposed by analysis.py. Every role
+is encoded in parallel into a content-addressed cache, so applying a theme
+whose images were encoded before does no image work at all; the platform
+backend then installs the whole set in one batch.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+THEMES_ROOT = os.path.join(os.path.expanduser("~"), ".custom_cursor_app", "themes")
+MANIFEST_NAME = "theme.json"
+
+# Roles a theme may define, in the order they are listed and applied
+ROLES = ('arrow', 'ibeam', 'hand', 'wait', 'busy', 'crosshair', 'help', 'no', 'move',
+         'size_ns', 'size_we', 'size_nwse', 'size_nesw', 'up')
+
+ThemeCursor = namedtuple("ThemeCursor", ["role", "path", "hotspot"])
+
+
+class CursorTheme:
+    """A named set of role cursors read from a theme pack"""
+    def __init__(self, name, root, cursors):
+        self.name = name
+        self.root = root
+        self.cursors = cursors
+
+    def __len__(self):
+        return len(self.cursors)
+
+    def __iter__(self):
+        return (self.cursors[role] for role in ROLES if role in self.cursors)
+
+
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _extract(path, root):
+    # Each zip is unpacked once, under its content hash
+    target = os.path.join(root, "packs", _file_digest(path))
+    if os.path.isdir(target):
+        return target
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    staging = tempfile.mkdtemp(dir=os.path.dirname(target))
+    try:
+        with zipfile.ZipFile(path) as archive:
+            # extractall() drops absolute paths and '..' from member names
+            archive.extractall(staging)
+        os.replace(staging, target)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(target):
+            raise
+    return target
+
+
+def _find_manifest(directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if os.path.isfile(path):
+        return path
+    # Zips made from a folder hold everything one level down
+    entries = [os.path.join(directory, name) for name in os.listdir(directory)]
+    folders = [entry for entry in entries if os.path.isdir(entry)]
+    if len(folders) == 1 and os.path.isfile(os.path.join(folders[0], MANIFEST_NAME)):
+        return os.path.join(folders[0], MANIFEST_NAME)
+    raise ValueError(f"No {MANIFEST_NAME} in {directory}")
+
+
+def _parse_hotspot(role, value):
+    if value is None or value == 'auto':
+        return None
+    try:
+        x, y = (int(v) for v in value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid hotspot for '{role}', expected [x, y] or \"auto\"")
+    return x, y
+
+
+def load_theme(path, root=THEMES_ROOT):
+    """
+    Read a theme pack from a directory, its theme.json, or a .zip (unpacked
+    under root). Raises ValueError for a malformed manifest.
+    """
+    if os.path.isfile(path) and zipfile.is_zipfile(path):
+        path = _extract(path, root)
+    manifest_path = path if os.path.isfile(path) else _find_manifest(path)
+    directory = os.path.dirname(os.path.abspath(manifest_path))
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except ValueError as e:
+        raise ValueError(f"Invalid {MANIFEST_NAME}: {e}")
+
+    entries = manifest.get('cursors') if isinstance(manifest, dict) else None
+    if not isinstance(entries, dict) or not entries:
+        raise ValueError(f"{MANIFEST_NAME} must map cursor roles to images under \"cursors\"")
+    cursors = {}
+    for role, entry in entries.items():
+        if role not in ROLES:
+            raise ValueError(f"Unknown cursor role '{role}' (expected one of {', '.join(ROLES)})")
+        if isinstance(entry, str):
+            entry = {'image': entry}
+        image = os.path.normpath(os.path.join(directory, str(entry.get('image', ''))))
+        if not image.startswith(directory + os.sep) or not os.path.isfile(image):
+            raise ValueError(f"Missing image for '{role}': {entry.get('image')}")
+        cursors[role] = ThemeCursor(role, image, _parse_hotspot(role, entry.get('hotspot')))
+    name = str(manifest.get('name') or os.path.basename(directory))
+    return CursorTheme(name, directory, cursors)
+
+
+def cursor_hotspot(cursor):
+    """The cursor's hotspot, proposed from the image when the manifest has none"""
+    if cursor.hotspot is not None:
+        return cursor.hotspot
+    from .analysis import analyze
+    from .imaging import image_pipeline
+    return analyze(image_pipeline.load(cursor.path), cursor.path).hotspot
+
+
+def encode_cursor_file(cursor, cache_dir=None):
+    """
+    Write a role's .cur (or .ani for animations) into cache_dir and return its
+    path. Files are named by content hash and hotspot, so a cached file is
+    returned without decoding anything.
+    """
+    from .animation import is_animated, load_animation, write_ani
+    from .curfile import write_cur
+    from .imaging import image_pipeline
+
+    cache_dir = cache_dir or os.path.join(THEMES_ROOT, "encoded")
+    digest = image_pipeline.content_hash(cursor.path)
+    animated = is_animated(cursor.path)
+    spot = "auto" if cursor.hotspot is None else f"{cursor.hotspot[0]}-{cursor.hotspot[1]}"
+    path = os.path.join(cache_dir, f"{digest}-{spot}{'.ani' if animated else '.cur'}")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    hotspot = cursor_hotspot(cursor)
+    # Write under a temporary name so a half-written file is never reused
+    partial = f"{path}.{os.getpid()}.{cursor.role}.tmp"
+    if animated:
+        write_ani(partial, load_animation(cursor.path), hotspot)
+    else:
+        write_cur(partial, image_pipeline.load(cursor.path), hotspot,
+                  resize=lambda _, size: image_pipeline.resized(cursor.path, size))
+    os.replace(partial, path)
+    return path
+
+
+def encode_theme(job, theme, encode, roles=None, threads=None):
+    """
+    Encode the theme's cursors with encode(cursor) on a thread pool (runs in
+    a background job). roles limits which roles are encoded. Returns
+    (theme, {role: result}); the first failure is raised once the running
+    encodes finish, so a theme is never installed half way.
+    """
+    cursors = [cursor for cursor in theme if roles is None or cursor.role in roles]
+    if not cursors:
+        raise ValueError(f"Theme '{theme.name}' has no cursor this platform can use")
+    results = {}
+    workers = threads or min(len(cursors), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(encode, cursor): cursor.role for cursor in cursors}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                job.report(100 * done / len(futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return theme, results
+
+
+def theme_job(job, path, encode, roles=None):
+    """Load a theme pack and encode it (runs on a worker thread)"""
+    theme = load_theme(path)
+    job.report(5)
+    return encode_theme(job, theme, encode, roles)
@@ -0,0 +1,314 @@
+"""
+Pointer tracking for the cursor overlay.
+Moves are only reported when the pointer actually changes position. Native
+pointer-motion notifications are used where the platform offers them, with
+adaptive polling (fast while moving, backing off while idle) as the fallback.
+"""
+
+import bisect
+import logging
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QCursor
+
+from .backends import CURRENT_OS
+from .telemetry import timed
+
+logger = logging.getLogger(__name__)
+
+# Polling interval bounds in milliseconds
+MIN_POLL_MS = 8
+MAX_POLL_MS = 250
+# Number of unchanged samples before the polling interval starts to back off
+IDLE_SAMPLES = 4
+
+TraceStats = namedtuple("TraceStats", ["wakeups", "moves", "samples", "max_lag_ms"])
+
+
+def _qt_cursor_pos():
+    pos = QCursor.pos()
+    return pos.x(), pos.y()
+
+
+class MotionFilter:
+    """Drops repeated pointer samples and derives the next polling interval"""
+    def __init__(self, min_interval=MIN_POLL_MS, max_interval=MAX_POLL_MS, idle_samples=IDLE_SAMPLES):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_samples = idle_samples
+        self.position = None
+        self.interval = min_interval
+        self._still = 0
+
+    def feed(self, x, y):
+        """Record a sample, returning True if the pointer moved"""
+        if (x, y) == self.position:
+            self._still += 1
+            if self._still >= self.idle_samples:
+                self.interval = min(self.interval * 2, self.max_interval)
+            return False
+        self.position = (x, y)
+        self._still = 0
+        self.interval = self.min_interval
+        return True
+
+    def reset(self):
+        """Forget the last position so the next sample is reported"""
+        self.position = None
+        self._still = 0
+        self.interval = self.min_interval
+
+
+class CocoaBlocks:
+    """
+    Python handlers registered as blocks with a Cocoa API, together with the
+    tokens that remove them. PyObjC does not keep the callables alive, so
+    they are held here for as long as they are registered.
+    """
+    def __init__(self, unregister):
+        self._unregister = unregister
+        self._handlers = []
+        self._tokens = []
+
+    def add(self, register, *args):
+        """Call register(*args) whose last argument is the handler, keeping both"""
+        self._handlers.append(args[-1])
+        self._tokens.append(register(*args))
+
+    def remove(self):
+        for token in self._tokens:
+            # Registration returns nil when it was refused (e.g. no accessibility access)
+            if token is not None:
+                self._unregister(token)
+        self._tokens = []
+        self._handlers = []
+
+
+class _MacMotionMonitor:
+    """Global and local NSEvent monitors for mouse-moved/dragged events"""
+    # NSEventMaskMouseMoved | LeftMouseDragged | RightMouseDragged | OtherMouseDragged
+    MASK = (1 << 5) | (1 << 6) | (1 << 7) | (1 << 27)
+
+    def __init__(self, callback):
+        from AppKit import NSEvent
+
+        def local_handler(event):
+            callback()
+            return event
+
+        self._monitors = CocoaBlocks(NSEvent.removeMonitor_)
+        self._monitors.add(NSEvent.addGlobalMonitorForEventsMatchingMask_handler_, self.MASK,
+                           lambda event: callback())
+        self._monitors.add(NSEvent.addLocalMonitorForEventsMatchingMask_handler_, self.MASK, local_handler)
+
+    def remove(self):
+        self._monitors.remove()
+
+
+class _WindowsMotionMonitor:
+    """Low-level mouse hook (WH_MOUSE_LL) serviced by the Qt message loop"""
+    WH_MOUSE_LL = 14
+    WM_MOUSEMOVE = 0x0200
+
+    def __init__(self, callback):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        hook_proc = ctypes.WINFUNCTYPE(ctypes.c_ssize_t, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.CallNextHookEx.restype = ctypes.c_ssize_t
+        user32.CallNextHookEx.argtypes = [wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+
+        def low_level_proc(n_code, w_param, l_param):
+            # The cursor has not moved yet inside the hook, so only schedule a sample
+            if n_code >= 0 and w_param == self.WM_MOUSEMOVE:
+                callback()
+            return user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        self._user32 = user32
+        self._proc = hook_proc(low_level_proc)
+        self._hook = user32.SetWindowsHookExW(self.WH_MOUSE_LL, self._proc, kernel32.GetModuleHandleW(None), 0)
+        if not self._hook:
+            raise OSError("SetWindowsHookExW(WH_MOUSE_LL) failed")
+
+    def remove(self):
+        if self._hook:
+            self._user32.UnhookWindowsHookEx(self._hook)
+            self._hook = None
+
+
+def install_native_monitor(callback):
+    """Install a native pointer-motion monitor, or return None if unavailable"""
+    try:
+        if CURRENT_OS == 'Darwin':
+            return _MacMotionMonitor(callback)
+        if CURRENT_OS == 'Windows':
+            return _WindowsMotionMonitor(callback)
+    except Exception as e:
+        logger.info("Native pointer monitor unavailable, using polling: %s", e)
+    return None
+
+
+class PointerTracker(QObject):
+    """Emits moved(x, y) only when the pointer position changes"""
+    moved = pyqtSignal(int, int)
+
+    def __init__(self, parent=None, source=None, use_native=True, timer=None, monitor=None):
+        super().__init__(parent)
+        self._source = source or _qt_cursor_pos
+        self._use_native = use_native
+        self._install_monitor = monitor or install_native_monitor
+        self._native = None
+        self._pending = False
+        self.motion = MotionFilter()
+        self.wakeups = 0
+        self.moves = 0
+
+        self._timer = timer or QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.poll)
+
+    @property
+    def native(self):
+        """Whether native motion notifications are driving the tracker"""
+        return self._native is not None
+
+    def start(self):
+        """Start tracking"""
+        if self._use_native and self._native is None:
+            self._native = self._install_monitor(self._on_native_motion)
+        self.motion.reset()
+        self.poll()
+
+    def stop(self):
+        """Stop tracking and remove any native monitor"""
+        self._timer.stop()
+        if self._native is not None:
+            self._native.remove()
+            self._native = None
+
+    def isActive(self):
+        return self._timer.isActive()
+
+    @timed("tracker.poll")
+    def poll(self):
+        """Sample the pointer once and schedule the next sample"""
+        self._pending = False
+        self.wakeups += 1
+        x, y = self._source()
+        if self.motion.feed(x, y):
+            self.moves += 1
+            self.moved.emit(x, y)
+        # With native notifications the timer is only a slow safety net
+        self._timer.start(self.motion.max_interval if self._native else self.motion.interval)
+
+    def notify(self, x, y):
+        """Feed a position pushed by an external source"""
+        self.wakeups += 1
+        if self.motion.feed(x, y):
+            self.moves += 1
+            self.moved.emit(x, y)
+
+    def _on_native_motion(self):
+        # Coalesce bursts of native events into one sample on the next loop pass
+        if not self._pending:
+            self._pending = True
+            self._timer.start(0)
+
+
+class _ReplayTimer:
+    """Single-shot stand-in for QTimer that fires on a replay clock"""
+    def __init__(self, dispatch_ms):
+        self.dispatch_ms = dispatch_ms
+        self.deadline = None
+        self.timeout = self
+        self._slot = None
+
+    def connect(self, slot):
+        self._slot = slot
+
+    def setSingleShot(self, single_shot):
+        pass
+
+    def start(self, ms):
+        self.deadline = self.now + (ms or self.dispatch_ms)
+
+    def stop(self):
+        self.deadline = None
+
+    def isActive(self):
+        return self.deadline is not None
+
+    def fire(self):
+        self.now, self.deadline = self.deadline, None
+        self._slot()
+
+
+class _ReplayMonitor:
+    """Native monitor stand-in; the replay calls callback at each pointer change"""
+    def __init__(self, callback):
+        self.callback = callback
+
+    def remove(self):
+        pass
+
+
+def replay_trace(trace, duration_ms=None, native=False, dispatch_ms=1, **filter_kwargs):
+    """
+    Replay a synthetic pointer trace through PointerTracker without a display
+    or event loop.
+    trace is a sorted list of (t_ms, x, y) samples describing where the pointer
+    is from each timestamp onwards. The tracker's timer runs on a replay clock
+    and zero-delay timers take dispatch_ms to come round the event loop. With
+    native set, the tracker is given a monitor that fires at every position
+    change. Returns TraceStats with the number of tracker wakeups, reported
+    moves, trace samples and worst-case lag between a change and the next poll.
+    """
+    times = [t for t, _, _ in trace]
+    end = duration_ms if duration_ms is not None else (times[-1] if times else 0)
+    timer = _ReplayTimer(dispatch_ms)
+    timer.now = 0
+
+    def source():
+        index = bisect.bisect_right(times, timer.now) - 1
+        return tuple(trace[index][1:]) if index >= 0 else (None, None)
+
+    tracker = PointerTracker(source=source, use_native=native, timer=timer, monitor=_ReplayMonitor)
+    tracker.motion = MotionFilter(**filter_kwargs)
+
+    # Timestamps at which the pointer position actually changes
+    changes = []
+    last = None
+    for t, x, y in trace:
+        if (x, y) != last:
+            changes.append(t)
+            last = (x, y)
+
+    max_lag = 0
+    changed_at = None
+    # The first poll on start already sees the position at time zero
+    change_index = bisect.bisect_right(changes, 0)
+    tracker.start()
+    while True:
+        next_change = changes[change_index] if change_index < len(changes) else None
+        if next_change is not None and next_change <= timer.deadline and next_change <= end:
+            timer.now = next_change
+            if changed_at is None:
+                changed_at = next_change
+            if tracker.native:
+                tracker._native.callback()
+            change_index += 1
+            continue
+        if timer.deadline > end:
+            break
+        timer.fire()
+        # After any poll the overlay matches the pointer again
+        if changed_at is not None:
+            max_lag = max(max_lag, timer.now - changed_at)
+            changed_at = None
+    tracker.stop()
+
+    return TraceStats(tracker.wakeups, tracker.moves, len(trace), max_lag)
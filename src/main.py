@@ -8,21 +8,125 @@ import sys
 import os
 import traceback
 import platform
-import importlib.util
-from pathlib import Path
-
-# Set up basic logging to a file for debugging
+import argparse
+import importlib
+import json
+import time
 import logging
-log_dir = os.path.expanduser("~/Library/Logs/CustomCursors") if platform.system() == "Darwin" else os.path.join(os.path.expanduser("~"), "CustomCursors", "logs")
-os.makedirs(log_dir, exist_ok=True)
-logging.basicConfig(
-    filename=os.path.join(log_dir, "app.log"),
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import logging.handlers
+
+# Written into the bundle by build_app.py; says where the app package is
+LOCATOR_NAME = "app_locator.json"
+
+
+def parse_log_level():
+    """Take --log-level LEVEL off the command line; the rest is left for Qt"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--log-level")
+    args, rest = parser.parse_known_args(sys.argv[1:])
+    sys.argv[1:] = rest
+    return args.log_level
+
+
+def setup_logging():
+    """Buffer log records until the app package, and with it the log writer, has been imported"""
+    buffer = logging.handlers.MemoryHandler(capacity=100000, flushLevel=logging.CRITICAL + 1)
+    root = logging.getLogger()
+    root.addHandler(buffer)
+    root.setLevel(logging.DEBUG)
+    return buffer
+
+
+def finish_logging(buffer, level=None):
+    """Start the app's queued, rotating log (or a plain file without it) and replay buffered records"""
+    root = logging.getLogger()
+    if buffer not in root.handlers:
+        return
+    root.removeHandler(buffer)
+    try:
+        from custom_cursor_app.logs import configure_logging
+        configure_logging(level)
+    except ImportError:
+        log_dir = os.path.expanduser("~/Library/Logs/CustomCursors") if platform.system() == "Darwin" else os.path.join(os.path.expanduser("~"), "CustomCursors", "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        root.setLevel(getattr(logging, (level or "INFO").upper(), logging.INFO))
+        logging.basicConfig(
+            filename=os.path.join(log_dir, "app.log"),
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+    for record in buffer.buffer:
+        if record.levelno >= root.level:
+            root.handle(record)
+    buffer.buffer.clear()
+
+
+def locator_dirs():
+    """Directories where a bundle's locator manifest can live"""
+    dirs = []
+    if hasattr(sys, '_MEIPASS'):
+        dirs.append(sys._MEIPASS)  # PyInstaller's unpacked bundle
+    exe_dir = os.path.dirname(sys.executable)
+    dirs.extend([
+        os.path.dirname(os.path.abspath(__file__)),  # Current script directory
+        exe_dir,  # Executable directory
+        os.path.join(exe_dir, '..', 'Resources'),  # macOS bundle resources
+    ])
+    return dirs
+
+
+def load_from_locator():
+    """Import the app entry point described by the build's locator manifest, or return None"""
+    for base_dir in locator_dirs():
+        locator_path = os.path.join(base_dir, LOCATOR_NAME)
+        try:
+            with open(locator_path, 'r', encoding='utf-8') as f:
+                locator = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable locator {locator_path}: {e}")
+            continue
+        
+        # Paths in the locator are relative to the locator itself
+        package_parent = os.path.normpath(os.path.join(base_dir, locator.get("path", ".")))
+        logging.info(f"Using locator {locator_path}: {locator.get('module')} in {package_parent}")
+        if package_parent not in sys.path:
+            sys.path.insert(0, package_parent)
+        try:
+            module = importlib.import_module(locator["module"])
+            return getattr(module, locator.get("entry", "run_app"))
+        except (ImportError, KeyError, AttributeError) as e:
+            logging.warning(f"Locator {locator_path} is stale: {e}")
+    return None
+
+
+def search_bundle():
+    """Walk the bundle for the app package; slow, so only used when the locator fails"""
+    logging.warning("No usable locator, searching for app.py in the entire bundle")
+    start = time.perf_counter()
+    try:
+        for root, dirs, files in os.walk(os.path.dirname(sys.executable)):
+            if 'app.py' in files and os.path.basename(root) == 'custom_cursor_app':
+                app_path = os.path.join(root, 'app.py')
+                logging.info(f"Found app.py at: {app_path}")
+                package_parent = os.path.dirname(root)
+                if package_parent not in sys.path:
+                    sys.path.insert(0, package_parent)
+                try:
+                    from custom_cursor_app.app import run_app
+                    return run_app
+                except ImportError as e:
+                    logging.warning(f"Import failed for {app_path}: {e}")
+        return None
+    finally:
+        logging.warning(f"Bundle search took {(time.perf_counter() - start) * 1000:.0f} ms; "
+                        f"rebuild to regenerate {LOCATOR_NAME}")
+
 
 def main():
     """Entry point for the application"""
+    level = parse_log_level()
+    buffer = setup_logging()
     try:
         logging.info("Starting Custom Cursors application")
         logging.info(f"Python version: {sys.version}")
@@ -42,73 +146,31 @@ def main():
             except ImportError:
                 logging.info("Normal import failed, trying alternative methods")
                 
-                # Try to find the module in the current directory or executable directory
-                base_dirs = [
-                    os.path.dirname(os.path.abspath(__file__)),  # Current script directory
-                    os.path.dirname(sys.executable),  # Executable directory
-                    os.getcwd(),  # Current working directory
-                    # For packaged app, check in the bundle resources
-                    os.path.join(os.path.dirname(sys.executable), '..', 'Resources')
-                ]
+                # The build writes a locator next to the bundled package,
+                # so the app module is found with a handful of stat calls
+                run_app = load_from_locator()
                 
-                module_found = False
-                for base_dir in base_dirs:
-                    logging.info(f"Trying to import from: {base_dir}")
-                    
-                    # Try direct import of app.py
-                    app_path = os.path.join(base_dir, 'custom_cursor_app', 'app.py')
-                    if os.path.exists(app_path):
-                        logging.info(f"Found app.py at: {app_path}")
-                        spec = importlib.util.spec_from_file_location("app", app_path)
-                        app_module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(app_module)
-                        run_app = app_module.run_app
-                        module_found = True
-                        logging.info("Successfully imported app module from file")
-                        break
-                    
-                    # Try to add the directory to sys.path
-                    if os.path.exists(os.path.join(base_dir, 'custom_cursor_app')):
-                        logging.info(f"Found custom_cursor_app directory at: {base_dir}")
-                        if base_dir not in sys.path:
-                            sys.path.insert(0, base_dir)
-                        try:
-                            from custom_cursor_app.app import run_app
-                            module_found = True
-                            logging.info("Successfully imported app module after path adjustment")
-                            break
-                        except ImportError as e:
-                            logging.warning(f"Import still failed after path adjustment: {e}")
-                
-                if not module_found:
-                    # Last resort: try to find app.py anywhere in the bundle
-                    logging.info("Searching for app.py in the entire bundle")
-                    for root, dirs, files in os.walk(os.path.dirname(sys.executable)):
-                        if 'app.py' in files:
-                            app_path = os.path.join(root, 'app.py')
-                            logging.info(f"Found app.py at: {app_path}")
-                            spec = importlib.util.spec_from_file_location("app", app_path)
-                            app_module = importlib.util.module_from_spec(spec)
-                            spec.loader.exec_module(app_module)
-                            if hasattr(app_module, 'run_app'):
-                                run_app = app_module.run_app
-                                module_found = True
-                                logging.info("Successfully imported app module from search")
-                                break
-                    
-                    if not module_found:
+                if run_app is None:
+                    # Diagnostic fallback: only reached if the locator is missing or stale
+                    run_app = search_bundle()
+                    if run_app is None:
                         raise ImportError("Could not find the app module after trying all methods")
             
             logging.info("Successfully imported app module")
         except ImportError as e:
             logging.error(f"Failed to import app module: {e}")
             logging.error(traceback.format_exc())
+            finish_logging(buffer, level)
             sys.exit(1)
         
+        # From here on records go through the background log writer
+        finish_logging(buffer, level)
+        
         # Run the app
         logging.info("Running the application")
         run_app()
     except Exception as e:
+        finish_logging(buffer, level)
         logging.critical(f"Unhandled exception: {e}")
         logging.critical(traceback.format_exc())
         # Display error message to user if possible